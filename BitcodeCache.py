@@ -0,0 +1,101 @@
+"""
+.. module:: BitcodeCache
+   :platform: Unix, Windows
+   :synopsis: Content-addressed cache of intermediate bitcode, keyed by input and pass prefix
+
+"""
+
+import os
+import hashlib
+import threading
+from shutil import copy as copyfile
+
+class BitcodeCache():
+    '''
+    cachedir: directory holding the cached bitcode
+    max_bytes: disk budget, least recently used entries are evicted beyond it
+    stride: number of passes between two cached prefixes
+    '''
+    def __init__(self, cachedir: str='bitcode_cache/', max_bytes: int=2**30, stride: int=10):
+        self.cachedir = cachedir
+        self.max_bytes = max_bytes
+        self.stride = stride
+        self.input_hashes = dict()
+        self.lock = threading.Lock()
+        os.makedirs(cachedir, exist_ok=True)
+        self.size = sum(entry.stat().st_size for entry in os.scandir(cachedir) if entry.name.endswith('.bc'))
+
+    @staticmethod
+    def hash_file(filename: str) -> str:
+        sha = hashlib.sha256()
+        with open(filename, 'rb') as file:
+            for chunk in iter(lambda: file.read(2**20), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    # Hash of the sequence input, recomputed only when the file changes
+    def input_hash(self, source: str) -> str:
+        stat = os.stat(source)
+        signature = (os.path.abspath(source), stat.st_mtime_ns, stat.st_size)
+        value = self.input_hashes.get(signature)
+        if value is None:
+            value = self.hash_file(source)
+            self.input_hashes[signature] = value
+        return value
+
+    def get_path(self, input_hash: str, prefix: list) -> str:
+        key = hashlib.sha256(f"{input_hash}\n{' '.join(prefix)}".encode()).hexdigest()
+        return f"{self.cachedir}{key}.bc"
+
+    # Copies the longest cached prefix of passes to output, returns its length (0 if none)
+    def lookup(self, input_hash: str, passes: list, output: str) -> int:
+        for length in range(len(passes) - len(passes) % self.stride, 0, -self.stride):
+            path = self.get_path(input_hash, passes[:length])
+            try:
+                copyfile(path, output)
+                os.utime(path) # LRU order is the modification time
+                return length
+            except FileNotFoundError:
+                continue
+        return 0
+
+    def store(self, input_hash: str, prefix: list, source: str):
+        path = self.get_path(input_hash, prefix)
+        if os.path.exists(path):
+            return
+        temporary = f"{path}.{os.getpid()}_{threading.get_ident()}.tmp"
+        copyfile(source, temporary)
+        os.replace(temporary, path)
+        with self.lock:
+            self.size += os.path.getsize(path)
+            if self.size > self.max_bytes:
+                self.evict()
+
+    # Removes least recently used entries until the cache fits in 90% of its budget
+    def evict(self):
+        entries = [entry for entry in os.scandir(self.cachedir) if entry.name.endswith('.bc')]
+        stats = []
+        for entry in entries:
+            try:
+                stats.append((entry.stat().st_mtime_ns, entry.stat().st_size, entry.path))
+            except FileNotFoundError:
+                continue
+        stats.sort()
+        self.size = sum(size for _, size, _ in stats)
+        for _, size, path in stats:
+            if self.size <= 0.9 * self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.size -= size
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
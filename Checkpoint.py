@@ -0,0 +1,149 @@
+"""
+.. module:: Checkpoint
+   :platform: Unix, Windows
+   :synopsis: Periodic atomic checkpoints of a running algorithm, so an interrupted run can be resumed
+
+"""
+
+import os
+import time
+import pickle
+import random
+import threading
+
+import numpy as np
+
+CHECKPOINT_VERSION = 1
+
+class Checkpoint():
+    '''
+    filename: checkpoint path, replaced atomically on every write
+    algorithm: evolutionary algorithm to save; its problem counts epochs (llvmMultiobjetiveProblem)
+    interval: generations between checkpoints
+    Registered as an observer: the state is taken between generations and written by a background thread,
+    when a write is still running only the newest state is kept for the next one
+    '''
+    def __init__(self, filename: str, algorithm, interval: int = 1):
+        self.filename = filename
+        self.algorithm = algorithm
+        self.interval = interval
+        self.generations = 0
+        self.condition = threading.Condition()
+        self.pending = None
+        self.writer = None
+        self.closed = False
+
+    ### FOR OBSERVER ###
+    def update(self, *args, **kwargs):
+        self.generations += 1
+        if self.generations % self.interval == 0:
+            self.save()
+
+    # Everything the main loop needs to continue: population, counters and every random state
+    def get_state(self) -> dict:
+        algorithm = self.algorithm
+        problem = algorithm.problem
+        solutions = algorithm.solutions
+        return {
+            'version': CHECKPOINT_VERSION,
+            'config': problem.config_to_str(),
+            'variables': [np.asarray(solution.variables).tolist() for solution in solutions],
+            'objectives': [list(solution.objectives) for solution in solutions],
+            'attributes': [dict(solution.attributes) for solution in solutions],
+            'evaluations': algorithm.evaluations,
+            'computing_time': time.time() - algorithm.start_computing_time,
+            'problem': {'epoch': problem.epoch, 'phenotype': problem.phenotype, 'evaluations': problem.evaluations},
+            'random': random.getstate(),
+            'numpy': np.random.get_state(),
+            'operators': {name: operator.rng.bit_generator.state for name, operator in self.get_operators().items()
+                          if isinstance(getattr(operator, 'rng', None), np.random.Generator)},
+        }
+
+    def get_operators(self) -> dict:
+        return {name: getattr(self.algorithm, name) for name in ('selection_operator', 'crossover_operator',
+                                                                  'mutation_operator') if hasattr(self.algorithm, name)}
+
+    # The state is copied now, the file is written in the background
+    def save(self):
+        state = self.get_state()
+        with self.condition:
+            if self.closed:
+                raise Exception(f"Checkpoint {self.filename} is closed")
+            self.pending = state
+            if self.writer is None:
+                self.writer = threading.Thread(target=self.write_pending, daemon=True)
+                self.writer.start()
+            self.condition.notify()
+
+    def write_pending(self):
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                if self.pending is None:
+                    return
+                state, self.pending = self.pending, None
+            self.write(state)
+
+    # tmp file + fsync + rename: a crash leaves either the previous checkpoint or the new one
+    def write(self, state: dict):
+        temporary = f"{self.filename}.tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.filename)
+        if hasattr(os, 'O_DIRECTORY'):
+            directory = os.open(os.path.dirname(os.path.abspath(self.filename)), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+    # Waits for the last state to be written
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+            writer = self.writer
+        if writer is not None:
+            writer.join()
+
+    def load(self) -> dict:
+        with open(self.filename, "rb") as file:
+            state = pickle.load(file)
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise Exception(f"Checkpoint {self.filename} has version {state.get('version')}, "
+                            f"expected {CHECKPOINT_VERSION}")
+        if state['config'] != self.algorithm.problem.config_to_str():
+            raise Exception(f"Checkpoint {self.filename} belongs to configuration {state['config']}, "
+                            f"not to {self.algorithm.problem.config_to_str()}")
+        return state
+
+    # Puts the algorithm, its problem and the random generators back where the checkpoint was taken
+    def restore(self, state: dict = None):
+        state = state if state is not None else self.load()
+        algorithm = self.algorithm
+        problem = algorithm.problem
+
+        solutions = []
+        for variables, objectives, attributes in zip(state['variables'], state['objectives'], state['attributes']):
+            solution = problem.create_solution()
+            solution.variables = variables
+            solution.objectives = objectives
+            solution.attributes = attributes
+            solutions.append(solution)
+        algorithm.solutions = solutions
+        algorithm.evaluations = state['evaluations']
+        algorithm.total_computing_time = state['computing_time']
+
+        problem.epoch = state['problem']['epoch']
+        problem.phenotype = state['problem']['phenotype']
+        problem.evaluations = state['problem']['evaluations']
+
+        random.setstate(state['random'])
+        np.random.set_state(state['numpy'])
+        operators = self.get_operators()
+        for name, rng_state in state['operators'].items():
+            operators[name].rng.bit_generator.state = rng_state
+        self.generations = 0
@@ -0,0 +1,91 @@
+"""
+.. module:: CoreScheduler
+   :platform: Unix
+   :synopsis: Hands out dedicated physical cores to concurrent runtime measures
+
+"""
+
+import os
+import queue
+import contextlib
+
+class CoreScheduler():
+    '''
+    cores: logical CPUs the measured executables are pinned to (default: one per physical core)
+    reserve: physical cores kept out of the measures, e.g. for opt/llc/clang and the algorithm
+    Each measure holds one core until it ends, so at most len(cores) measures run at once.
+    The measure cores and their hyperthread siblings are left out of get_other_cpus, the CPUs the tools
+    should be restricted to (ProcessRunner affinity).
+    One scheduler per process: copies in other processes hand out the same cores
+    '''
+    def __init__(self, cores: list = None, reserve: int = 0):
+        self.cores = list(cores) if cores is not None else self.get_dedicated_cores()[reserve:]
+        if not self.cores:
+            raise Exception("There are no cores left to pin the runtime measures to")
+        self.free = None
+        self.reset()
+
+    def reset(self):
+        self.free = queue.Queue()
+        for core in self.cores:
+            self.free.put(core)
+
+    # Lowest allowed logical CPU of every physical core: its hyperthread siblings are never handed out
+    @staticmethod
+    def get_dedicated_cores() -> list:
+        dedicated = dict()
+        for cpu in sorted(os.sched_getaffinity(0)):
+            dedicated.setdefault(CoreScheduler.get_siblings(cpu), cpu)
+        return sorted(dedicated.values())
+
+    # Logical CPUs sharing the physical core of cpu, itself included ('0,4' or '0-1' in sysfs)
+    @staticmethod
+    def get_siblings(cpu: int) -> frozenset:
+        try:
+            with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list", "r") as file:
+                siblings = file.read().strip()
+        except OSError:
+            return frozenset([cpu])
+        cpus = set()
+        for part in siblings.split(","):
+            first, _, last = part.partition("-")
+            cpus.update(range(int(first), int(last or first) + 1))
+        return frozenset(cpus)
+
+    # Allowed logical CPUs on neither a measure core nor one of its siblings, None if the measures take them all
+    def get_other_cpus(self) -> set:
+        measures = set().union(*[self.get_siblings(core) for core in self.cores])
+        return (os.sched_getaffinity(0) - measures) or None
+
+    # Blocks until a core is free, gives it back when the measure ends
+    @contextlib.contextmanager
+    def acquire(self):
+        core = self.free.get()
+        try:
+            yield core
+        finally:
+            self.free.put(core)
+
+    # Pins the calling thread while it spawns the measured children, which inherit its affinity.
+    # Unlike a preexec_fn this keeps the fast vfork/posix_spawn path, so the pinning adds no spawn time
+    @staticmethod
+    @contextlib.contextmanager
+    def pinned(core: int):
+        affinity = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {core})
+        try:
+            yield core
+        finally:
+            os.sched_setaffinity(0, affinity)
+
+    def get_concurrency(self) -> int:
+        return len(self.cores)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['free'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.reset()
@@ -10,71 +10,274 @@
 
 import sys
 import os
+import math
 import subprocess
+import statistics
 import time
+from collections import Counter
 
-class Evaluator():
+from ProcessRunner import ProcessRunner, LimitExceeded
+
+# Increased whenever the measures change, values from different versions can't be compared
+METRICS_VERSION = 2
 
-    def __init__(self, runs: int=1):
+# x86 mnemonics, with their AT&T size suffixes
+CALLS = frozenset([b'call', b'callq', b'calll', b'callw'])
+UNCONDITIONAL_JMPS = frozenset([b'jmp', b'jmpq', b'jmpl', b'jmpw'])
+CONDITIONAL_JMPS = frozenset([b'ja', b'jae', b'jb', b'jbe', b'jc', b'jcxz', b'jecxz', b'jrcxz', b'je', b'jg', b'jge',
+                              b'jl', b'jle', b'jna', b'jnae', b'jnb', b'jnbe', b'jnc', b'jne', b'jng', b'jnge', b'jnl',
+                              b'jnle', b'jno', b'jnp', b'jns', b'jnz', b'jo', b'jp', b'jpe', b'jpo', b'js', b'jz'])
+INDENT = (b'\t', b' ')
+CHUNK_SIZE = 2**20
+# z value of the 95% confidence interval of the median
+CONFIDENCE_Z = 1.96
+# Line printed by the instrumented polybench build: polybench-kernel <name> <iteration> <seconds>
+KERNEL_TAG = b'polybench-kernel'
+
+class Evaluator():
+    '''
+    runs: minimum number of timed runs (0: runtime is not measured)
+    warmup: untimed runs before the timed ones (page cache, frequency scaling)
+    max_runs: timed runs are repeated up to max_runs until the runtime is precise enough (default: runs)
+    precision: relative half width of the 95% confidence interval of the median that stops the repetition
+    scheduler: CoreScheduler, every measure runs pinned to a dedicated core (default: unpinned)
+    kernel_times: parses the per-kernel timings of an instrumented polybench executable
+    kernel: runs only that kernel of an instrumented polybench executable (e.g. 'gemm')
+    runner: timeout, memory and CPU limits of every run, a run that exceeds them fails (default: no limits)
+    '''
+    def __init__(self, runs: int=1, warmup: int=0, max_runs: int=None, precision: float=0.05, scheduler=None,
+                 kernel_times: bool=False, kernel: str=None, runner: ProcessRunner=None):
         self.runs = runs
+        self.warmup = warmup
+        self.max_runs = max(runs, max_runs or runs)
+        self.precision = precision
+        self.scheduler = scheduler
+        self.kernel_times = kernel_times
+        self.kernel = kernel
+        self.runner = runner if runner is not None else ProcessRunner()
         self.total_codelines = 0
         self.codelines = 0
         self.tags = 0
         self.function_tags = 0
+        self.directives = 0
         self.calls = 0
         self.unconditional_jmps = 0
         self.conditional_jmps = 0
         self.total_jmps = 0
         self.runtime = 0.0
+        self.runtime_dispersion = 0.0
+        self.user_time = 0.0
+        self.system_time = 0.0
+        self.samples = []
+        self.sample_cores = []
+        self.kernel_samples = []
+        self.kernel_runtimes = dict()
 
-    def evaluate(self, source_ll: str, source_exe: str):
+    # Same settings and scheduler, independent measures
+    def clone(self):
+        return Evaluator(runs=self.runs, warmup=self.warmup, max_runs=self.max_runs, precision=self.precision,
+                         scheduler=self.scheduler, kernel_times=self.kernel_times, kernel=self.kernel,
+                         runner=self.runner)
+
+    def evaluate(self, source_ll: str, source_exe: str = None):
         if not os.path.exists(source_ll):
             raise Exception("Source assembly file '{}' doesn't exists.")
 
-        with open(source_ll,'r') as file:
-            for line in file.readlines():
-                self.total_codelines += 1
-                self.tags += line[0]!='\t' and line[0]!=' ' and line[0]!='#' and line[0]=='.'
-                self.function_tags += line[0]!='\t' and line[0]!=' ' and line[0]!='#' and line[0]!='.'
-                self.calls += line.count('call')
-                self.unconditional_jmps += line.count('jmp')
-                self.conditional_jmps += line.count('jl')
-                self.conditional_jmps += line.count('jge')
+        with open(source_ll,'rb') as file:
+            self.scan(file)
+        
+        if self.runs > 0:
+            self.measure_runtime(source_exe)
+
+    # Median wall time of the timed runs, their median absolute deviation and the median child CPU times.
+    # A failed run (non-zero exit code) stops the measure with a sys.maxsize runtime
+    def measure_runtime(self, source_exe: str):
+        if not os.path.exists(source_exe):
+            raise Exception(f"Source executable file '{source_exe}' doesn't exists.")
+
+        if self.scheduler is None:
+            self.measure_on(source_exe, None)
+        else:
+            # Warmup and timed runs stay on one core, concurrent measures get other cores
+            with self.scheduler.acquire() as core, self.scheduler.pinned(core):
+                self.measure_on(source_exe, core)
+
+    def measure_on(self, source_exe: str, core: int):
+        command = [source_exe] if self.kernel is None else [source_exe, self.kernel]
+        for _ in range(self.warmup):
+            if self.run_once(command) is None:
+                return self.set_failed()
+
+        self.samples = []
+        self.sample_cores = []
+        self.kernel_samples = []
+        while len(self.samples) < self.max_runs:
+            sample = self.run_once(command, capture=self.kernel_times)
+            if sample is None:
+                return self.set_failed()
+            self.samples.append(sample[:3])
+            self.sample_cores.append(core)
+            if self.kernel_times:
+                self.kernel_samples.append(self.parse_kernel_times(sample[3]))
+            if len(self.samples) >= self.runs and self.is_precise([wall for wall, _, _ in self.samples]):
+                break
+        self.set_runtime(self.samples)
+
+    # One run: (wall seconds, user seconds, system seconds, stdout if captured), None if it fails or exceeds the
+    # runner limits. perf_counter_ns starts once the child is spawned (the spawn time is not the executable's)
+    # and ends when wait4 returns the rusage of that child only
+    def run_once(self, command: list, capture: bool = False) -> tuple:
+        process = self.runner.popen(command, stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL)
+        start = time.perf_counter_ns()
+        output = None
+        try:
+            with self.runner.supervise(process, command):
+                if capture:
+                    # Read to the end first: a full pipe would block the child
+                    output = process.stdout.read()
+                    process.stdout.close()
+                _, status, rusage = os.wait4(process.pid, 0)
+                wall = (time.perf_counter_ns() - start) / 1e9
+                process.returncode = os.waitstatus_to_exitcode(status)
+        except LimitExceeded:
+            return None
+        if process.returncode:
+            return None
+        return wall, rusage.ru_utime, rusage.ru_stime, output
+
+    # Seconds of every kernel in one run, added over its iterations: {'gemm': 0.0031, ...}
+    @staticmethod
+    def parse_kernel_times(output: bytes) -> dict:
+        times = dict()
+        for line in output.splitlines():
+            fields = line.split()
+            if len(fields) == 4 and fields[0] == KERNEL_TAG:
+                name = fields[1].decode()
+                times[name] = times.get(name, 0.0) + float(fields[3])
+        return times
+
+    # Distribution-free confidence interval of the median: order statistics around n/2
+    @staticmethod
+    def median_interval(values: list) -> tuple:
+        ordered = sorted(values)
+        n = len(ordered)
+        offset = CONFIDENCE_Z * math.sqrt(n) / 2
+        low = max(0, math.floor(n / 2 - offset) - 1)
+        high = min(n - 1, math.ceil(1 + n / 2 + offset) - 1)
+        return ordered[low], ordered[high]
+
+    def is_precise(self, values: list) -> bool:
+        if len(values) < 2:
+            return False
+        low, high = self.median_interval(values)
+        median = statistics.median(values)
+        return median > 0 and (high - low) / 2 <= self.precision * median
+
+    def set_runtime(self, samples: list):
+        walls = [wall for wall, _, _ in samples]
+        self.runtime = statistics.median(walls)
+        self.runtime_dispersion = statistics.median([abs(wall - self.runtime) for wall in walls])
+        self.user_time = statistics.median([user for _, user, _ in samples])
+        self.system_time = statistics.median([system for _, _, system in samples])
+        self.kernel_runtimes = {name: statistics.median([times.get(name, 0.0) for times in self.kernel_samples])
+                                for name in self.kernel_samples[0]} if self.kernel_samples else dict()
+
+    def set_failed(self):
+        self.runtime = sys.maxsize
+        self.kernel_runtimes = dict()
+        self.runtime_dispersion = 0.0
+        self.user_time = 0.0
+        self.system_time = 0.0
+
+    # Counts every measure in one pass over an assembly stream, read in large chunks.
+    # Each line is tokenized once: indented lines by their mnemonic/directive,
+    # column 0 lines by their first character ('.' local label, '#' comment, other function label)
+    def scan(self, stream):
+        tokens = Counter()
+        carry = b''
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            lines = (carry + chunk).split(b'\n')
+            carry = lines.pop()
+            self.total_codelines += len(lines)
+            tokens.update(self.tokenize(lines))
+        if carry:
+            self.total_codelines += 1
+            tokens.update(self.tokenize([carry]))
+
+        for token, count in tokens.items():
+            if token[:1] == b':':
+                if token == b':.':
+                    self.tags += count
+                elif token != b':#' and token != b':' and token[1:] not in INDENT:
+                    self.function_tags += count
+            elif token[:1] == b'.':
+                self.directives += count
+            elif token in CALLS:
+                self.calls += count
+            elif token in UNCONDITIONAL_JMPS:
+                self.unconditional_jmps += count
+            elif token in CONDITIONAL_JMPS:
+                self.conditional_jmps += count
         self.total_jmps = self.conditional_jmps + self.unconditional_jmps
         self.codelines = self.total_codelines - self.tags - self.function_tags - self.calls - self.total_jmps
-        
+
+    @staticmethod
+    def tokenize(lines: list) -> list:
+        return [line.split(None, 1)[0] if line[:1] in INDENT and not line.isspace() else b':' + line[:1]
+                for line in lines]
+
+    # Requests only the artifacts the measures need: no executable unless runtime is measured
+    def evaluate_artifacts(self, artifacts):
+        artifacts.scan_assembly(self.scan)
         if self.runs > 0:
-            if not os.path.exists(source_exe):
-                raise Exception("Source executable file '{}' doesn't exists.")
-
-            error = False
-            average = 0.0
-            for _ in range(self.runs):
-                start_time = time.time()
-                returncode = subprocess.run(source_exe).returncode
-                if returncode:
-                    error = True
-                    break
-                average += time.time() - start_time
-            if not error:
-                self.runtime = average / self.runs
-            else:
-                self.runtime = sys.maxsize
+            self.measure_runtime(artifacts.get_optimized_exe())
 
     def reset(self):
         self.total_codelines = 0
         self.codelines = 0
         self.tags = 0
         self.function_tags = 0
+        self.directives = 0
         self.calls = 0
         self.unconditional_jmps = 0
         self.conditional_jmps = 0
         self.total_jmps = 0
         self.runtime = 0.0
+        self.runtime_dispersion = 0.0
+        self.user_time = 0.0
+        self.system_time = 0.0
+        self.samples = []
+        self.sample_cores = []
+        self.kernel_samples = []
+        self.kernel_runtimes = dict()
 
     def get_runtime(self) -> float:
         return self.runtime
 
+    def get_runtime_dispersion(self) -> float:
+        return self.runtime_dispersion
+
+    def get_user_time(self) -> float:
+        return self.user_time
+
+    def get_system_time(self) -> float:
+        return self.system_time
+
+    def get_samples(self) -> list:
+        return self.samples
+
+    # Median seconds of every kernel over the timed runs (kernel_times mode): {'gemm': 0.0031, ...}
+    def get_kernel_runtimes(self) -> dict:
+        return self.kernel_runtimes
+
+    # Core each sample was measured on (None: unpinned)
+    def get_sample_cores(self) -> list:
+        return self.sample_cores
+
     def get_total_codelines(self) -> int:
         return self.total_codelines
 
@@ -87,6 +290,9 @@ class Evaluator():
     def get_function_tags(self) -> int:
         return self.function_tags
 
+    def get_directives(self) -> int:
+        return self.directives
+
     def get_calls(self) -> int:
         return self.calls
 
@@ -105,6 +311,9 @@ class Evaluator():
     def get_ratio_function_tags(self) -> float:
         return self.function_tags / self.total_codelines
 
+    def get_ratio_directives(self) -> float:
+        return self.directives / self.total_codelines
+
     def get_ratio_calls(self) -> float:
         return self.calls / self.total_codelines
 
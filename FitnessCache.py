@@ -0,0 +1,107 @@
+"""
+.. module:: FitnessCache
+   :platform: Unix, Windows
+   :synopsis: Persistent fitness cache that several processes and runs can share
+
+"""
+
+import os
+import json
+import sqlite3
+import threading
+
+class FitnessCache():
+    '''
+    filename: sqlite database path
+    timeout: seconds to wait while another process holds the write lock
+    namespace: toolchain configuration the values belong to (e.g. LlvmUtils.get_mode()); values of different
+               configurations can't be compared, so a database only accepts the first namespace that opened it
+    '''
+    def __init__(self, filename: str, timeout: float = 60.0, namespace: str = None):
+        self.filename = filename
+        self.timeout = timeout
+        self.namespace = namespace
+        self.local = threading.local()
+        self.connection().execute("CREATE TABLE IF NOT EXISTS fitness (key TEXT PRIMARY KEY, objectives TEXT NOT NULL)")
+        self.connection().execute("CREATE TABLE IF NOT EXISTS ir (hash TEXT PRIMARY KEY, objectives TEXT NOT NULL)")
+        self.connection().execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        if namespace is not None:
+            self.connection().execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('namespace', ?)", (namespace,))
+            stored = self.connection().execute("SELECT value FROM meta WHERE name = 'namespace'").fetchone()[0]
+            if stored != namespace:
+                raise Exception(f"Fitness cache {filename} holds values of '{stored}', not of '{namespace}'")
+
+    # One connection per thread and process: sqlite connections can't be shared between them
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self.local, 'connection', None)
+        if connection is None or self.local.pid != os.getpid():
+            connection = sqlite3.connect(self.filename, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return connection
+
+    # [3, 14, 15] --> '3,14,15'
+    @staticmethod
+    def to_key(variables: list) -> str:
+        return ','.join(str(int(v)) for v in variables)
+
+    # '3,14,15' --> (3, 14, 15)
+    @staticmethod
+    def from_key(key: str) -> tuple:
+        return tuple(int(v) for v in key.split(',')) if key else ()
+
+    def get(self, variables: list) -> list:
+        row = self.connection().execute("SELECT objectives FROM fitness WHERE key = ?",
+                                        (self.to_key(variables),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # Several genomes in one query per 500 keys: {tuple(variables): objectives} for the cached ones
+    def get_all(self, variables_list: list) -> dict:
+        keys = [self.to_key(variables) for variables in variables_list]
+        found = dict()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            query = "SELECT key, objectives FROM fitness WHERE key IN ({})".format(','.join('?' * len(chunk)))
+            for key, objectives in self.connection().execute(query, chunk):
+                found[self.from_key(key)] = json.loads(objectives)
+        return found
+
+    # First writer wins, so concurrent runs never overwrite each other
+    def put(self, variables: list, objectives: list):
+        self.connection().execute("INSERT OR IGNORE INTO fitness (key, objectives) VALUES (?, ?)",
+                                  (self.to_key(variables), json.dumps(list(objectives))))
+
+    def put_all(self, entries: list):
+        connection = self.connection()
+        with connection:
+            connection.execute("BEGIN")
+            connection.executemany("INSERT OR IGNORE INTO fitness (key, objectives) VALUES (?, ?)",
+                                   [(self.to_key(variables), json.dumps(list(objectives))) for variables, objectives in entries])
+
+    # Objectives measured for an optimized bitcode, whatever sequence produced it
+    def get_ir(self, ir_hash: str) -> list:
+        row = self.connection().execute("SELECT objectives FROM ir WHERE hash = ?", (ir_hash,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_ir(self, ir_hash: str, objectives: list):
+        self.connection().execute("INSERT OR IGNORE INTO ir (hash, objectives) VALUES (?, ?)",
+                                  (ir_hash, json.dumps(list(objectives))))
+
+    def items(self):
+        for key, objectives in self.connection().execute("SELECT key, objectives FROM fitness"):
+            yield self.from_key(key), json.loads(objectives)
+
+    def __len__(self) -> int:
+        return self.connection().execute("SELECT COUNT(*) FROM fitness").fetchone()[0]
+
+    # Connections stay behind, each process opens its own
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['local'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.local = threading.local()
@@ -0,0 +1,174 @@
+"""
+.. module:: IslandModel
+   :platform: Unix, Windows
+   :synopsis: Island-model NSGA-II: independent populations in local processes with periodic migration
+
+"""
+
+import time
+import queue
+import random
+import multiprocessing
+
+import numpy as np
+
+TOPOLOGIES = ['ring', 'complete', 'random']
+
+class Migration():
+    '''
+    algorithm: island algorithm, registered as its observer
+    index: island number
+    inboxes: one queue per island
+    topology: 'ring' (to the next island), 'complete' (to all the others) or 'random' (to one other island)
+    interval: generations between migrations
+    migrants: non-dominated solutions sent on every migration
+    Migration never waits: immigrants that haven't arrived yet are taken in a later migration
+    '''
+    def __init__(self, algorithm, index: int, inboxes: list, topology: str = 'ring', interval: int = 5,
+                 migrants: int = 2, seed: int = None):
+        self.algorithm = algorithm
+        self.index = index
+        self.inboxes = inboxes
+        self.topology = topology
+        self.interval = interval
+        self.migrants = migrants
+        self.random = random.Random(seed)
+        self.generations = -1
+
+    def get_neighbours(self) -> list:
+        others = [island for island in range(len(self.inboxes)) if island != self.index]
+        if not others:
+            return []
+        if self.topology == 'ring':
+            return [(self.index + 1) % len(self.inboxes)]
+        elif self.topology == 'complete':
+            return others
+        return [self.random.choice(others)]
+
+    ### FOR OBSERVER ###
+    def update(self, *args, **kwargs):
+        # The first notification comes from the initial population
+        self.generations += 1
+        if self.generations == 0 or self.generations % self.interval != 0:
+            return
+        self.emigrate()
+        self.immigrate()
+
+    # Copies of random non-dominated solutions of the population
+    def emigrate(self):
+        solutions = self.algorithm.solutions
+        front = [solution for solution in solutions if solution.attributes.get('dominance_ranking', 0) == 0]
+        chosen = self.random.sample(front, min(self.migrants, len(front)))
+        migrants = [(np.asarray(solution.variables).tolist(), np.asarray(solution.objectives).tolist(),
+                     dict(solution.attributes))
+                    for solution in chosen]
+        for neighbour in self.get_neighbours():
+            self.inboxes[neighbour].put(migrants)
+
+    # The newest immigrants (at most half the population) replace the last, worst ranked, solutions;
+    # the next replacement ranks them with the rest
+    def immigrate(self):
+        immigrants = []
+        while True:
+            try:
+                immigrants.extend(self.inboxes[self.index].get_nowait())
+            except queue.Empty:
+                break
+        solutions = self.algorithm.solutions
+        immigrants = immigrants[max(len(immigrants) - len(solutions) // 2, 0):]
+        start = len(solutions) - len(immigrants)
+        for offset, (variables, objectives, attributes) in enumerate(immigrants):
+            solution = self.algorithm.problem.create_solution()
+            solution.variables = variables
+            solution.objectives = objectives
+            solution.attributes = attributes
+            solutions[start + offset] = solution
+
+
+# Island process: builds its algorithm, runs it and sends back its final population
+def run_island(factory, index: int, inboxes: list, results, topology: str, interval: int, migrants: int, seed: int):
+    if seed is not None:
+        random.seed(seed + index)
+        np.random.seed(seed + index)
+    # Migrants still in flight when an island ends are dropped instead of blocking its exit
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+    algorithm = factory(index)
+    if hasattr(algorithm.problem, 'set_namespace'):
+        algorithm.problem.set_namespace(f"island{index}")
+    algorithm.observable.register(Migration(algorithm, index, inboxes, topology, interval, migrants,
+                                            None if seed is None else seed + index))
+    algorithm.run()
+    if hasattr(algorithm.problem, 'close'):
+        algorithm.problem.close()
+    # Island 0 also sends its problem: name, labels and settings of the whole run
+    results.put((index, algorithm.get_name(), algorithm.evaluations, algorithm.get_result(),
+                 algorithm.problem if index == 0 else None))
+
+
+class IslandModel():
+    '''
+    factory: island number --> algorithm (e.g. NSGAII), a module level function: it runs in the island process,
+             so every island gets its own problem. Their fitness caches should point to the same file
+    islands: number of islands, one process each
+    topology: 'ring', 'complete' or 'random', see Migration
+    interval: generations between migrations
+    migrants: non-dominated solutions sent on every migration
+    seed: island i seeds random and numpy.random with seed + i
+    '''
+    def __init__(self, factory, islands: int = 4, topology: str = 'ring', interval: int = 5, migrants: int = 2,
+                 seed: int = None):
+        if topology not in TOPOLOGIES:
+            raise Exception(f"Unknown migration topology {topology}, expected one of {TOPOLOGIES}")
+        self.factory = factory
+        self.islands = islands
+        self.topology = topology
+        self.interval = interval
+        self.migrants = migrants
+        self.seed = seed
+        self.name = None
+        self.problem = None
+        self.evaluations = 0
+        self.island_evaluations = []
+        self.total_computing_time = 0
+        self.solutions = []
+
+    def run(self):
+        start = time.time()
+        inboxes = [multiprocessing.Queue() for _ in range(self.islands)]
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=run_island, args=(self.factory, index, inboxes, results,
+                                                                      self.topology, self.interval, self.migrants,
+                                                                      self.seed))
+                     for index in range(self.islands)]
+        for process in processes:
+            process.start()
+
+        # Results are read before joining: a process can't end while its queue holds unread data
+        finished = dict()
+        while len(finished) < self.islands:
+            try:
+                index, name, evaluations, solutions, problem = results.get(timeout=1)
+                finished[index] = (name, evaluations, solutions)
+                self.problem = problem if index == 0 else self.problem
+            except queue.Empty:
+                failed = [process for process in processes if process.exitcode not in (None, 0)]
+                if failed:
+                    for process in processes:
+                        process.terminate()
+                    raise Exception(f"{len(failed)} island(s) failed, exit code {failed[0].exitcode}")
+        for process in processes:
+            process.join()
+
+        self.name = finished[0][0]
+        self.island_evaluations = [finished[index][1] for index in range(self.islands)]
+        self.evaluations = sum(self.island_evaluations)
+        self.solutions = [solution for index in range(self.islands) for solution in finished[index][2]]
+        self.total_computing_time = time.time() - start
+
+    # Final populations of every island
+    def get_result(self) -> list:
+        return self.solutions
+
+    def get_name(self) -> str:
+        return f"Island model ({self.islands} x {self.name}, {self.topology})"
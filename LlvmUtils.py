@@ -8,23 +8,57 @@
 
 """
 
+import os
+import re
+import glob
+import shlex
+import asyncio
+import hashlib
+import threading
 import subprocess
 from shutil import copy as copyfile
 import sys
 import numpy as np
 
+from BitcodeCache import BitcodeCache
+from ProcessRunner import ProcessRunner, LimitExceeded
+
 class LlvmUtils():
     '''
     llvmpath: llvm path
     basepath: work path
     generator: script to merge all benchmark suite
+    cache: resume pass sequences from their longest cached prefix. opt then runs in chunks of cache.stride passes,
+           which doesn't give the same IR as one opt run of the whole sequence (see get_mode)
+    runner: supervises every tool process (timeout, memory and CPU limits), a tool that exceeds them, or that
+            fails, raises LimitExceeded. Default: no limits
     '''
     def __init__(self, llvmpath: str="/llvm/bin/", clangexe: str="clang", optexe: str="opt", 
-                llcexe: str="llc"):
+                llcexe: str="llc", cache: BitcodeCache = None, runner: ProcessRunner = None):
         self.llvmpath = llvmpath
         self.clangexe = clangexe
         self.optexe = optexe
         self.llcexe = llcexe
+        self.cache = cache
+        self.runner = runner if runner is not None else ProcessRunner()
+        self.version = None
+
+    # Major LLVM version of opt, None if it can't be run
+    def get_version(self) -> int:
+        if self.version is None:
+            try:
+                _, output = self.runner.run([f"{self.llvmpath}{self.optexe}", "--version"], capture=True)
+                match = re.search(rb"LLVM version (\d+)", output)
+                self.version = int(match.group(1)) if match else 0
+            except OSError:
+                self.version = 0
+        return self.version or None
+
+    # Compilation mode, part of the fitness cache namespace: chunked opt runs (prefix cache) don't give the
+    # same IR as one opt run of the whole sequence, nor do other LLVM versions
+    def get_mode(self) -> str:
+        chunks = f"prefix{self.cache.stride}" if self.cache is not None else "full"
+        return f"{chunks}_llvm{self.get_version() or 'unknown'}"
 
     @staticmethod
     def get_passes() -> list:
@@ -46,39 +80,151 @@ class LlvmUtils():
                       "-constmerge","-loop-sink","-instsimplify","-div-rem-pairs"]
         return all_passes
 
+    # Analyses: they never change the IR by themselves
+    @staticmethod
+    def get_analysis_passes() -> list:
+        return ["-tti","-targetlibinfo","-assumption-cache-tracker","-profile-summary-info","-verify","-domtree",
+                "-basicaa","-aa","-loops","-lazy-branch-prob","-lazy-block-freq","-opt-remark-emitter","-memoryssa",
+                "-lazy-value-info","-branch-prob","-block-freq","-lcssa-verification","-scalar-evolution",
+                "-phi-values","-memdep","-demanded-bits","-postdomtree","-loop-accesses","-transform-warning"]
+
+    # Immutable alias analyses: later passes use them wherever they appear in the sequence
+    @staticmethod
+    def get_alias_passes() -> list:
+        return ["-tbaa","-scoped-noalias"]
+
+    # Passes sharing one loop pass manager: an analysis between two of them splits it
+    @staticmethod
+    def get_loop_passes() -> list:
+        return ["-loop-rotate","-licm","-loop-unswitch","-indvars","-loop-idiom","-loop-deletion","-loop-unroll"]
+
+    # Passes whose second consecutive run changes nothing
+    @staticmethod
+    def get_idempotent_passes() -> list:
+        return ["-mem2reg","-lower-expect","-forceattrs","-inferattrs","-elim-avail-extern","-strip-dead-prototypes",
+                "-globaldce","-lcssa","-loop-simplify"]
+
+    # Genes --> genes of an equivalent, canonical sequence:
+    #   alias analyses are hoisted to the front (sorted, once), other analyses are removed
+    #   unless they split two loop passes (then a single -domtree is kept) and consecutive
+    #   repetitions of idempotent passes are collapsed
+    @staticmethod
+    def canonicalize(variables: list) -> list:
+        all_passes = LlvmUtils.get_passes()
+        analysis = set(LlvmUtils.get_analysis_passes())
+        alias = set(LlvmUtils.get_alias_passes())
+        loop = set(LlvmUtils.get_loop_passes())
+        idempotent = set(LlvmUtils.get_idempotent_passes())
+        names = [all_passes[v] for v in variables]
+        hoisted = sorted(alias.intersection(names), key=all_passes.index)
+        canonical = []
+        split = False
+        for name in names:
+            if name in alias:
+                continue
+            if name in analysis:
+                split = split or (len(canonical) > 0 and canonical[-1] in loop)
+                continue
+            if split and name in loop:
+                canonical.append("-domtree")
+            split = False
+            if name in idempotent and len(canonical) > 0 and canonical[-1] == name:
+                continue
+            canonical.append(name)
+        return [all_passes.index(name) for name in hoisted + canonical]
+
     # original.bc --> optimized.bc
+    # A sequence opt can't run (e.g. a crash of a pass, or a limit of the runner) fails like the other tools, there
+    # is no per pass retry: the sequence gets penalty objectives instead
     def toIR(self, source: str, output: str, passes: str = '-O3') -> bool:
+        if self.cache is not None:
+            return self.toIRIncremental(source, output, passes)
         resultcode = self.opt(source, output, passes)
-        if resultcode:
-            for p in passes:
-                resultcode = self.opt(source, output, p)
-                if resultcode: raise Exception(f"opt onebyone failed ({resultcode}): {passes}")
+        if resultcode: raise LimitExceeded(f"opt failed ({resultcode}): {passes}")
+
+    # original.bc --> (longest cached prefix.bc) --> optimized.bc
+    # Passes run in chunks of cache.stride, each chunk is cached for later sequences sharing the prefix
+    def toIRIncremental(self, source: str, output: str, passes: str):
+        passlist = passes.split()
+        staged = f"{output}.prefix"
+        input_hash = self.cache.input_hash(source)
+        done = self.cache.lookup(input_hash, passlist, staged)
+        if done == len(passlist) and done > 0:
+            os.replace(staged, output)
+            return
+        current = staged if done else source
+        checkpoints = [end for end in range(self.cache.stride, len(passlist), self.cache.stride) if end > done]
+        for end in checkpoints + [len(passlist)]:
+            resultcode = self.opt(current, output, ' '.join(passlist[done:end]))
+            if resultcode: raise LimitExceeded(f"opt incremental failed ({resultcode}): {passes}")
+            if end % self.cache.stride == 0 and end > 0:
+                self.cache.store(input_hash, passlist[:end], output)
+            if end < len(passlist):
+                os.replace(output, staged)
+                current = staged
+            done = end
+        if os.path.exists(staged):
+            os.remove(staged)
 
     # optimized.bc --> optimized.o
     def toExecutable(self, source: str, output: str): 
         resultcode = self.clang(source, output)
-        if resultcode: raise Exception(f"clang failed ({resultcode}):\n\tsource: '{source}'\n\toutput: '{output}'")
+        if resultcode: raise LimitExceeded(f"clang failed ({resultcode}):\n\tsource: '{source}'\n\toutput: '{output}'")
 
     # optimized.bc --> optimized.ll
     def toAssembly(self, source: str, output: str):
         resultcode = self.llc(source, output)
-        if resultcode: raise Exception(f"llc failed ({resultcode}):\n\tsource: '{source}'\n\toutput: '{output}'")
+        if resultcode: raise LimitExceeded(f"llc failed ({resultcode}):\n\tsource: '{source}'\n\toutput: '{output}'")
+
+    # original.bc --> optimized bitcode in memory (opt stdout)
+    def toIRBytes(self, source: str, passes: str) -> bytes:
+        returncode, bitcode = self.optPipe(source, passes)
+        if returncode: raise LimitExceeded(f"opt failed ({returncode}): {passes}")
+        return bitcode
+
+    # optimized bitcode in memory --> llc stdout, streamed into consumer(stream)
+    def toAssemblyStream(self, bitcode: bytes, consumer):
+        returncode = self.llcPipe(bitcode, consumer)
+        if returncode: raise LimitExceeded(f"llc failed ({returncode}): <stdin>")
+
+    def optPipe(self, source: str, passes: str) -> tuple:
+        command = "{}{} {} {} -o -".format(self.llvmpath, self.optexe, passes, source)
+        return self.runner.run(shlex.split(command), capture=True)
+
+    def llcPipe(self, bitcode: bytes, consumer):
+        command = shlex.split("{}{} - -o -".format(self.llvmpath, self.llcexe))
+        process = self.runner.popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL)
+        # Feeding stdin from another thread, llc can't block on a full stdout pipe
+        def feed():
+            try:
+                process.stdin.write(bitcode)
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+        with self.runner.supervise(process, command):
+            feeder = threading.Thread(target=feed)
+            feeder.start()
+            try:
+                consumer(process.stdout)
+            finally:
+                process.stdout.close()
+                feeder.join()
+            process.wait()
+        return self.runner.check(command, process.returncode)
 
     def opt(self, source: str, output: str, passes: str) -> bool:
         command = "{}{} {} {} -o {}".format(self.llvmpath, self.optexe, passes, source, output)
-        completed = subprocess.run(command,shell=True,stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL)
-        return completed.returncode
+        return self.runner.run(shlex.split(command))[0]
 
     def llc(self, source: str, output: str):
         command = "{}{} {} -o {}".format(self.llvmpath, self.llcexe, source, output)
-        completed = subprocess.run(command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return completed.returncode
+        return self.runner.run(shlex.split(command))[0]
 
     def clang(self, source: str, output: str):
         command = "{}{} -lm -O0 -Wno-everything -disable-llvm-optzns -disable-llvm-passes -Xclang -disable-O0-optnone {} -o {}"\
             .format(self.llvmpath, self.clangexe, source, output)
-        completed = subprocess.run(command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return completed.returncode
+        return self.runner.run(shlex.split(command))[0]
 
     # To add a file to the output file
     @staticmethod
@@ -140,6 +286,68 @@ class LlvmUtils():
                 
 
 
+class AsyncLlvmUtils(LlvmUtils):
+    '''
+    Asyncio toolchain driver: tools are launched with create_subprocess_exec (no shell),
+    so stages of different sequences overlap
+    opt_jobs, llc_jobs, clang_jobs: maximum concurrent processes of each tool
+    runner: timeout, memory and CPU limits of every tool process, see LlvmUtils
+    '''
+    def __init__(self, llvmpath: str="/llvm/bin/", clangexe: str="clang", optexe: str="opt", 
+                llcexe: str="llc", opt_jobs: int=1, llc_jobs: int=1, clang_jobs: int=1, runner: ProcessRunner = None):
+        super(AsyncLlvmUtils, self).__init__(llvmpath=llvmpath, clangexe=clangexe, optexe=optexe, llcexe=llcexe,
+                                             runner=runner)
+        self.jobs = {'opt': opt_jobs, 'llc': llc_jobs, 'clang': clang_jobs}
+        self.semaphores = None
+        self.semaphores_loop = None
+
+    # Semaphores belong to an event loop, they are created again for every new loop
+    def get_semaphore(self, tool: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self.semaphores_loop is not loop:
+            self.semaphores = {name: asyncio.Semaphore(jobs) for name, jobs in self.jobs.items()}
+            self.semaphores_loop = loop
+        return self.semaphores[tool]
+
+    async def run(self, tool: str, args: list, stdin: bytes = None) -> tuple:
+        async with self.get_semaphore(tool):
+            process = await asyncio.create_subprocess_exec(*args,
+                stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+                start_new_session=True)
+            self.runner.limit(process.pid)
+            self.runner.restrict(process.pid)
+            try:
+                stdout, _ = await asyncio.wait_for(process.communicate(stdin), self.runner.timeout)
+            except asyncio.TimeoutError:
+                self.runner.kill(process)
+                await process.wait()
+                raise LimitExceeded(f"{args[0]} timed out after {self.runner.timeout} seconds: {' '.join(args[1:])}")
+            except BaseException:
+                self.runner.kill(process)
+                raise
+            return self.runner.check(args, process.returncode), stdout
+
+    # original.bc --> optimized bitcode in memory
+    async def toIRBytes(self, source: str, passes: str) -> bytes:
+        returncode, bitcode = await self.run('opt', [f"{self.llvmpath}{self.optexe}", *passes.split(), source, "-o", "-"])
+        if returncode: raise LimitExceeded(f"opt failed ({returncode}): {passes}")
+        return bitcode
+
+    # optimized bitcode in memory --> assembly in memory
+    async def toAssemblyBytes(self, bitcode: bytes) -> bytes:
+        returncode, assembly = await self.run('llc', [f"{self.llvmpath}{self.llcexe}", "-", "-o", "-"], stdin=bitcode)
+        if returncode: raise LimitExceeded(f"llc failed ({returncode}): <stdin>")
+        return assembly
+
+    # optimized bitcode in memory --> optimized.o
+    async def toExecutable(self, bitcode: bytes, output: str):
+        returncode, _ = await self.run('clang', [f"{self.llvmpath}{self.clangexe}", "-lm", "-O0", "-Wno-everything",
+            "-disable-llvm-optzns", "-disable-llvm-passes", "-Xclang", "-disable-O0-optnone", "-x", "ir", "-", "-o", output],
+            stdin=bitcode)
+        if returncode: raise LimitExceeded(f"clang failed ({returncode}):\n\tsource: '<stdin>'\n\toutput: '{output}'")
+
+
 class LlvmFiles():
     '''
     basepath = working directory
@@ -148,6 +356,7 @@ class LlvmFiles():
     '''
     def __init__(self, basepath: str='./', source_bc: str='polybench_small_original.bc', jobid: str=''):
         self.basepath = basepath
+        self.source_bc = source_bc
         self.jobid = jobid
         self.original_bc = f"{basepath}{source_bc}"
         self.optimized_bc = f"{basepath}{jobid}_optimized.bc"
@@ -171,3 +380,80 @@ class LlvmFiles():
     
     def get_optimized_exe(self):
         return self.optimized_exe
+
+    # Same source, files namespaced for one worker
+    def for_worker(self, worker: str):
+        return LlvmFiles(basepath=self.basepath, source_bc=self.source_bc, jobid=f"{self.jobid}_{worker}")
+
+    # Files of the '{pid}_{n}' and '{pid}_async_{n}' worker namespaces, whichever process wrote them.
+    # Other namespaces (e.g. islands) are left out
+    def get_worker_files(self) -> list:
+        pattern = re.compile(re.escape(self.jobid) + r"_\d+_(async_)?\d+_optimized\.(bc|ll|o)(\.prefix)?")
+        return [path for path in glob.glob(f"{glob.escape(self.basepath)}{glob.escape(self.jobid)}_*")
+                if pattern.fullmatch(os.path.basename(path))]
+
+
+class LlvmArtifacts():
+    '''
+    llvm: toolchain used to build the artifacts
+    llvmfiles: files namespace
+    passes: optimization passes
+    pipe: stream opt --> llc --> consumer through memory, files are written only when requested
+    debug: in pipe mode, still write the intermediate files
+    Each artifact is built the first time it is requested, never before
+    '''
+    def __init__(self, llvm: LlvmUtils, llvmfiles: LlvmFiles, passes: str, pipe: bool = False, debug: bool = False):
+        self.llvm = llvm
+        self.llvmfiles = llvmfiles
+        self.passes = passes
+        self.pipe = pipe
+        self.debug = debug
+        self.bitcode = None
+        self.optimized_bc = None
+        self.optimized_ll = None
+        self.optimized_exe = None
+
+    # Optimized bitcode in memory. The prefix cache works on files
+    def get_bitcode(self) -> bytes:
+        if self.bitcode is None:
+            if self.pipe and self.llvm.cache is None:
+                self.bitcode = self.llvm.toIRBytes(self.llvmfiles.get_original_bc(), self.passes)
+                if self.debug:
+                    self.get_optimized_bc()
+            else:
+                with open(self.get_optimized_bc(), 'rb') as file:
+                    self.bitcode = file.read()
+        return self.bitcode
+
+    def get_ir_hash(self) -> str:
+        return hashlib.sha256(self.get_bitcode()).hexdigest()
+
+    def get_optimized_bc(self):
+        if self.optimized_bc is None:
+            if self.bitcode is not None:
+                with open(self.llvmfiles.get_optimized_bc(), 'wb') as file:
+                    file.write(self.bitcode)
+            else:
+                self.llvm.toIR(self.llvmfiles.get_original_bc(), self.llvmfiles.get_optimized_bc(), passes=self.passes)
+            self.optimized_bc = self.llvmfiles.get_optimized_bc()
+        return self.optimized_bc
+
+    def get_optimized_ll(self):
+        if self.optimized_ll is None:
+            self.llvm.toAssembly(self.get_optimized_bc(), self.llvmfiles.get_optimized_ll())
+            self.optimized_ll = self.llvmfiles.get_optimized_ll()
+        return self.optimized_ll
+
+    def get_optimized_exe(self):
+        if self.optimized_exe is None:
+            self.llvm.toExecutable(self.get_optimized_bc(), self.llvmfiles.get_optimized_exe())
+            self.optimized_exe = self.llvmfiles.get_optimized_exe()
+        return self.optimized_exe
+
+    # Gives the assembly to consumer(stream): straight from llc stdout in pipe mode, from the .ll file otherwise
+    def scan_assembly(self, consumer):
+        if self.pipe and not self.debug:
+            self.llvm.toAssemblyStream(self.get_bitcode(), consumer)
+        else:
+            with open(self.get_optimized_ll(), 'rb') as file:
+                consumer(file)
@@ -0,0 +1,136 @@
+"""
+.. module:: ProcessRunner
+   :platform: Unix, Windows
+   :synopsis: Supervised subprocesses: wall-clock timeout, memory and CPU limits, kill of the whole process group
+
+"""
+
+import os
+import signal
+import threading
+import subprocess
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+class LimitExceeded(Exception):
+    '''
+    Raised when a supervised process runs out of time or is killed by a signal, e.g. SIGXCPU/SIGKILL (RLIMIT_CPU)
+    or an abort after a failed allocation (RLIMIT_AS). LlvmUtils also raises it when a tool fails: a driver like
+    clang reports the children killed under those limits with an exit status, not a signal
+    '''
+    pass
+
+
+class ProcessRunner():
+    '''
+    timeout: wall-clock seconds of every process before its whole process group is killed (None: no limit)
+    memory: address space limit of every process in bytes, RLIMIT_AS (None: no limit)
+    cpu: CPU seconds of every process, RLIMIT_CPU (None: no limit)
+    affinity: logical CPUs every process is restricted to, e.g. CoreScheduler.get_other_cpus (None: inherited)
+    Every process starts its own session: killing its group also kills the tools it spawned (clang --> cc1, ld)
+    Limits are only applied where resource.prlimit exists (Linux)
+    '''
+    def __init__(self, timeout: float = None, memory: int = None, cpu: int = None, affinity: set = None):
+        self.timeout = timeout
+        self.memory = memory
+        self.cpu = cpu
+        self.affinity = set(affinity) if affinity is not None and hasattr(os, 'sched_setaffinity') else None
+
+    def has_limits(self) -> bool:
+        return hasattr(resource, 'prlimit') and (self.memory is not None or self.cpu is not None)
+
+    # Applied from the parent right after the spawn. A preexec_fn would run Python between fork and exec of a
+    # threaded process and rule out the fast vfork/posix_spawn path
+    def limit(self, pid: int):
+        if not self.has_limits():
+            return
+        try:
+            if self.memory is not None:
+                resource.prlimit(pid, resource.RLIMIT_AS, (self.memory, self.memory))
+            if self.cpu is not None:
+                # SIGXCPU at the soft limit, SIGKILL one second later
+                resource.prlimit(pid, resource.RLIMIT_CPU, (self.cpu, self.cpu + 1))
+        except ProcessLookupError:
+            pass
+
+    def popen(self, command: list, **kwargs) -> subprocess.Popen:
+        with self.restricted():
+            process = subprocess.Popen(command, start_new_session=True, **kwargs)
+        self.limit(process.pid)
+        return process
+
+    # Restricts the calling thread while it spawns, the process and every tool it starts inherit the affinity
+    @contextmanager
+    def restricted(self):
+        if self.affinity is None:
+            yield
+            return
+        affinity = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, self.affinity)
+        try:
+            yield
+        finally:
+            os.sched_setaffinity(0, affinity)
+
+    # Restricts a process spawned elsewhere (asyncio, multiprocessing) from the outside
+    def restrict(self, pid: int):
+        if self.affinity is not None:
+            try:
+                os.sched_setaffinity(pid, self.affinity)
+            except ProcessLookupError:
+                pass
+
+    # Nothing to kill once the process has been waited for: its pid (and group) may belong to another one
+    @staticmethod
+    def kill(process):
+        if process.returncode is not None:
+            return
+        try:
+            if hasattr(os, 'killpg'):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    # Kills the process group when the timeout expires or the block fails, raises LimitExceeded after a timeout
+    @contextmanager
+    def supervise(self, process, command: list):
+        expired = threading.Event()
+        def expire():
+            expired.set()
+            self.kill(process)
+        timer = None
+        if self.timeout is not None:
+            timer = threading.Timer(self.timeout, expire)
+            timer.daemon = True
+            timer.start()
+        try:
+            yield
+        except BaseException:
+            self.kill(process)
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+        if expired.is_set():
+            raise LimitExceeded(f"{command[0]} timed out after {self.timeout} seconds: {' '.join(command[1:])}")
+
+    # The return code, LimitExceeded when the process was killed by a signal
+    @staticmethod
+    def check(command: list, returncode: int) -> int:
+        if returncode < 0:
+            raise LimitExceeded(f"{command[0]} killed by {signal.Signals(-returncode).name}: {' '.join(command[1:])}")
+        return returncode
+
+    # (return code, stdout if captured)
+    def run(self, command: list, stdin: bytes = None, capture: bool = False) -> tuple:
+        process = self.popen(command, stdin=subprocess.PIPE if stdin is not None else subprocess.DEVNULL,
+                             stdout=subprocess.PIPE if capture else subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with self.supervise(process, command):
+            stdout, _ = process.communicate(stdin)
+        return self.check(command, process.returncode), stdout
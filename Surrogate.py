@@ -0,0 +1,82 @@
+"""
+.. module:: Surrogate
+   :platform: Unix, Windows
+   :synopsis: k-nearest-neighbours surrogate that predicts objectives from pass counts
+
+"""
+
+import numpy as np
+
+class Surrogate():
+    '''
+    number_of_passes: length of the pass-count features (upper bound of the genes + 1)
+    k: measured neighbours averaged per prediction
+    min_samples: measured genomes needed before any prediction is trusted
+    uncertainty: spread of the neighbours (in standard deviations of the training values) above which
+                 a genome is compiled anyway
+    '''
+    def __init__(self, number_of_passes: int, k: int = 5, min_samples: int = 100, uncertainty: float = 0.5):
+        self.number_of_passes = number_of_passes
+        self.k = k
+        self.min_samples = min_samples
+        self.uncertainty = uncertainty
+        self.known = set()
+        self.rows = []
+        self.targets = []
+        self.features = None
+        self.values = None
+
+    # [3, 14, 3] --> counts of every pass, order is ignored
+    def to_features(self, genes: list) -> np.ndarray:
+        return np.bincount(np.asarray(genes, dtype=np.int64), minlength=self.number_of_passes)[:self.number_of_passes]
+
+    # Adds measured (genes, objectives) pairs, already known genomes are skipped
+    def update(self, entries):
+        for genes, value in entries:
+            key = tuple(genes)
+            if key in self.known:
+                continue
+            self.known.add(key)
+            self.rows.append(self.to_features(genes))
+            self.targets.append(value)
+        self.features = None
+
+    def is_ready(self) -> bool:
+        return len(self.targets) >= self.min_samples
+
+    # Training matrices, stacked again only after an update
+    def get_training(self) -> tuple:
+        if self.features is None:
+            self.features = np.array(self.rows, dtype=np.float64)
+            self.values = np.array(self.targets, dtype=np.float64)
+        return self.features, self.values
+
+    # Mean objectives of the k nearest measured genomes and their spread (0: all neighbours agree)
+    def predict(self, genes_list: list) -> tuple:
+        features, values = self.get_training()
+        queries = np.array([self.to_features(genes) for genes in genes_list], dtype=np.float64)
+        # Squared euclidean distances without the (queries x training x passes) intermediate
+        distances = (queries ** 2).sum(axis=1)[:, None] + (features ** 2).sum(axis=1)[None, :] - 2 * queries @ features.T
+        k = min(self.k, len(values))
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        neighbours = values[nearest]
+        scale = values.std(axis=0)
+        scale[scale == 0] = 1.0
+        spread = (neighbours.std(axis=1) / scale).mean(axis=1)
+        return neighbours.mean(axis=1), spread
+
+    # Mask of the rows of values no other row dominates; directions: Problem.MINIMIZE (-1) / MAXIMIZE (1)
+    @staticmethod
+    def non_dominated(values: np.ndarray, directions: list) -> np.ndarray:
+        costs = values * -np.asarray(directions, dtype=np.float64)
+        no_worse = (costs[:, None, :] <= costs[None, :, :]).all(axis=2)
+        better = (costs[:, None, :] < costs[None, :, :]).any(axis=2)
+        return ~(no_worse & better).any(axis=0)
+
+    # Genomes worth a real compilation: predicted non-dominated among the batch (measured values included),
+    # or too uncertain. Returns (mask over genes_list, predicted objectives)
+    def screen(self, genes_list: list, directions: list, measured: list) -> tuple:
+        predicted, spread = self.predict(genes_list)
+        batch = np.vstack([predicted] + ([np.array(measured, dtype=np.float64)] if measured else []))
+        promising = self.non_dominated(batch, directions)[:len(genes_list)]
+        return promising | (spread > self.uncertainty), predicted
@@ -3,7 +3,7 @@ from .hype import HYPE
 from .ibea import IBEA
 from .mocell import MOCell
 from .moead import MOEAD, MOEAD_DRA, MOEADIEpsilon
-from .nsgaii import NSGAII, DistributedNSGAII, DynamicNSGAII
+from .nsgaii import NSGAII, DistributedNSGAII, DynamicNSGAII, AsyncNSGAII
 from .omopso import OMOPSO
 from .random_search import RandomSearch
 from .smpso import SMPSO, SMPSORP, DynamicSMPSO
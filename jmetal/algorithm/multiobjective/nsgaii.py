@@ -1,4 +1,5 @@
 import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from typing import TypeVar, List, Generator
 
 try:
@@ -15,7 +16,7 @@ from jmetal.core.problem import Problem, DynamicProblem
 from jmetal.operator import BinaryTournamentSelection
 from jmetal.util.density_estimator import CrowdingDistance
 from jmetal.util.evaluator import Evaluator
-from jmetal.util.ranking import FastNonDominatedRanking
+from jmetal.util.ranking import FastNonDominatedRanking, Ranking, IncrementalNonDominatedRanking
 from jmetal.util.replacement import RankingAndDensityEstimatorReplacement, RemovalPolicyType
 from jmetal.util.comparator import DominanceComparator, Comparator, MultiComparator
 from jmetal.util.termination_criterion import TerminationCriterion
@@ -46,7 +47,8 @@ class NSGAII(GeneticAlgorithm[S, R]):
                  termination_criterion: TerminationCriterion = store.default_termination_criteria,
                  population_generator: Generator = store.default_generator,
                  population_evaluator: Evaluator = store.default_evaluator,
-                 dominance_comparator: Comparator = store.default_comparator):
+                 dominance_comparator: Comparator = store.default_comparator,
+                 ranking: Ranking = None):
         """
         NSGA-II implementation as described in
 
@@ -65,6 +67,8 @@ class NSGAII(GeneticAlgorithm[S, R]):
         :param mutation: Mutation operator (see :py:mod:`jmetal.operator.mutation`).
         :param crossover: Crossover operator (see :py:mod:`jmetal.operator.crossover`).
         :param selection: Selection operator (see :py:mod:`jmetal.operator.selection`).
+        :param ranking: Ranking used by the replacement (default: :class:`FastNonDominatedRanking` with the
+            dominance comparator), e.g. :class:`VectorizedNonDominatedRanking` for large populations.
         """
         super(NSGAII, self).__init__(
             problem=problem,
@@ -78,6 +82,7 @@ class NSGAII(GeneticAlgorithm[S, R]):
             population_generator=population_generator
         )
         self.dominance_comparator = dominance_comparator
+        self.ranking = ranking
 
     def replacement(self, population: List[S], offspring_population: List[S]) -> List[List[S]]:
         """ This method joins the current and offspring populations to produce the population of the next generation
@@ -87,7 +92,7 @@ class NSGAII(GeneticAlgorithm[S, R]):
         :param offspring_population: Offspring population.
         :return: New population after ranking and crowding distance selection is applied.
         """
-        ranking = FastNonDominatedRanking(self.dominance_comparator)
+        ranking = self.ranking if self.ranking is not None else FastNonDominatedRanking(self.dominance_comparator)
         density_estimator = CrowdingDistance()
 
         r = RankingAndDensityEstimatorReplacement(ranking, density_estimator, RemovalPolicyType.ONE_SHOT)
@@ -299,6 +304,173 @@ class DistributedNSGAII(Algorithm[S, R]):
         return 'dNSGA-II'
 
 
+
+class AsyncNSGAII(Algorithm[S, R]):
+    """ Asynchronous steady-state NSGA-II on a local process pool (no dask needed, unlike
+    :class:`DistributedNSGAII`).
+
+    number_of_workers evaluations are always in flight: as soon as one finishes, its solution replaces the worst
+    one of the population and a new offspring is submitted, so no worker waits for the slowest evaluation of a
+    generation. The ranking is updated incrementally on every insertion and the crowding distance is only computed
+    again on the fronts that changed.
+
+    The problem is sent once to every worker process; problems with per process state (files, caches) rebuild it
+    there, e.g. the scratch files of the LLVM problem are keyed by the worker pid. Output of the problem in the
+    workers (e.g. epochs, which only the algorithm counts) should be turned off, observers report the progress.
+    """
+
+    def __init__(self,
+                 problem: Problem,
+                 population_size: int,
+                 mutation: Mutation,
+                 crossover: Crossover,
+                 number_of_workers: int,
+                 selection: Selection = BinaryTournamentSelection(
+                     MultiComparator([FastNonDominatedRanking.get_comparator(),
+                                      CrowdingDistance.get_comparator()])),
+                 termination_criterion: TerminationCriterion = store.default_termination_criteria,
+                 dominance_comparator: DominanceComparator = DominanceComparator()):
+        super(AsyncNSGAII, self).__init__()
+        self.problem = problem
+        self.population_size = population_size
+        self.mutation_operator = mutation
+        self.crossover_operator = crossover
+        self.selection_operator = selection
+        self.dominance_comparator = dominance_comparator
+
+        self.termination_criterion = termination_criterion
+        self.observable.register(termination_criterion)
+
+        self.number_of_workers = number_of_workers
+        self.ranking = IncrementalNonDominatedRanking(dominance_comparator)
+        self.density_estimator = CrowdingDistance()
+        self.executor = None
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        """ Worker pool of the algorithm, started on first use and shut down by :meth:`close`. """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.number_of_workers, initializer=_initialize_worker,
+                                                initargs=(self.problem,))
+        return self.executor
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    def create_initial_solutions(self) -> List[S]:
+        return [self.problem.create_solution() for _ in range(self.population_size)]
+
+    def evaluate(self, solutions: List[S]) -> List[S]:
+        return list(self.get_executor().map(_evaluate_in_worker, solutions))
+
+    def stopping_condition_is_met(self) -> bool:
+        return self.termination_criterion.is_met
+
+    def get_observable_data(self) -> dict:
+        ctime = time.time() - self.start_computing_time
+
+        return {'PROBLEM': self.problem,
+                'EVALUATIONS': self.evaluations,
+                'SOLUTIONS': self.get_result(),
+                'COMPUTING_TIME': ctime}
+
+    def init_progress(self) -> None:
+        self.ranking.compute_ranking(self.solutions)
+        for front in self.ranking.ranked_sublists:
+            self.density_estimator.compute_density_estimator(front)
+        self.solutions = [solution for front in self.ranking.ranked_sublists for solution in front]
+
+        observable_data = self.get_observable_data()
+        self.observable.notify_all(**observable_data)
+
+    def step(self) -> None:
+        pass
+
+    def update_progress(self):
+        observable_data = self.get_observable_data()
+        self.observable.notify_all(**observable_data)
+
+    def create_offspring(self) -> S:
+        mating_population = [self.selection_operator.execute(self.solutions) for _ in range(2)]
+        offspring = self.crossover_operator.execute(mating_population)
+
+        return self.mutation_operator.execute(offspring[0])
+
+    def insert(self, solution: S) -> None:
+        """ Adds an evaluated solution and removes the one with the lowest crowding distance of the last front. """
+        for rank in self.ranking.add(solution):
+            self.density_estimator.compute_density_estimator(self.ranking.get_subfront(rank))
+
+        last = self.ranking.ranked_sublists[-1]
+        worst = min(last, key=lambda member: member.attributes['crowding_distance'])
+        for rank in self.ranking.remove(worst):
+            self.density_estimator.compute_density_estimator(self.ranking.get_subfront(rank))
+
+        self.solutions = [member for front in self.ranking.ranked_sublists for member in front]
+
+    def run(self):
+        """ Execute the algorithm. """
+        self.start_computing_time = time.time()
+
+        executor = self.get_executor()
+        try:
+            pending = set(executor.submit(_evaluate_in_worker, self.problem.create_solution())
+                          for _ in range(min(self.number_of_workers, self.population_size)))
+            created = len(pending)
+
+            population = []
+            while len(population) < self.population_size:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    population.append(future.result())
+                    if created < self.population_size:
+                        pending.add(executor.submit(_evaluate_in_worker, self.problem.create_solution()))
+                        created += 1
+
+            self.evaluations = len(population)
+            self.solutions = population
+            self.init_progress()
+
+            while len(pending) < self.number_of_workers:
+                pending.add(executor.submit(_evaluate_in_worker, self.create_offspring()))
+
+            while not self.stopping_condition_is_met():
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.insert(future.result())
+                    self.evaluations += 1
+
+                    self.update_progress()
+                    if self.stopping_condition_is_met():
+                        break
+
+                    pending.add(executor.submit(_evaluate_in_worker, self.create_offspring()))
+        finally:
+            self.close()
+
+        self.total_computing_time = time.time() - self.start_computing_time
+
+    def get_result(self) -> R:
+        return self.solutions
+
+    def get_name(self) -> str:
+        return 'aNSGA-II'
+
+
+# Problem of an AsyncNSGAII worker process, received once when the process starts
+_worker_problem = None
+
+
+def _initialize_worker(problem: Problem):
+    global _worker_problem
+    _worker_problem = problem
+
+
+def _evaluate_in_worker(solution: S) -> S:
+    return _worker_problem.evaluate(solution)
+
+
 def reproduction(mating_population: List[S], problem, crossover_operator, mutation_operator) -> S:
     offspring_pool = []
     for parents in zip(*[iter(mating_population)] * 2):
@@ -1,8 +1,12 @@
+import copy
 from typing import TypeVar, List
 
+import numpy as np
+
 from jmetal.config import store
 from jmetal.core.algorithm import EvolutionaryAlgorithm
 from jmetal.core.operator import Mutation, Crossover, Selection
+from jmetal.core.population import IntegerPopulation
 from jmetal.core.problem import Problem
 from jmetal.util.evaluator import Evaluator
 from jmetal.util.generator import Generator
@@ -77,6 +81,9 @@ class GeneticAlgorithm(EvolutionaryAlgorithm[S, R]):
         if len(mating_population) % number_of_parents_to_combine != 0:
             raise Exception('Wrong number of parents')
 
+        if hasattr(self.crossover_operator, 'execute_batch') and hasattr(self.mutation_operator, 'execute_batch'):
+            return self.batch_reproduction(mating_population)
+
         offspring_population = []
         for i in range(0, self.offspring_population_size, number_of_parents_to_combine):
             parents = []
@@ -93,6 +100,28 @@ class GeneticAlgorithm(EvolutionaryAlgorithm[S, R]):
 
         return offspring_population
 
+    def batch_reproduction(self, mating_population: List[S]) -> List[S]:
+        """ Crossover and mutation of the whole mating pool as one genome matrix (batch operators). Every offspring
+        is a copy of the parent in the same position with the new genome. Views of an :class:`IntegerPopulation`
+        are read and written as rows of its matrices.
+        """
+        population = getattr(mating_population[0], 'population', None)
+        rows = isinstance(population, IntegerPopulation) and population.owns(mating_population)
+        genomes = population.get_genomes(mating_population) if rows else \
+            np.array([solution.variables for solution in mating_population])
+        lower_bound, upper_bound = mating_population[0].lower_bound, mating_population[0].upper_bound
+
+        offspring_genomes = self.crossover_operator.execute_batch(genomes, lower_bound, upper_bound)
+        self.mutation_operator.execute_batch(offspring_genomes, lower_bound, upper_bound)
+
+        offspring_population = []
+        for parent, genome in zip(mating_population, offspring_genomes[:self.offspring_population_size]):
+            solution = copy.copy(parent)
+            solution.variables = genome if rows else genome.tolist()
+            offspring_population.append(solution)
+
+        return offspring_population
+
     def replacement(self, population: List[S], offspring_population: List[S]) -> List[S]:
         population.extend(offspring_population)
 
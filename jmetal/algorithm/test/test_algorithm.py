@@ -1,6 +1,6 @@
 import unittest
 
-from jmetal.algorithm.multiobjective.nsgaii import NSGAII
+from jmetal.algorithm.multiobjective.nsgaii import NSGAII, AsyncNSGAII
 from jmetal.algorithm.multiobjective.smpso import SMPSO
 from jmetal.core.quality_indicator import HyperVolume
 from jmetal.operator import PolynomialMutation, SBXCrossover
@@ -30,6 +30,40 @@ class RunningAlgorithmsTestCases(unittest.TestCase):
             termination_criterion=StoppingByEvaluations(max=1000)
         ).run()
 
+    def test_AsyncNSGAII(self):
+        algorithm = AsyncNSGAII(
+            problem=self.problem,
+            population_size=20,
+            mutation=self.mutation,
+            crossover=self.crossover,
+            number_of_workers=2,
+            termination_criterion=StoppingByEvaluations(max=200)
+        )
+        algorithm.run()
+
+        self.assertEqual(20, len(algorithm.get_result()))
+        self.assertEqual(200, algorithm.evaluations)
+        self.assertIsNone(algorithm.executor)
+
+    def test_AsyncNSGAII_evaluate_reuses_the_pool(self):
+        algorithm = AsyncNSGAII(
+            problem=self.problem,
+            population_size=4,
+            mutation=self.mutation,
+            crossover=self.crossover,
+            number_of_workers=2,
+            termination_criterion=StoppingByEvaluations(max=4)
+        )
+        try:
+            solutions = algorithm.evaluate(algorithm.create_initial_solutions())
+            executor = algorithm.executor
+            algorithm.evaluate(algorithm.create_initial_solutions())
+            self.assertIs(executor, algorithm.executor)
+            self.assertEqual(4, len(solutions))
+        finally:
+            algorithm.close()
+        self.assertIsNone(algorithm.executor)
+
     def test_SMPSO(self):
         SMPSO(
             problem=self.problem,
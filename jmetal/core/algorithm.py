@@ -86,6 +86,18 @@ class Algorithm(Generic[S, R], threading.Thread, ABC):
 
         self.total_computing_time = time.time() - self.start_computing_time
 
+    def resume(self):
+        """ Continue the main loop from the current solutions, e.g. restored from a checkpoint. The computing time
+        goes on from total_computing_time. """
+        self.start_computing_time = time.time() - self.total_computing_time
+
+        LOGGER.debug('Resuming main loop until termination criteria is met')
+        while not self.stopping_condition_is_met():
+            self.step()
+            self.update_progress()
+
+        self.total_computing_time = time.time() - self.start_computing_time
+
     @abstractmethod
     def get_result(self) -> R:
         pass
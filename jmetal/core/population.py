@@ -0,0 +1,307 @@
+import copy
+from collections.abc import MutableMapping
+from typing import List, Tuple
+
+import numpy as np
+
+from jmetal.core.solution import IntegerSolution
+
+"""
+.. module:: population
+   :platform: Unix, Windows
+   :synopsis: Structure-of-arrays storage of integer solutions.
+
+Genomes, objectives and constraints of a whole population are rows of three NumPy matrices and the bounds are
+stored once. Solutions are handed out as light views over one row, so the operators and algorithms written for
+:class:`IntegerSolution` keep working unchanged.
+"""
+
+# Attributes stored as float columns (NaN: not set) instead of per solution dictionaries
+COLUMNS = {'dominance_ranking': int, 'crowding_distance': float}
+
+
+class Block:
+    """ Rows of the genomes, objectives, constraints and attribute columns. A block is never reallocated, so the
+    row arrays handed out by the views stay valid while the population grows.
+    """
+
+    def __init__(self, size: int, number_of_variables: int, number_of_objectives: int, number_of_constraints: int,
+                 dtype: np.dtype):
+        self.genomes = np.zeros((size, number_of_variables), dtype=dtype)
+        self.objectives = np.zeros((size, number_of_objectives))
+        self.constraints = np.zeros((size, number_of_constraints))
+        self.columns = {name: np.full(size, np.nan) for name in COLUMNS}
+
+
+class IntegerPopulation:
+    """ Rows of the genomes, objectives, constraints and attribute columns of integer solutions.
+
+    Rows are reused once their view is garbage collected, so a population that is replaced every generation
+    keeps a bounded footprint. When it runs out of rows the population adds a block of ``capacity`` rows; the
+    existing blocks stay where they are, so the arrays taken from the solutions (``solution.variables``) keep
+    writing to the population.
+
+    The genome type is the smallest signed integer type in which sums and differences of genes (e.g. the SBX
+    crossover ones) can't overflow.
+
+    :param lower_bound: Lower bound of every variable, shared by all the solutions.
+    :param upper_bound: Upper bound of every variable, shared by all the solutions.
+    :param number_of_objectives: Number of objectives.
+    :param number_of_constraints: Number of constraints.
+    :param capacity: Number of rows of every block.
+    """
+
+    def __init__(self, lower_bound: List[int], upper_bound: List[int], number_of_objectives: int,
+                 number_of_constraints: int = 0, capacity: int = 16):
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.number_of_variables = len(lower_bound)
+        self.number_of_objectives = number_of_objectives
+        self.number_of_constraints = number_of_constraints
+
+        self.dtype = self.genome_type(lower_bound, upper_bound)
+        self.block_size = max(capacity, 1)
+        self.blocks = []
+        self.extra = {}
+        self.free = []
+        self.grow()
+
+    @staticmethod
+    def genome_type(lower_bound: List[int], upper_bound: List[int]) -> np.dtype:
+        magnitude = max([abs(bound) for bound in list(lower_bound) + list(upper_bound)] + [0])
+        for dtype in (np.int16, np.int32):
+            if 4 * magnitude <= np.iinfo(dtype).max:
+                return np.dtype(dtype)
+        return np.dtype(np.int64)
+
+    def __len__(self) -> int:
+        return self.get_capacity() - len(self.free)
+
+    def get_capacity(self) -> int:
+        return len(self.blocks) * self.block_size
+
+    def grow(self):
+        capacity = self.get_capacity()
+        self.blocks.append(Block(self.block_size, self.number_of_variables, self.number_of_objectives,
+                                 self.number_of_constraints, self.dtype))
+        self.free.extend(range(capacity + self.block_size - 1, capacity - 1, -1))
+
+    def locate(self, index: int) -> Tuple[Block, int]:
+        block, row = divmod(index, self.block_size)
+        return self.blocks[block], row
+
+    def allocate(self) -> int:
+        if not self.free:
+            self.grow()
+        return self.free.pop()
+
+    def release(self, index: int):
+        block, row = self.locate(index)
+        for column in block.columns.values():
+            column[row] = np.nan
+        self.extra.pop(index, None)
+        self.free.append(index)
+
+    def create_solution(self, variables=None) -> 'IntegerSolutionView':
+        """ New solution with zeroed objectives and constraints. """
+        index = self.allocate()
+        block, row = self.locate(index)
+        block.genomes[row] = variables if variables is not None else 0
+        block.objectives[row] = 0.0
+        block.constraints[row] = 0.0
+        return IntegerSolutionView(self, index)
+
+    def add(self, solution: IntegerSolution) -> 'IntegerSolutionView':
+        """ Copies a solution (e.g. a new one created by the problem) into a row and returns its view. """
+        view = self.create_solution(solution.variables)
+        view.objectives = solution.objectives
+        view.constraints = solution.constraints
+        view.attributes = solution.attributes
+        return view
+
+    def add_all(self, solutions: List[IntegerSolution]) -> List['IntegerSolutionView']:
+        return [self.add(solution) for solution in solutions]
+
+    def copy_row(self, index: int, memo: dict = None) -> 'IntegerSolutionView':
+        new_index = self.allocate()
+        (block, row), (new_block, new_row) = self.locate(index), self.locate(new_index)
+        new_block.genomes[new_row] = block.genomes[row]
+        new_block.objectives[new_row] = block.objectives[row]
+        new_block.constraints[new_row] = block.constraints[row]
+        for name, column in block.columns.items():
+            new_block.columns[name][new_row] = column[row]
+        if index in self.extra:
+            self.extra[new_index] = copy.deepcopy(self.extra[index], memo) if memo is not None \
+                else self.extra[index].copy()
+        return IntegerSolutionView(self, new_index)
+
+    def owns(self, solutions: List[IntegerSolution]) -> bool:
+        """ Whether every solution is a view of this population. """
+        return all(isinstance(solution, IntegerSolutionView) and solution.population is self
+                   for solution in solutions)
+
+    # Matrices of a list of views, e.g. to rank or reproduce a whole population at once
+    def get_genomes(self, solutions: List['IntegerSolutionView']) -> np.ndarray:
+        return self.gather([block.genomes for block in self.blocks], solutions)
+
+    def get_objectives(self, solutions: List['IntegerSolutionView']) -> np.ndarray:
+        return self.gather([block.objectives for block in self.blocks], solutions)
+
+    def gather(self, matrices: List[np.ndarray], solutions: List['IntegerSolutionView']) -> np.ndarray:
+        matrix = matrices[0] if len(matrices) == 1 else np.concatenate(matrices)
+        return matrix[[solution.index for solution in solutions]]
+
+
+class SolutionAttributes(MutableMapping):
+    """ Attributes dictionary of a view: the keys in COLUMNS live in the population columns, any other key in a
+    dictionary created only for the rows that need one.
+    """
+
+    __slots__ = ('population', 'index', 'columns', 'row')
+
+    def __init__(self, population: IntegerPopulation, index: int):
+        self.population = population
+        self.index = index
+        block, self.row = population.locate(index)
+        self.columns = block.columns
+
+    def __getitem__(self, key):
+        if key in COLUMNS:
+            value = self.columns[key][self.row]
+            if np.isnan(value):
+                raise KeyError(key)
+            return COLUMNS[key](value)
+        return self.population.extra.get(self.index, {})[key]
+
+    def __setitem__(self, key, value):
+        if key in COLUMNS:
+            self.columns[key][self.row] = value
+        else:
+            self.population.extra.setdefault(self.index, {})[key] = value
+
+    def __delitem__(self, key):
+        if key in COLUMNS:
+            if key not in self:
+                raise KeyError(key)
+            self.columns[key][self.row] = np.nan
+        else:
+            extra = self.population.extra.get(self.index, {})
+            del extra[key]
+            if not extra:
+                self.population.extra.pop(self.index, None)
+
+    def __iter__(self):
+        for name, column in self.columns.items():
+            if not np.isnan(column[self.row]):
+                yield name
+        yield from list(self.population.extra.get(self.index, {}))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+
+class IntegerSolutionView(IntegerSolution):
+    """ Integer solution whose data is one row of an :class:`IntegerPopulation`.
+
+    Variables, objectives and constraints are NumPy views of the row, so in place updates such as
+    ``solution.variables[i] = value`` write to the population. Copies take a new row of the same population and
+    pickled views are restored as plain :class:`IntegerSolution` objects.
+    """
+
+    def __init__(self, population: IntegerPopulation, index: int):
+        self.population = population
+        self.index = index
+        self.block, self.row = population.locate(index)
+
+    def __del__(self):
+        try:
+            self.population.release(self.index)
+        except (AttributeError, TypeError):
+            pass
+
+    @property
+    def number_of_variables(self) -> int:
+        return self.population.number_of_variables
+
+    @property
+    def number_of_objectives(self) -> int:
+        return self.population.number_of_objectives
+
+    @property
+    def number_of_constrains(self) -> int:
+        return self.population.number_of_constraints
+
+    @property
+    def lower_bound(self) -> List[int]:
+        return self.population.lower_bound
+
+    @property
+    def upper_bound(self) -> List[int]:
+        return self.population.upper_bound
+
+    @property
+    def variables(self) -> np.ndarray:
+        return self.block.genomes[self.row]
+
+    @variables.setter
+    def variables(self, variables):
+        self.block.genomes[self.row] = variables
+
+    @property
+    def objectives(self) -> np.ndarray:
+        return self.block.objectives[self.row]
+
+    @objectives.setter
+    def objectives(self, objectives):
+        self.block.objectives[self.row] = objectives
+
+    @property
+    def constraints(self) -> np.ndarray:
+        return self.block.constraints[self.row]
+
+    @constraints.setter
+    def constraints(self, constraints):
+        self.block.constraints[self.row] = constraints
+
+    @property
+    def attributes(self) -> SolutionAttributes:
+        return SolutionAttributes(self.population, self.index)
+
+    @attributes.setter
+    def attributes(self, attributes: dict):
+        attributes = dict(attributes)
+        current = self.attributes
+        current.clear()
+        current.update(attributes)
+
+    def __eq__(self, solution) -> bool:
+        if isinstance(solution, IntegerSolution):
+            return np.array_equal(self.variables, solution.variables)
+        return False
+
+    __hash__ = None
+
+    def __copy__(self):
+        return self.population.copy_row(self.index)
+
+    def __deepcopy__(self, memo):
+        return self.population.copy_row(self.index, memo)
+
+    def detach(self) -> IntegerSolution:
+        """ Plain :class:`IntegerSolution` with the values of the row. """
+        solution = IntegerSolution(self.lower_bound, self.upper_bound, self.number_of_objectives,
+                                   self.number_of_constrains)
+        solution.variables = self.variables.tolist()
+        solution.objectives = self.objectives.tolist()
+        solution.constraints = self.constraints.tolist()
+        solution.attributes = copy.deepcopy(self.attributes.copy())
+        return solution
+
+    def __reduce__(self):
+        return self.detach().__reduce__()
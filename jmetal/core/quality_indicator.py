@@ -4,6 +4,8 @@ from typing import TypeVar, List
 import numpy as np
 from scipy import spatial
 
+from jmetal.util.hypervolume import hypervolume, HypervolumeContributions
+
 S = TypeVar('S')
 
 """
@@ -123,12 +125,18 @@ class HyperVolume(QualityIndicator):
       algorithm for the hypervolume indicator. In IEEE Congress on Evolutionary
       Computation, pages 1157-1163, Vancouver, Canada, July 2006.
 
+    By default the value is computed with the WFG algorithm (see :py:mod:`jmetal.util.hypervolume`), which is
+    much faster on fronts with many points and objectives; `method='fonseca'` keeps the dimension-sweep.
+
     Minimization is implicitly assumed here!
     """
 
-    def __init__(self, reference_point: List[float]):
+    def __init__(self, reference_point: List[float], method: str = 'wfg'):
         super(HyperVolume, self).__init__(is_minimization=False)
+        if method not in ('wfg', 'fonseca'):
+            raise Exception('Invalid hypervolume method: {0}'.format(method))
         self.referencePoint = reference_point
+        self.method = method
         self.list: MultiList = []
 
     def compute(self, solutions: List[S]):
@@ -138,6 +146,9 @@ class HyperVolume(QualityIndicator):
         """
         front = [s.objectives for s in solutions]
 
+        if self.method == 'wfg':
+            return hypervolume(front, self.referencePoint)
+
         def weakly_dominates(point, other):
             for i in range(len(point)):
                 if point[i] > other[i]:
@@ -162,6 +173,13 @@ class HyperVolume(QualityIndicator):
 
         return self._hv_recursive(dimensions - 1, len(relevant_points), bounds)
 
+    def contributions(self, solutions: List[S]) -> List[float]:
+        """ Exclusive hypervolume contribution of every solution: the volume lost if it is removed.
+
+        :return: One contribution per solution, in the same order.
+        """
+        return HypervolumeContributions(self.referencePoint, [s.objectives for s in solutions]).get_contributions()
+
     def _hv_recursive(self, dim_index: int, length: int, bounds: list):
         """Recursive call to hypervolume calculation.
 
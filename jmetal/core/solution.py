@@ -1,3 +1,4 @@
+import copy
 from abc import ABC
 from typing import List, Generic, TypeVar
 
@@ -107,6 +108,13 @@ class IntegerSolution(Solution[int]):
 
         return new_solution
 
+    def __deepcopy__(self, memo):
+        # The bounds are the same for every solution of a problem, they are shared instead of copied
+        new_solution = self.__copy__()
+        new_solution.attributes = copy.deepcopy(self.attributes, memo)
+
+        return new_solution
+
 
 class PermutationSolution(Solution):
     """ Class representing permutation solutions """
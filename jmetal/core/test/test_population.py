@@ -0,0 +1,174 @@
+import copy
+import gc
+import pickle
+import random
+import unittest
+
+import numpy as np
+
+from jmetal.algorithm.multiobjective.nsgaii import NSGAII
+from jmetal.core.population import IntegerPopulation, IntegerSolutionView
+from jmetal.core.problem import IntegerProblem
+from jmetal.core.solution import IntegerSolution
+from jmetal.operator import SBXCrossover, IntegerPolynomialMutation, BatchSBXCrossover, \
+    BatchIntegerPolynomialMutation
+from jmetal.util.termination_criterion import StoppingByEvaluations
+
+
+class IntegerPopulationTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.lower_bound = [0, 0, 0]
+        self.upper_bound = [86, 86, 86]
+        self.population = IntegerPopulation(self.lower_bound, self.upper_bound, 2, capacity=2)
+
+    def test_should_genome_type_be_a_small_signed_integer(self):
+        self.assertEqual(np.int16, self.population.dtype)
+        self.assertEqual(np.int64, IntegerPopulation.genome_type([0], [2 ** 40]))
+
+    def test_should_add_copy_the_solution_into_a_row(self):
+        solution = IntegerSolution(self.lower_bound, self.upper_bound, 2)
+        solution.variables = [3, 14, 15]
+        solution.objectives = [1.0, 2.0]
+        solution.attributes['dominance_ranking'] = 1
+        solution.attributes['other'] = [1, 2]
+
+        view = self.population.add(solution)
+
+        self.assertEqual([3, 14, 15], view.variables.tolist())
+        self.assertEqual([[3, 14, 15]], self.population.get_genomes([view]).tolist())
+        self.assertEqual([1.0, 2.0], view.objectives.tolist())
+        self.assertEqual({'dominance_ranking': 1, 'other': [1, 2]}, dict(view.attributes))
+        self.assertIs(self.lower_bound, view.lower_bound)
+        self.assertEqual(3, view.number_of_variables)
+
+    def test_should_views_update_the_population_in_place(self):
+        view = self.population.create_solution([1, 2, 3])
+
+        view.variables[1] = 20
+        view.objectives[0] = 5.0
+        view.attributes['crowding_distance'] = float('inf')
+
+        self.assertEqual([[1, 20, 3]], self.population.get_genomes([view]).tolist())
+        self.assertEqual(5.0, self.population.get_objectives([view])[0, 0])
+        self.assertEqual(float('inf'), self.population.locate(view.index)[0].columns['crowding_distance'][view.row])
+        self.assertEqual(None, view.attributes.get('dominance_ranking'))
+
+    def test_should_copies_be_independent_rows_sharing_the_bounds(self):
+        view = self.population.create_solution([1, 2, 3])
+        view.attributes['other'] = [1]
+
+        copies = [copy.copy(view), copy.deepcopy(view), copy.deepcopy(view)]
+        copies[0].variables[0] = 10
+        copies[1].attributes['other'].append(2)
+
+        self.assertEqual([1, 2, 3], view.variables.tolist())
+        self.assertEqual([1], view.attributes['other'])
+        self.assertEqual(4, len(self.population))
+        self.assertIs(view.upper_bound, copies[2].upper_bound)
+        self.assertTrue(view == copies[2])
+        self.assertFalse(view == copies[0])
+
+    def test_should_rows_be_reused_when_the_views_are_released(self):
+        views = [self.population.create_solution([i, i, i]) for i in range(5)]
+        capacity = self.population.get_capacity()
+        views[0].attributes['dominance_ranking'] = 0
+
+        del views[:4]
+        gc.collect()
+        views += [self.population.create_solution([7, 7, 7]) for _ in range(4)]
+
+        self.assertEqual(5, len(self.population))
+        self.assertEqual(capacity, self.population.get_capacity())
+        self.assertEqual([4, 4, 4], views[0].variables.tolist())
+        self.assertTrue(all(len(view.attributes) == 0 for view in views))
+
+    def test_should_rows_taken_before_the_population_grows_stay_valid(self):
+        views = [self.population.create_solution([i, i, i]) for i in range(2)]
+        variables, objectives = views[0].variables, views[1].objectives
+
+        views += [self.population.create_solution([7, 7, 7]) for _ in range(5)]
+        variables[0] = 20
+        objectives[1] = 3.0
+
+        self.assertGreater(self.population.get_capacity(), 2)
+        self.assertEqual([20, 0, 0], views[0].variables.tolist())
+        self.assertEqual([[20, 0, 0], [1, 1, 1], [7, 7, 7]], self.population.get_genomes(views[:3]).tolist())
+        self.assertEqual(3.0, self.population.get_objectives([views[1]])[0, 1])
+
+    def test_should_pickled_views_be_restored_as_integer_solutions(self):
+        view = self.population.create_solution([1, 2, 3])
+        view.objectives = [4.0, 5.0]
+
+        solution = pickle.loads(pickle.dumps(view))
+
+        self.assertIs(IntegerSolution, type(solution))
+        self.assertEqual([1, 2, 3], solution.variables)
+        self.assertEqual([4.0, 5.0], solution.objectives)
+
+
+class IntegerSolutionViewNSGAIITestCases(unittest.TestCase):
+
+    class Problem(IntegerProblem):
+
+        def __init__(self):
+            super().__init__()
+            self.number_of_variables = 10
+            self.number_of_objectives = 2
+            self.number_of_constraints = 0
+            self.lower_bound = [0] * self.number_of_variables
+            self.upper_bound = [86] * self.number_of_variables
+            self.population = IntegerPopulation(self.lower_bound, self.upper_bound, self.number_of_objectives)
+
+        def create_solution(self) -> IntegerSolutionView:
+            return self.population.add(super().create_solution())
+
+        def evaluate(self, solution):
+            solution.objectives[0] = sum(solution.variables)
+            solution.objectives[1] = sum(86 - v for v in solution.variables[::2])
+            return solution
+
+        def get_name(self) -> str:
+            return 'Integer views'
+
+    def run_nsgaii(self, problem, mutation, crossover) -> NSGAII:
+        random.seed(1)
+        algorithm = NSGAII(
+            problem=problem,
+            population_size=20,
+            offspring_population_size=20,
+            mutation=mutation,
+            crossover=crossover,
+            termination_criterion=StoppingByEvaluations(max=400)
+        )
+        algorithm.run()
+        return algorithm
+
+    def test_should_nsgaii_run_on_views(self):
+        problem = self.Problem()
+        algorithm = self.run_nsgaii(problem, IntegerPolynomialMutation(probability=0.1, distribution_index=20),
+                                    SBXCrossover(probability=0.9, distribution_index=20))
+
+        result = algorithm.get_result()
+        gc.collect()
+
+        self.assertEqual(20, len(result))
+        self.assertTrue(all(isinstance(solution, IntegerSolutionView) for solution in result))
+        self.assertTrue(all(0 <= v <= 86 for solution in result for v in solution.variables))
+        self.assertTrue(all(solution.objectives[0] == sum(solution.variables) for solution in result))
+        self.assertLessEqual(len(problem.population), 2 * 20 + 2)
+
+    def test_should_nsgaii_run_on_views_with_batch_operators(self):
+        problem = self.Problem()
+        algorithm = self.run_nsgaii(problem, BatchIntegerPolynomialMutation(0.1, distribution_index=20, seed=1),
+                                    BatchSBXCrossover(0.9, distribution_index=20, seed=1))
+
+        result = algorithm.get_result()
+
+        self.assertEqual(20, len(result))
+        self.assertTrue(all(isinstance(solution, IntegerSolutionView) for solution in result))
+        self.assertTrue(all(solution.objectives[0] == sum(solution.variables) for solution in result))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -28,6 +28,25 @@ class HyperVolumeTestCases(unittest.TestCase):
 
         self.assertEqual(5.0, value)
 
+    def test_should_hypervolume_methods_return_the_same_value(self):
+        reference_point = [1.2, 1.2, 1.2, 1.2]
+        front = []
+        for objectives in [[0.1, 0.9, 0.5, 0.3], [0.9, 0.1, 0.3, 0.5], [0.5, 0.5, 0.5, 0.5], [0.3, 0.3, 0.9, 0.9]]:
+            solution = Solution(1, 4)
+            solution.objectives = objectives
+            front.append(solution)
+
+        self.assertAlmostEqual(HyperVolume(reference_point, method='fonseca').compute(front),
+                               HyperVolume(reference_point).compute(front))
+
+    def test_should_hypervolume_contributions_return_the_exclusive_volumes(self):
+        solution1 = Solution(1, 3)
+        solution1.objectives = [1, 0, 1]
+        solution2 = Solution(1, 3)
+        solution2.objectives = [0, 1, 0]
+
+        self.assertEqual([1.0, 3.0], HyperVolume([2, 2, 2]).contributions([solution1, solution2]))
+
     def test_should_hypervolume_return_the_correct_value_when_applied_to_the_ZDT1_reference_front(self):
         problem = ZDT1()
         problem.reference_front = read_solutions(filename='resources/reference_front/ZDT1.pf')
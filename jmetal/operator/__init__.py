@@ -1,13 +1,13 @@
-from .crossover import NullCrossover, SBXCrossover, SPXCrossover, DifferentialEvolutionCrossover
-from .mutation import NullMutation, BitFlipMutation, PolynomialMutation, IntegerPolynomialMutation, UniformMutation, \
-    SimpleRandomMutation
+from .crossover import NullCrossover, SBXCrossover, BatchSBXCrossover, SPXCrossover, DifferentialEvolutionCrossover
+from .mutation import NullMutation, BitFlipMutation, PolynomialMutation, IntegerPolynomialMutation, \
+    BatchIntegerPolynomialMutation, UniformMutation, SimpleRandomMutation
 from .selection import BestSolutionSelection, BinaryTournamentSelection, BinaryTournament2Selection, \
     RandomSolutionSelection, NaryRandomSolutionSelection, RankingAndCrowdingDistanceSelection
 
 __all__ = [
-    'NullCrossover', 'SBXCrossover', 'SPXCrossover', 'DifferentialEvolutionCrossover',
-    'NullMutation', 'BitFlipMutation', 'PolynomialMutation', 'IntegerPolynomialMutation', 'UniformMutation',
-    'SimpleRandomMutation',
+    'NullCrossover', 'SBXCrossover', 'BatchSBXCrossover', 'SPXCrossover', 'DifferentialEvolutionCrossover',
+    'NullMutation', 'BitFlipMutation', 'PolynomialMutation', 'IntegerPolynomialMutation',
+    'BatchIntegerPolynomialMutation', 'UniformMutation', 'SimpleRandomMutation',
     'BestSolutionSelection', 'BinaryTournamentSelection', 'BinaryTournament2Selection', 'RandomSolutionSelection',
     'NaryRandomSolutionSelection', 'RankingAndCrowdingDistanceSelection'
 ]
@@ -2,8 +2,10 @@ import copy
 import random
 from typing import List
 
+import numpy as np
+
 from jmetal.core.operator import Crossover
-from jmetal.core.solution import Solution, FloatSolution, BinarySolution, PermutationSolution
+from jmetal.core.solution import Solution, FloatSolution, BinarySolution, PermutationSolution, IntegerSolution
 
 """
 .. module:: crossover
@@ -216,6 +218,81 @@ class SBXCrossover(Crossover[FloatSolution, FloatSolution]):
         return 'SBX crossover'
 
 
+class BatchSBXCrossover(SBXCrossover):
+    """ SBX crossover of integer genomes applied to a whole mating pool at once.
+
+    :py:meth:`execute_batch` crosses consecutive rows of a genome matrix (rows 2i and 2i + 1 are a pair) with the
+    same per gene rules as :class:`SBXCrossover`, drawing every random number of the pool with one call to a NumPy
+    generator and writing the offspring into a matrix kept between calls.
+
+    :param probability: Crossover probability of every pair.
+    :param distribution_index: Distribution index.
+    :param seed: Seed of the NumPy random generator.
+    """
+
+    def __init__(self, probability: float, distribution_index: float = 20.0, seed: int = None):
+        super(BatchSBXCrossover, self).__init__(probability=probability, distribution_index=distribution_index)
+        self.rng = np.random.default_rng(seed)
+        self.offspring = None
+
+    def execute(self, parents: List[IntegerSolution]) -> List[IntegerSolution]:
+        if len(parents) != 2:
+            raise Exception('The number of parents is not two: {}'.format(len(parents)))
+
+        genomes = self.execute_batch(np.array([parents[0].variables, parents[1].variables]),
+                                     parents[0].lower_bound, parents[0].upper_bound)
+        offspring = [copy.copy(parents[0]), copy.copy(parents[1])]
+        for solution, genome in zip(offspring, genomes):
+            solution.variables = genome.tolist()
+
+        return offspring
+
+    def execute_batch(self, parents: np.ndarray, lower_bound: List[int], upper_bound: List[int]) -> np.ndarray:
+        """ Crosses the pairs of rows of parents.
+
+        :param parents: Genome matrix with an even number of rows.
+        :return: Offspring genomes, in the order of their parents. The matrix is reused by the next call.
+        """
+        if len(parents) % 2 != 0:
+            raise Exception('The number of parents is not even: {}'.format(len(parents)))
+
+        if self.offspring is None or self.offspring.shape != parents.shape or self.offspring.dtype != parents.dtype:
+            self.offspring = np.empty_like(parents)
+
+        pairs, number_of_variables = len(parents) // 2, parents.shape[1]
+        self.offspring[0::2], self.offspring[1::2] = parents[0::2], parents[1::2]
+
+        draws = self.rng.random((pairs, 3 * number_of_variables + 1))
+        crossed = (draws[:, :1] <= self.probability) & (draws[:, 1:number_of_variables + 1] <= 0.5)
+        rows, columns = np.nonzero(crossed & (parents[0::2] != parents[1::2]))
+        rand = draws[rows, number_of_variables + 1 + columns]
+        swapped = draws[rows, 2 * number_of_variables + 1 + columns] <= 0.5
+
+        # Only the crossed genes with different values are computed
+        x1, x2 = parents[2 * rows, columns].astype(float), parents[2 * rows + 1, columns].astype(float)
+        lower_bound = np.asarray(lower_bound, dtype=float)[columns]
+        upper_bound = np.asarray(upper_bound, dtype=float)[columns]
+        y1, y2 = np.minimum(x1, x2), np.maximum(x1, x2)
+        exponent = 1.0 / (self.distribution_index + 1.0)
+
+        def betaq(beta: np.ndarray) -> np.ndarray:
+            alpha = 2.0 - beta ** -(self.distribution_index + 1.0)
+            return np.where(rand <= 1.0 / alpha, (rand * alpha) ** exponent, (1.0 / (2.0 - rand * alpha)) ** exponent)
+
+        c1 = 0.5 * (y1 + y2 - betaq(1.0 + 2.0 * (y1 - lower_bound) / (y2 - y1)) * (y2 - y1))
+        c2 = 0.5 * (y1 + y2 + betaq(1.0 + 2.0 * (upper_bound - y2) / (y2 - y1)) * (y2 - y1))
+        c1 = np.clip(c1, lower_bound, upper_bound)
+        c2 = np.clip(c2, lower_bound, upper_bound)
+
+        self.offspring[2 * rows, columns] = np.rint(np.where(swapped, c2, c1))
+        self.offspring[2 * rows + 1, columns] = np.rint(np.where(swapped, c1, c2))
+
+        return self.offspring
+
+    def get_name(self) -> str:
+        return 'SBX crossover (Batch)'
+
+
 class SPXCrossover(Crossover[BinarySolution, BinarySolution]):
 
     def __init__(self, probability: float):
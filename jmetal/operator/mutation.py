@@ -1,4 +1,6 @@
 import random
+from typing import List
+
 import numpy as np
 
 from jmetal.core.operator import Mutation
@@ -133,6 +135,59 @@ class IntegerPolynomialMutation(Mutation[IntegerSolution]):
         return 'Polynomial mutation (Integer)'
 
 
+class BatchIntegerPolynomialMutation(IntegerPolynomialMutation):
+    """ Polynomial mutation of integer genomes applied to a whole genome matrix at once.
+
+    :py:meth:`execute_batch` mutates the matrix in place with the same per gene rules as
+    :class:`IntegerPolynomialMutation`, drawing every random number with one call to a NumPy generator.
+
+    :param probability: Mutation probability of every gene.
+    :param distribution_index: Distribution index.
+    :param seed: Seed of the NumPy random generator.
+    """
+
+    def __init__(self, probability: float, distribution_index: float = 0.20, seed: int = None):
+        super(BatchIntegerPolynomialMutation, self).__init__(probability=probability,
+                                                             distribution_index=distribution_index)
+        self.rng = np.random.default_rng(seed)
+
+    def execute(self, solution: IntegerSolution) -> IntegerSolution:
+        genomes = self.execute_batch(np.array([solution.variables]), solution.lower_bound, solution.upper_bound)
+        solution.variables = genomes[0].tolist()
+
+        return solution
+
+    def execute_batch(self, genomes: np.ndarray, lower_bound: List[int], upper_bound: List[int]) -> np.ndarray:
+        """ Mutates the rows of genomes in place and returns it. """
+        number_of_genomes, number_of_variables = genomes.shape
+        lower_bound = np.asarray(lower_bound, dtype=float)
+        upper_bound = np.asarray(upper_bound, dtype=float)
+
+        draws = self.rng.random((number_of_genomes, 2 * number_of_variables))
+        rows, columns = np.nonzero(draws[:, :number_of_variables] <= self.probability)
+        rnd = draws[rows, number_of_variables + columns]
+
+        # Only the mutated genes are computed
+        y = genomes[rows, columns].astype(float)
+        yl, yu = lower_bound[columns], upper_bound[columns]
+        span = yu - yl
+        width = np.where(span == 0, 1.0, span)
+        mut_pow = 1.0 / (self.distribution_index + 1.0)
+
+        with np.errstate(invalid='ignore'):
+            low = 2.0 * rnd + (1.0 - 2.0 * rnd) * (1.0 - (y - yl) / width) ** (self.distribution_index + 1.0)
+            high = 2.0 * (1.0 - rnd) + 2.0 * (rnd - 0.5) * (1.0 - (yu - y) / width) ** (self.distribution_index + 1.0)
+            deltaq = np.where(rnd <= 0.5, low ** mut_pow - 1.0, 1.0 - high ** mut_pow)
+
+        y = np.where(span == 0, yl, np.clip(y + deltaq * span, yl, yu))
+        genomes[rows, columns] = np.rint(y)
+
+        return genomes
+
+    def get_name(self):
+        return 'Polynomial mutation (Integer, Batch)'
+
+
 class SimpleRandomMutation(Mutation[FloatSolution]):
 
     def __init__(self, probability: float):
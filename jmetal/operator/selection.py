@@ -5,6 +5,7 @@ import numpy as np
 
 from jmetal.core.operator import Selection
 from jmetal.util.density_estimator import CrowdingDistance
+from jmetal.util.hypervolume import HypervolumeContributions
 from jmetal.util.ranking import FastNonDominatedRanking
 from jmetal.util.comparator import Comparator, DominanceComparator
 
@@ -255,6 +256,12 @@ class RankingAndFitnessSelection(Selection[List[S], List[S]]):
         if k < 0:
             k = population_size
 
+        # With k = 1 the fitness is the exclusive hypervolume contribution, computed with the WFG engine
+        if k == 1 and population_size > 1 and all(p <= b for point in points for p, b in zip(point, bounds)):
+            for solution, contribution in zip(population, HypervolumeContributions(bounds, points).get_contributions()):
+                solution.attributes['fitness'] = contribution
+            return population
+
         actDim = len(bounds)
         pvec = range(population_size)
         alpha = []
@@ -1,8 +1,10 @@
 import unittest
 from unittest import mock
 
-from jmetal.core.solution import BinarySolution, PermutationSolution
-from jmetal.operator.crossover import NullCrossover, SPXCrossover, CXCrossover, PMXCrossover
+import numpy as np
+
+from jmetal.core.solution import BinarySolution, PermutationSolution, IntegerSolution
+from jmetal.operator.crossover import NullCrossover, SPXCrossover, CXCrossover, PMXCrossover, BatchSBXCrossover
 
 
 class NullCrossoverTestCases(unittest.TestCase):
@@ -241,5 +243,53 @@ class CXTestCases(unittest.TestCase):
         self.assertEqual([2, 6, 4, 5, 3], offspring[1].variables[1])
 
 
+class BatchSBXCrossoverTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.lower_bound = [0] * 20
+        self.upper_bound = [86] * 20
+        self.parents = np.random.default_rng(0).integers(0, 87, (40, 20)).astype(np.int16)
+
+    def test_should_constructor_raise_an_exception_if_the_probability_is_greater_than_one(self):
+        with self.assertRaises(Exception):
+            BatchSBXCrossover(1.01)
+
+    def test_should_the_parents_remain_unchanged_if_the_probability_is_zero(self):
+        offspring = BatchSBXCrossover(0.0).execute_batch(self.parents, self.lower_bound, self.upper_bound)
+
+        self.assertTrue(np.array_equal(self.parents, offspring))
+
+    def test_should_execute_batch_keep_the_offspring_within_the_bounds(self):
+        parents = self.parents.copy()
+        offspring = BatchSBXCrossover(1.0, seed=1).execute_batch(parents, self.lower_bound, self.upper_bound)
+
+        self.assertTrue(np.array_equal(self.parents, parents))
+        self.assertFalse(np.array_equal(self.parents, offspring))
+        self.assertEqual(np.int16, offspring.dtype)
+        self.assertTrue(((offspring >= 0) & (offspring <= 86)).all())
+
+    def test_should_execute_batch_be_reproducible_with_a_seed(self):
+        offspring1 = BatchSBXCrossover(0.9, seed=2).execute_batch(self.parents, self.lower_bound, self.upper_bound)
+        offspring2 = BatchSBXCrossover(0.9, seed=2).execute_batch(self.parents, self.lower_bound, self.upper_bound)
+
+        self.assertTrue(np.array_equal(offspring1, offspring2))
+
+    def test_should_execute_batch_raise_an_exception_if_the_number_of_parents_is_odd(self):
+        with self.assertRaises(Exception):
+            BatchSBXCrossover(0.9).execute_batch(self.parents[:3], self.lower_bound, self.upper_bound)
+
+    def test_should_execute_return_copies_of_the_parents(self):
+        parents = [IntegerSolution(self.lower_bound, self.upper_bound, 2) for _ in range(2)]
+        parents[0].variables = [0] * 20
+        parents[1].variables = [86] * 20
+
+        offspring = BatchSBXCrossover(1.0, seed=3).execute(parents)
+
+        self.assertEqual([0] * 20, parents[0].variables)
+        self.assertEqual(2, len(offspring))
+        self.assertTrue(all(isinstance(value, int) for value in offspring[0].variables))
+        self.assertIs(parents[0].lower_bound, offspring[0].lower_bound)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,10 @@
 import unittest
 
+import numpy as np
+
 from jmetal.core.solution import BinarySolution, FloatSolution, IntegerSolution
 from jmetal.operator.mutation import BitFlipMutation, UniformMutation, SimpleRandomMutation, PolynomialMutation, \
-    IntegerPolynomialMutation
+    IntegerPolynomialMutation, BatchIntegerPolynomialMutation
 
 
 class PolynomialMutationTestMethods(unittest.TestCase):
@@ -252,5 +254,44 @@ class IntegerPolynomialMutationTestCases(unittest.TestCase):
         self.assertEqual([True, True, True], [isinstance(x, int) for x in mutated_solution.variables])
 
 
+class BatchIntegerPolynomialMutationTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.lower_bound = [0] * 20
+        self.upper_bound = [86] * 20
+        self.genomes = np.random.default_rng(0).integers(0, 87, (30, 20)).astype(np.int16)
+
+    def test_should_the_genomes_remain_unchanged_if_the_probability_is_zero(self):
+        genomes = self.genomes.copy()
+        BatchIntegerPolynomialMutation(0.0).execute_batch(genomes, self.lower_bound, self.upper_bound)
+
+        self.assertTrue(np.array_equal(self.genomes, genomes))
+
+    def test_should_execute_batch_mutate_in_place_within_the_bounds(self):
+        genomes = self.genomes.copy()
+        result = BatchIntegerPolynomialMutation(1.0, seed=1).execute_batch(genomes, self.lower_bound,
+                                                                           self.upper_bound)
+
+        self.assertIs(genomes, result)
+        self.assertFalse(np.array_equal(self.genomes, genomes))
+        self.assertTrue(((genomes >= 0) & (genomes <= 86)).all())
+
+    def test_should_execute_batch_keep_fixed_variables(self):
+        genomes = self.genomes.copy()
+        BatchIntegerPolynomialMutation(1.0, seed=2).execute_batch(genomes, [5] * 20, [5] * 20)
+
+        self.assertTrue((genomes == 5).all())
+
+    def test_should_execute_mutate_the_solution_variables(self):
+        solution = IntegerSolution([0, 0, 0], [86, 86, 86], 2)
+        solution.variables = [1, 40, 86]
+
+        mutated_solution = BatchIntegerPolynomialMutation(1.0, seed=3).execute(solution)
+
+        self.assertIs(solution, mutated_solution)
+        self.assertNotEqual([1, 40, 86], mutated_solution.variables)
+        self.assertEqual([True, True, True], [isinstance(x, int) for x in mutated_solution.variables])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,12 +1,17 @@
+import bisect
 import copy
 import random
 from abc import ABC, abstractmethod
 from threading import Lock
 from typing import TypeVar, Generic, List
 
+import numpy as np
+
+from jmetal.util.constraint_handling import overall_constraint_violation_degree
 from jmetal.util.density_estimator import DensityEstimator, CrowdingDistance
 
-from jmetal.util.comparator import Comparator, DominanceComparator, SolutionAttributeComparator
+from jmetal.util.comparator import Comparator, DominanceComparator, SolutionAttributeComparator, \
+    OverallConstraintViolationComparator
 
 S = TypeVar('S')
 
@@ -61,10 +66,29 @@ class BoundedArchive(Archive[S]):
             if self.size() > self.maximum_size:
                 self.compute_density_estimator()
                 worst_solution, index_to_remove = self.__find_worst_solution(self.solution_list)
-                self.solution_list.pop(index_to_remove)
+                self.non_dominated_solution_archive.remove(index_to_remove)
 
         return success
 
+    def add_all(self, solutions: List[S]) -> List[bool]:
+        """ Bulk insertion of a whole generation: the non-dominated ones are merged at once and the archive
+        is truncated afterwards, removing the worst solution (density estimated again) until it fits.
+
+        :return: For every solution, whether it is in the archive after the insertion.
+        """
+        self.non_dominated_solution_archive.add_all(solutions)
+        self.truncate()
+
+        kept = set(id(solution) for solution in self.solution_list)
+        return [id(solution) in kept for solution in solutions]
+
+    def truncate(self):
+        """ Removes the worst solution, with the density estimated again, until the archive fits. """
+        while self.size() > self.maximum_size:
+            self.compute_density_estimator()
+            worst_solution, index_to_remove = self.__find_worst_solution(self.solution_list)
+            self.non_dominated_solution_archive.remove(index_to_remove)
+
     def __find_worst_solution(self, solution_list: List[S]) -> S:
         if solution_list is None:
             raise Exception("The solution list is None")
@@ -83,12 +107,155 @@ class BoundedArchive(Archive[S]):
 
 
 class NonDominatedSolutionsArchive(Archive[S]):
+    """ Archive of non-dominated solutions.
+
+    With the default dominance (:class:`DominanceComparator` with :class:`OverallConstraintViolationComparator`)
+    the objectives and constraint violations of the archive are kept in numpy arrays, so every insertion is
+    tested against the whole archive with array operations. Other comparators use pairwise comparisons.
+
+    The arrays follow the insertions and removals made through :meth:`add`, :meth:`add_all`, :meth:`remove` and
+    :meth:`keep`, every row with a key of its own. A solution list whose length is changed elsewhere is indexed again.
+    """
 
     def __init__(self, dominance_comparator: Comparator = DominanceComparator()):
         super(NonDominatedSolutionsArchive, self).__init__()
         self.comparator = dominance_comparator
+        self.objectives = None
+        self.violations = None
+        self.keys = np.empty(0, dtype=np.int64)
+        self.next_key = 0
+
+    def is_vectorizable(self) -> bool:
+        return type(self.comparator) is DominanceComparator and \
+            type(self.comparator.constraint_comparator) is OverallConstraintViolationComparator
+
+    def get_index(self):
+        """ Objective and violation arrays of solution_list, built again if its length was changed elsewhere. """
+        if self.objectives is None or len(self.keys) != len(self.solution_list):
+            objectives = np.array([solution.objectives for solution in self.solution_list], dtype=float)
+            self.set_index(objectives.reshape(len(self.solution_list), -1) if self.solution_list else np.empty((0, 0)),
+                           np.array([overall_constraint_violation_degree(solution)
+                                     for solution in self.solution_list], dtype=float),
+                           self.new_keys(len(self.solution_list)))
+        return self.objectives, self.violations
+
+    def set_index(self, objectives: np.ndarray, violations: np.ndarray, keys: np.ndarray):
+        self.objectives = objectives
+        self.violations = violations
+        self.keys = keys
+
+    def is_indexed(self) -> bool:
+        return self.objectives is not None and len(self.keys) == len(self.solution_list)
+
+    def new_keys(self, count: int) -> np.ndarray:
+        """ Keys of new rows, never used before and increasing: other structures can tell which rows came and went. """
+        keys = np.arange(self.next_key, self.next_key + count, dtype=np.int64)
+        self.next_key += count
+        return keys
+
+    def remove(self, index: int) -> S:
+        """ Removes the solution at index, and its row of the arrays. """
+        if self.is_indexed():
+            self.set_index(*(np.concatenate((rows[:index], rows[index + 1:]))
+                             for rows in (self.objectives, self.violations, self.keys)))
+        return self.solution_list.pop(index)
+
+    def keep(self, mask: List[bool]):
+        """ Keeps the solutions (and rows) where mask is True. """
+        mask = np.asarray(mask, dtype=bool).reshape(-1)
+        if self.is_indexed():
+            self.set_index(self.objectives[mask], self.violations[mask], self.keys[mask])
+        self.solution_list[:] = [solution for solution, kept in zip(self.solution_list, mask.tolist()) if kept]
+
+    @staticmethod
+    def dominance(objectives1: np.ndarray, violations1: np.ndarray, objectives2: np.ndarray,
+                  violations2: np.ndarray) -> np.ndarray:
+        """ Boolean matrix, [i, j] is True when row i of the first set dominates row j of the second one. """
+        no_worse = np.ones((len(objectives1), len(objectives2)), dtype=bool)
+        better = np.zeros((len(objectives1), len(objectives2)), dtype=bool)
+        for column1, column2 in zip(objectives1.T, objectives2.T):
+            no_worse &= column1[:, None] <= column2[None, :]
+            better |= column1[:, None] < column2[None, :]
+
+        return (violations1[:, None] > violations2[None, :]) | \
+               ((violations1[:, None] == violations2[None, :]) & no_worse & better)
+
+    @staticmethod
+    def equality(objectives1: np.ndarray, violations1: np.ndarray, objectives2: np.ndarray,
+                 violations2: np.ndarray) -> np.ndarray:
+        """ Boolean matrix, [i, j] is True when rows i and j have the same objectives and violation. """
+        equal = violations1[:, None] == violations2[None, :]
+        for column1, column2 in zip(objectives1.T, objectives2.T):
+            equal &= column1[:, None] == column2[None, :]
+
+        return equal
 
     def add(self, solution: S) -> bool:
+        if not self.is_vectorizable():
+            return self.add_pairwise(solution)
+
+        objectives, violations = self.get_index()
+        keys = self.keys
+        point = np.array([solution.objectives], dtype=float)
+        violation = np.array([overall_constraint_violation_degree(solution)], dtype=float)
+
+        if len(self.solution_list) > 0:
+            if self.dominance(objectives, violations, point, violation).any() or \
+                    self.equality(objectives, violations, point, violation).any():
+                return False
+
+            # A solution the archive does not dominate can still dominate some of its members
+            dominated = self.dominance(point, violation, objectives, violations)[0]
+            if dominated.any():
+                self.solution_list[:] = [current for current, removed in zip(self.solution_list, dominated)
+                                         if not removed]
+                objectives, violations, keys = objectives[~dominated], violations[~dominated], keys[~dominated]
+
+        self.solution_list.append(solution)
+        self.set_index(np.vstack([objectives.reshape(-1, point.shape[1]), point]), np.append(violations, violation),
+                       np.append(keys, self.new_keys(1)))
+
+        return True
+
+    def add_all(self, solutions: List[S]) -> List[bool]:
+        """ Bulk insertion: the archive ends up as if the solutions had been added one by one, with a single
+        vectorized dominance test between the archive and the new solutions.
+
+        :return: For every solution, whether it is in the archive after the insertion.
+        """
+        if not self.is_vectorizable():
+            for solution in solutions:
+                self.add(solution)
+            kept = set(id(solution) for solution in self.solution_list)
+            return [id(solution) in kept for solution in solutions]
+
+        if len(solutions) == 0:
+            return []
+
+        objectives, violations = self.get_index()
+        points = np.array([solution.objectives for solution in solutions], dtype=float)
+        points_violations = np.array([overall_constraint_violation_degree(solution) for solution in solutions],
+                                     dtype=float)
+        objectives = objectives.reshape(-1, points.shape[1])
+
+        # A new solution survives if nothing dominates it and no archive member or earlier new solution is equal
+        survives = ~self.dominance(objectives, violations, points, points_violations).any(axis=0) & \
+                   ~self.equality(objectives, violations, points, points_violations).any(axis=0) & \
+                   ~self.dominance(points, points_violations, points, points_violations).any(axis=0) & \
+                   ~np.triu(self.equality(points, points_violations, points, points_violations), 1).any(axis=0)
+
+        # Dominance is transitive: a member dominated by a discarded new solution is dominated by a survivor too
+        kept = ~self.dominance(points[survives], points_violations[survives], objectives, violations).any(axis=0)
+
+        self.solution_list[:] = [current for current, keep in zip(self.solution_list, kept) if keep] + \
+                                [solution for solution, survive in zip(solutions, survives) if survive]
+        self.set_index(np.vstack([objectives[kept], points[survives]]),
+                       np.append(violations[kept], points_violations[survives]),
+                       np.append(self.keys[kept], self.new_keys(int(survives.sum()))))
+
+        return survives.tolist()
+
+    def add_pairwise(self, solution: S) -> bool:
         is_dominated = False
         is_contained = False
 
@@ -108,7 +275,7 @@ class NonDominatedSolutionsArchive(Archive[S]):
                     is_dominated = True
                     break
                 elif is_dominated_flag == 0:
-                    if solution.objectives == current_solution.objectives:
+                    if list(solution.objectives) == list(current_solution.objectives):
                         is_contained = True
                         break
 
@@ -120,6 +287,13 @@ class NonDominatedSolutionsArchive(Archive[S]):
 
 
 class CrowdingDistanceArchive(BoundedArchive[S]):
+    """ Bounded archive that removes the solutions with the lowest crowding distance.
+
+    Once the archive has overflowed, the crowding distances follow every change of the archive: an insertion or a
+    removal only changes the contributions of its neighbours in every objective, or the whole objective when one of
+    its extremes changes. The removed solutions and the 'crowding_distance' attributes are the same as estimating the
+    crowding distance of the whole archive (:class:`CrowdingDistance`) before every removal.
+    """
 
     def __init__(self,
                  maximum_size: int):
@@ -127,6 +301,164 @@ class CrowdingDistanceArchive(BoundedArchive[S]):
             maximum_size=maximum_size,
             comparator=SolutionAttributeComparator("crowding_distance", lowest_is_best=False),
             density_estimator=CrowdingDistance())
+        # Keys of the archive rows the distances are up to date with, None until the first overflow
+        self.keys = None
+        # For every objective, the keys and values in the order of the (chained, stable) sorts of CrowdingDistance
+        self.orders = None
+        self.values = None
+        # By key: the contribution of every objective, the distance, and whether it changed since its attribute was
+        # written
+        self.contributions = None
+        self.distances = None
+        self.changed = None
+
+    def add(self, solution: S) -> bool:
+        success = self.non_dominated_solution_archive.add(solution)
+
+        if success:
+            self.truncate()
+
+        return success
+
+    def truncate(self):
+        """ Removes the solution with the lowest crowding distance until the archive fits. """
+        if self.keys is None and self.size() <= self.maximum_size:
+            return
+
+        self.update_distances()
+        while self.size() > self.maximum_size:
+            keys = self.keys.tolist()
+            distances = [self.distances[key] for key in keys]
+            # Attributes as estimating the whole archive again would write them
+            for solution, key, distance in zip(self.solution_list, keys, distances):
+                if key in self.changed:
+                    solution.attributes['crowding_distance'] = distance
+            self.changed.clear()
+
+            # First solution of the list with the lowest distance, as the comparator finds it
+            worst = distances.index(min(distances))
+            self.non_dominated_solution_archive.remove(worst)
+            self.keys = self.non_dominated_solution_archive.keys.copy()
+            self.__follow(self.__remove(keys[worst]))
+
+    def update_distances(self):
+        """ Brings the crowding distances up to date with the rows of the archive: the removed rows and a single
+        inserted one are followed incrementally, bulk insertions estimate every distance again. """
+        objectives, _ = self.non_dominated_solution_archive.get_index()
+        keys = self.non_dominated_solution_archive.keys
+        if self.keys is not None and len(self.keys) == len(keys) and np.array_equal(self.keys, keys):
+            return
+        incremental = False
+        if self.keys is not None and len(self.orders) == objectives.shape[1]:
+            # Keys increase along the rows: the archive keeps the order of its rows and appends the new ones
+            found = np.minimum(np.searchsorted(keys, self.keys), max(len(keys) - 1, 0))
+            alive = keys[found] == self.keys if len(keys) > 0 else np.zeros(len(self.keys), dtype=bool)
+            kept = int(np.count_nonzero(alive))
+            incremental = np.array_equal(self.keys[alive], keys[:kept]) and len(keys) - kept <= 1
+        if not incremental:
+            self.keys = keys.copy()
+            self.__build(objectives)
+            return
+
+        rows = set()
+        removed_keys = self.keys[~alive].tolist()
+        for key in removed_keys:
+            removed = self.__remove(key)
+            rows = None if rows is None or removed is None else (rows | removed) - set(removed_keys)
+        if kept < len(keys):
+            inserted = self.__insert(int(keys[kept]), objectives[kept].tolist())
+            rows = None if rows is None or inserted is None else rows | inserted
+        self.keys = keys.copy()
+        self.__follow(rows)
+
+    def __build(self, objectives: np.ndarray):
+        points = objectives.tolist()
+        keys = self.keys.tolist()
+        self.orders = []
+        self.values = []
+        order = list(range(len(points)))
+        for i in range(objectives.shape[1]):
+            order = sorted(order, key=lambda row: points[row][i])
+            self.orders.append([keys[row] for row in order])
+            self.values.append([points[row][i] for row in order])
+        self.contributions = {key: [0.0] * objectives.shape[1] for key in keys}
+        for i in range(objectives.shape[1]):
+            self.__crowd(i)
+        self.distances = {}
+        self.changed = set()
+        self.__follow(None)
+
+    def __remove(self, key: int) -> set:
+        """ Drops the solution with key. Returns the keys whose distance changed, None if any can have. """
+        del self.contributions[key]
+        del self.distances[key]
+        self.changed.discard(key)
+
+        rows = set()
+        for i, (order, values) in enumerate(zip(self.orders, self.values)):
+            position = order.index(key)
+            del order[position]
+            del values[position]
+            if position == 0 or position == len(order):
+                self.__crowd(i)
+                rows = None
+            else:
+                # The two solutions around the gap get new neighbours
+                self.__crowd(i, [position - 1, position])
+                if rows is not None:
+                    rows.update(order[position - 1:position + 1])
+        return rows
+
+    def __insert(self, key: int, point: List[float]) -> set:
+        """ Adds the solution with key (the last one of the list), placed as the chained stable sorts place it: after
+        the equal values in the first objective, by its place in the previous objective in the others. Returns the
+        keys whose distance changed, None if any can have. """
+        self.contributions[key] = [0.0] * len(point)
+
+        rows = {key}
+        previous = None
+        for i, (order, values) in enumerate(zip(self.orders, self.values)):
+            position = bisect.bisect_right(values, point[i])
+            if previous is not None and position > 0 and values[position - 1] == point[i]:
+                # Equal values keep the order of the previous objective
+                low = bisect.bisect_left(values, point[i])
+                rank = previous.index(key)
+                position = low + sum(1 for other in order[low:position] if previous.index(other) < rank)
+            order.insert(position, key)
+            values.insert(position, point[i])
+            previous = order
+
+            if position == 0 or position == len(order) - 1:
+                self.__crowd(i)
+                rows = None
+            else:
+                self.__crowd(i, [position - 1, position, position + 1])
+                if rows is not None:
+                    rows.update(order[position - 1:position + 2])
+        return rows
+
+    def __crowd(self, i: int, positions: List[int] = None):
+        """ Contributions of objective i (normalized gap between the two neighbours), of every solution or of the
+        ones at positions of its order. """
+        order, values = self.orders[i], self.values[i]
+        if not order:
+            return
+        scale = values[-1] - values[0]
+        for position in range(1, len(order) - 1) if positions is None else positions:
+            if 0 < position < len(order) - 1:
+                gap = values[position + 1] - values[position - 1]
+                self.contributions[order[position]][i] = gap / scale if scale != 0 else gap
+
+    def __follow(self, rows: set):
+        """ Adds up the distances of the keys in rows again, of every key if rows is None. """
+        extremes = set(key for order in self.orders if order for key in (order[0], order[-1]))
+        for key in self.contributions if rows is None else rows:
+            # The objectives in the order CrowdingDistance adds them up
+            distance = 0.0
+            for contribution in self.contributions[key]:
+                distance += contribution
+            self.distances[key] = float('inf') if key in extremes else distance
+            self.changed.add(key)
 
 
 class ArchiveWithReferencePoint(BoundedArchive[S]):
@@ -163,7 +495,7 @@ class ArchiveWithReferencePoint(BoundedArchive[S]):
 
             if result and dominated_solution is not None and len(self.solution_list) > 1:
                 if dominated_solution in self.solution_list:
-                    self.solution_list.remove(dominated_solution)
+                    self.non_dominated_solution_archive.remove(self.solution_list.index(dominated_solution))
 
             if result and len(self.solution_list) > self.maximum_size:
                 self.compute_density_estimator()
@@ -173,9 +505,8 @@ class ArchiveWithReferencePoint(BoundedArchive[S]):
     def filter(self):
         # In case of having at least a solution which is non-dominated with the reference point, filter it
         if len(self.solution_list) > 1:
-            self.solution_list[:] = \
-                [sol for sol in self.solution_list
-                 if self.__dominance_test(sol.objectives, self.__reference_point) != 0]
+            self.non_dominated_solution_archive.keep(
+                [self.__dominance_test(sol.objectives, self.__reference_point) != 0 for sol in self.solution_list])
 
     def update_reference_point(self, new_reference_point) -> None:
         with self.lock:
@@ -185,7 +516,7 @@ class ArchiveWithReferencePoint(BoundedArchive[S]):
             self.filter()
 
             if len(self.solution_list) == 0:
-                self.solution_list.append(first_solution)
+                self.non_dominated_solution_archive.add(first_solution)
 
     def get_reference_point(self) -> List[float]:
         with self.lock:
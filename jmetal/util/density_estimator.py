@@ -4,7 +4,7 @@ from functools import cmp_to_key
 from typing import TypeVar, List
 
 import numpy
-from scipy.spatial.distance import euclidean
+from scipy.spatial.distance import cdist
 
 from jmetal.util.comparator import SolutionAttributeComparator, Comparator
 
@@ -62,32 +62,29 @@ class CrowdingDistance(DensityEstimator[List[S]]):
             front[1].attributes['crowding_distance'] = float("inf")
             return
 
-        for i in range(len(front)):
-            front[i].attributes['crowding_distance'] = 0.0
+        objectives = numpy.array([solution.objectives for solution in front], dtype=float)
+        distances = numpy.zeros(size)
 
-        number_of_objectives = front[0].number_of_objectives
-
-        for i in range(number_of_objectives):
-            # Sort the population by Obj n
-            front = sorted(front, key=lambda x: x.objectives[i])
-            objective_minn = front[0].objectives[i]
-            objective_maxn = front[len(front) - 1].objectives[i]
+        # Each objective is sorted (stably) starting from the order of the previous one, as sorting the list does
+        order = numpy.arange(size)
+        for i in range(objectives.shape[1]):
+            order = order[numpy.argsort(objectives[order, i], kind='stable')]
+            values = objectives[order, i]
+            objective_minn = values[0]
+            objective_maxn = values[-1]
 
             # Set de crowding distance
-            front[0].attributes['crowding_distance'] = float('inf')
-            front[size - 1].attributes['crowding_distance'] = float('inf')
-
-            for j in range(1, size - 1):
-                distance = front[j + 1].objectives[i] - front[j - 1].objectives[i]
+            distances[order[0]] = float('inf')
+            distances[order[-1]] = float('inf')
 
-                # Check if minimum and maximum are the same (in which case do nothing)
-                if objective_maxn - objective_minn == 0:
-                    pass;  # LOGGER.warning('Minimum and maximum are the same!')
-                else:
-                    distance = distance / (objective_maxn - objective_minn)
+            gaps = values[2:] - values[:-2]
+            # Check if minimum and maximum are the same (in which case do nothing)
+            if objective_maxn - objective_minn != 0:
+                gaps = gaps / (objective_maxn - objective_minn)
+            distances[order[1:-1]] += gaps
 
-                distance += front[j].attributes['crowding_distance']
-                front[j].attributes['crowding_distance'] = distance
+        for solution, distance in zip(front, distances.tolist()):
+            solution.attributes['crowding_distance'] = distance
 
     def sort(self, solutions: List[S]) -> List[S]:
         solutions.sort(key=cmp_to_key(self.get_comparator().compare))
@@ -111,51 +108,24 @@ class KNearestNeighborDensityEstimator(DensityEstimator[List[S]]):
         if solutions_size <= self.k:
             return
 
-        points = []
-        for i in range(solutions_size):
-            points.append(solutions[i].objectives)
+        points = numpy.array([solution.objectives for solution in solutions], dtype=float)
 
         # Compute distance matrix
-        self.distance_matrix = numpy.zeros(shape=(solutions_size, solutions_size))
-        for i in range(solutions_size):
-            for j in range(solutions_size):
-                self.distance_matrix[i, j] = self.distance_matrix[j, i] = euclidean(solutions[i].objectives,
-                                                                                    solutions[j].objectives)
-        # Gets the k-nearest distance of all the solutions
-        for i in range(solutions_size):
-            distances = []
-            for j in range(solutions_size):
-                distances.append(self.distance_matrix[i, j])
-            distances.sort()
-            solutions[i].attributes['knn_density'] = distances[self.k]
+        self.distance_matrix = cdist(points, points)
+
+        # Gets the k-nearest distance of all the solutions (partial sort of every row)
+        densities = numpy.partition(self.distance_matrix, self.k, axis=1)[:, self.k]
+        for solution, density in zip(solutions, densities.tolist()):
+            solution.attributes['knn_density'] = density
 
     def sort(self, solutions: List[S]) -> List[S]:
-        def compare(solution1, solution2):
-            distances1 = solution1.attributes["distances_"]
-            distances2 = solution2.attributes["distances_"]
-
-            tmp_k = self.k
-            if distances1[tmp_k] > distances2[tmp_k]:
-                return -1
-            elif distances1[tmp_k] < distances2[tmp_k]:
-                return 1
-            else:
-                while tmp_k < (len(distances1) - 1):
-                    tmp_k += 1
-                    if distances1[tmp_k] > distances2[tmp_k]:
-                        return -1
-                    elif distances1[tmp_k] < distances2[tmp_k]:
-                        return 1
-            return 0
-
-        for i in range(len(solutions)):
-            distances = []
-            for j in range(len(solutions)):
-                distances.append(self.distance_matrix[i, j])
-            distances.sort()
-            solutions[i].attributes["distances_"] = distances
-
-        solutions.sort(key=cmp_to_key(compare))
+        """ Sorts by decreasing k-th nearest distance, draws are broken by the next nearest distances. """
+        distances = numpy.sort(self.distance_matrix, axis=1)
+        for solution, row in zip(solutions, distances.tolist()):
+            solution.attributes["distances_"] = row
+
+        # Lists compare element by element from the k-th one; reverse=True keeps draws in their order
+        solutions.sort(key=lambda solution: solution.attributes["distances_"][self.k:], reverse=True)
 
     @classmethod
     def get_comparator(cls) -> Comparator:
@@ -1,3 +1,4 @@
+import asyncio
 import functools
 from abc import ABC, abstractmethod
 from multiprocessing.pool import ThreadPool, Pool
@@ -38,6 +39,37 @@ class SequentialEvaluator(Evaluator[S]):
         return solution_list
 
 
+class BatchEvaluator(Evaluator[S]):
+    """ Hands the whole list to `problem.evaluate_all` when the problem provides it, so the problem can deduplicate
+    and parallelize the evaluations; otherwise solutions are evaluated one at a time. """
+
+    def evaluate(self, solution_list: List[S], problem: Problem) -> List[S]:
+        if hasattr(problem, 'evaluate_all'):
+            problem.evaluate_all(solution_list)
+        else:
+            for solution in solution_list:
+                Evaluator.evaluate_solution(solution, problem)
+
+        return solution_list
+
+
+class AsyncEvaluator(Evaluator[S]):
+    """ Runs the problem's coroutines in an asyncio event loop: `problem.evaluate_all_async` with the whole list
+    when the problem provides it, `problem.evaluate_async` for every solution concurrently otherwise. """
+
+    def evaluate(self, solution_list: List[S], problem: Problem) -> List[S]:
+        asyncio.run(self.evaluate_async(solution_list, problem))
+
+        return solution_list
+
+    @staticmethod
+    async def evaluate_async(solution_list: List[S], problem: Problem) -> None:
+        if hasattr(problem, 'evaluate_all_async'):
+            await problem.evaluate_all_async(solution_list)
+        else:
+            await asyncio.gather(*[problem.evaluate_async(solution) for solution in solution_list])
+
+
 class MapEvaluator(Evaluator[S]):
 
     def __init__(self, processes: int = None):
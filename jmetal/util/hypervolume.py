@@ -0,0 +1,177 @@
+from bisect import bisect_left
+from typing import List
+
+import numpy as np
+
+"""
+.. module:: hypervolume
+   :platform: Unix, Windows
+   :synopsis: Exact hypervolume (WFG algorithm) and exclusive hypervolume contributions with NumPy.
+
+The WFG algorithm is described in:
+
+* L. While, L. Bradstreet and L. Barone. A Fast Way of Calculating Exact Hypervolumes. IEEE Transactions on
+  Evolutionary Computation, 16(1):86-95, 2012.
+
+Minimization is implicitly assumed here!
+"""
+
+
+def nondominated(points: np.ndarray) -> np.ndarray:
+    """ Rows of points that no other row weakly dominates (one copy of duplicated rows is kept). """
+    if len(points) < 2:
+        return points
+
+    weakly = (points[:, None, :] <= points[None, :, :]).all(axis=2)
+    duplicated = weakly & weakly.T
+    removed = (weakly & ~weakly.T).any(axis=0) | np.triu(duplicated, 1).any(axis=0)
+
+    return points[~removed]
+
+
+def wfg(points: np.ndarray, reference_point: np.ndarray) -> float:
+    """ Hypervolume of a non-dominated set of points that weakly dominate the reference point.
+
+    Points are processed in decreasing order of the last objective: the limit set of a point only holds
+    better points in that objective, so its volume is a slab of height (reference - point) over a
+    hypervolume with one objective less.
+    """
+    size, dimensions = points.shape
+    if size == 0:
+        return 0.0
+    elif size == 1:
+        return float(np.prod(reference_point - points[0]))
+    elif dimensions == 1:
+        return float(reference_point[0] - points[:, 0].min())
+    elif size == 2:
+        return float(np.prod(reference_point - points[0]) + np.prod(reference_point - points[1]) -
+                     np.prod(reference_point - np.maximum(points[0], points[1])))
+    elif dimensions == 2:
+        points = points[np.argsort(points[:, 0], kind='stable')]
+        widths = np.append(points[1:, 0], reference_point[0]) - points[:, 0]
+        return float((widths * (reference_point[1] - points[:, 1])).sum())
+    elif dimensions == 3:
+        return sweep3d(points, reference_point)
+
+    points = points[np.argsort(-points[:, -1], kind='stable')]
+    volume = 0.0
+    for i in range(size):
+        height = reference_point[-1] - points[i, -1]
+        if height == 0:
+            continue
+        limit = nondominated(np.maximum(points[i + 1:, :-1], points[i, :-1]))
+        volume += height * (np.prod(reference_point[:-1] - points[i, :-1]) - wfg(limit, reference_point[:-1]))
+
+    return volume
+
+
+def sweep3d(points: np.ndarray, reference_point: np.ndarray) -> float:
+    """ Three objectives in O(n log n): points are swept in increasing order of the third objective while
+    a two dimensional staircase (x increasing, y decreasing) and its area are updated.
+    """
+    reference_x, reference_y, reference_z = reference_point.tolist()
+    xs, ys = [], []
+
+    def segments(start: int, stop: int) -> float:
+        area = 0.0
+        for k in range(max(start, 0), min(stop, len(xs))):
+            next_x = xs[k + 1] if k + 1 < len(xs) else reference_x
+            area += (next_x - xs[k]) * (reference_y - ys[k])
+        return area
+
+    area = 0.0
+    volume = 0.0
+    last_z = None
+    for x, y, z in points[np.argsort(points[:, 2], kind='stable')].tolist():
+        if last_z is not None:
+            volume += area * (z - last_z)
+        last_z = z
+
+        i = bisect_left(xs, x)
+        if (i > 0 and ys[i - 1] <= y) or (i < len(xs) and xs[i] == x and ys[i] <= y):
+            continue
+        j = i
+        while j < len(xs) and ys[j] >= y:
+            j += 1
+
+        area -= segments(i - 1, j)
+        xs[i:j] = [x]
+        ys[i:j] = [y]
+        area += segments(i - 1, i + 1)
+
+    return volume + area * (reference_z - last_z)
+
+
+def hypervolume(points: List[List[float]], reference_point: List[float]) -> float:
+    """ Hypervolume dominated by the points that weakly dominate the reference point. """
+    reference_point = np.asarray(reference_point, dtype=float)
+    points = np.asarray(points, dtype=float).reshape(-1, len(reference_point))
+    points = points[(points <= reference_point).all(axis=1)]
+
+    return wfg(nondominated(points), reference_point)
+
+
+def exclusive_contribution(point: np.ndarray, others: np.ndarray, reference_point: np.ndarray) -> float:
+    """ Volume dominated by point and by none of the others (all of them clamped to the reference point). """
+    limit = nondominated(np.maximum(others, point))
+
+    return float(np.prod(reference_point - point)) - wfg(limit, reference_point)
+
+
+class HypervolumeContributions:
+    """ Exclusive hypervolume contribution of every point of a set, updated incrementally when one point is
+    added or removed: only the volume that the changed point shares exclusively with each other point is
+    computed, instead of every contribution from scratch.
+
+    Points that do not dominate the reference point are clamped to it, so they contribute nothing.
+    """
+
+    def __init__(self, reference_point: List[float], points: List[List[float]] = None):
+        self.reference_point = np.asarray(reference_point, dtype=float)
+        self.points = np.empty((0, len(self.reference_point)))
+        self.contributions = np.empty(0)
+
+        if points is not None and len(points) > 0:
+            self.points = np.minimum(np.asarray(points, dtype=float), self.reference_point)
+            self.contributions = np.array([self._exclusive(i) for i in range(len(self.points))])
+
+    def __len__(self):
+        return len(self.points)
+
+    def _others(self, index: int) -> np.ndarray:
+        return np.delete(self.points, index, axis=0)
+
+    def _exclusive(self, index: int) -> float:
+        return exclusive_contribution(self.points[index], self._others(index), self.reference_point)
+
+    def add(self, point: List[float]) -> int:
+        """ Adds a point and returns its index. The volume each point shared only with it is lost. """
+        point = np.minimum(np.asarray(point, dtype=float), self.reference_point)
+        for i in range(len(self.points)):
+            shared = np.maximum(self.points[i], point)
+            self.contributions[i] -= exclusive_contribution(shared, self._others(i), self.reference_point)
+
+        self.points = np.vstack([self.points, point])
+        self.contributions = np.append(self.contributions, 0.0)
+        self.contributions[-1] = self._exclusive(len(self.points) - 1)
+
+        return len(self.points) - 1
+
+    def remove(self, index: int) -> float:
+        """ Removes a point and returns its contribution. The volume each point shared only with it is gained. """
+        point = self.points[index]
+        contribution = self.contributions[index]
+        self.points = self._others(index)
+        self.contributions = np.delete(self.contributions, index)
+
+        for i in range(len(self.points)):
+            shared = np.maximum(self.points[i], point)
+            self.contributions[i] += exclusive_contribution(shared, self._others(i), self.reference_point)
+
+        return float(contribution)
+
+    def get_contributions(self) -> List[float]:
+        return self.contributions.tolist()
+
+    def get_hypervolume(self) -> float:
+        return wfg(nondominated(self.points), self.reference_point)
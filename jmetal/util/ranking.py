@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
 from typing import TypeVar, List
 
-from jmetal.util.comparator import DominanceComparator, Comparator, SolutionAttributeComparator
+import numpy as np
+
+from jmetal.util.comparator import DominanceComparator, Comparator, SolutionAttributeComparator, \
+    OverallConstraintViolationComparator
+from jmetal.util.constraint_handling import overall_constraint_violation_degree
 
 S = TypeVar('S')
 
@@ -105,6 +109,155 @@ class FastNonDominatedRanking(Ranking[List[S]]):
         return SolutionAttributeComparator('dominance_ranking')
 
 
+class VectorizedNonDominatedRanking(FastNonDominatedRanking[List[S]]):
+    """ Fast non-dominated ranking computed on a dominance matrix with numpy. Fronts, the order of the solutions
+    inside them and the 'dominance_ranking' attributes are identical to :class:`FastNonDominatedRanking`.
+
+    Only the default dominance (:class:`DominanceComparator` with :class:`OverallConstraintViolationComparator`)
+    is vectorized, any other comparator falls back to the pairwise comparisons.
+    """
+
+    def __init__(self, comparator: Comparator = DominanceComparator(), directions: List[int] = None):
+        """
+        :param comparator: Dominance comparator.
+        :param directions: Optional direction of every objective (Problem.MINIMIZE or Problem.MAXIMIZE).
+            By default all the objectives are minimized, like :class:`DominanceComparator` does.
+        """
+        super(VectorizedNonDominatedRanking, self).__init__(comparator)
+        self.directions = directions
+
+    def is_vectorizable(self) -> bool:
+        return type(self.comparator) is DominanceComparator and \
+            type(self.comparator.constraint_comparator) is OverallConstraintViolationComparator
+
+    def dominance_matrix(self, solutions: List[S]) -> np.ndarray:
+        """ Boolean matrix, [p, q] is True when solution p dominates solution q. """
+        objectives = np.array([solution.objectives for solution in solutions], dtype=float)
+        if self.directions is not None:
+            objectives = objectives * -np.asarray(self.directions, dtype=float)
+        violation = np.array([overall_constraint_violation_degree(solution) for solution in solutions], dtype=float)
+
+        no_worse = np.ones((len(solutions), len(solutions)), dtype=bool)
+        better = np.zeros((len(solutions), len(solutions)), dtype=bool)
+        for column in objectives.T:
+            no_worse &= column[:, None] <= column[None, :]
+            better |= column[:, None] < column[None, :]
+
+        # Constraint violation decides first, objectives only between equally violating solutions
+        return (violation[:, None] > violation[None, :]) | \
+               ((violation[:, None] == violation[None, :]) & no_worse & better)
+
+    def compute_ranking(self, solutions: List[S], k: int = None):
+        """ Compute ranking of solutions.
+
+        :param solutions: Solution list.
+        :param k: Number of individuals.
+        """
+        if not self.is_vectorizable() or len(solutions) == 0:
+            return super(VectorizedNonDominatedRanking, self).compute_ranking(solutions, k)
+
+        dominates = self.dominance_matrix(solutions)
+        self.number_of_comparisons += len(solutions) * (len(solutions) - 1) // 2
+        dominating_ith = dominates.sum(axis=0)
+        ranked = np.zeros(len(solutions), dtype=bool)
+
+        fronts = []
+        front = np.flatnonzero(dominating_ith == 0)
+        while len(front) != 0:
+            for index in front:
+                solutions[index].attributes['dominance_ranking'] = len(fronts)
+            fronts.append([solutions[index] for index in front])
+            ranked[front] = True
+            dominated = dominates[front]
+            dominating_ith = dominating_ith - dominated.sum(axis=0)
+            candidates = np.flatnonzero((dominating_ith == 0) & ~ranked)
+            # Same order as the pairwise version: a solution joins its front when its last dominator
+            # in the previous front (in that front's order) is processed, ties by index
+            last = (dominated[:, candidates] * np.arange(1, len(front) + 1)[:, None]).max(axis=0, initial=0)
+            front = candidates[np.lexsort((candidates, last))]
+
+        self.ranked_sublists = fronts
+
+        if k:
+            count = 0
+            for i, front in enumerate(self.ranked_sublists):
+                count += len(front)
+                if count >= k:
+                    self.ranked_sublists = self.ranked_sublists[:i + 1]
+                    break
+
+        return self.ranked_sublists
+
+
+
+class IncrementalNonDominatedRanking(VectorizedNonDominatedRanking[List[S]]):
+    """ Non-dominated ranking kept up to date when one solution is added or removed, as steady-state algorithms
+    do, instead of ranking the whole population again.
+
+    An added solution joins the first front in which no solution dominates it (no later front can hold one of its
+    dominators); the solutions of that front it dominates move one front down, where they push down the ones they
+    dominate, and so on. Removing a solution of the last front leaves the other ranks unchanged.
+    """
+
+    def __init__(self, comparator: Comparator = DominanceComparator()):
+        super(IncrementalNonDominatedRanking, self).__init__(comparator)
+
+    def dominates(self, solution1: S, solution2: S) -> bool:
+        self.number_of_comparisons += 1
+        return self.comparator.compare(solution1, solution2) == -1
+
+    def add(self, solution: S) -> List[int]:
+        """ Inserts a solution in the ranking.
+
+        :param solution: Solution to insert.
+        :return: Ranks of the fronts that changed, e.g. to update their density estimation.
+        """
+        rank = 0
+        while rank < len(self.ranked_sublists) and \
+                any(self.dominates(member, solution) for member in self.ranked_sublists[rank]):
+            rank += 1
+
+        changed = []
+        moving = [solution]
+        while moving:
+            if rank == len(self.ranked_sublists):
+                self.ranked_sublists.append([])
+            front = self.ranked_sublists[rank]
+            dominated = [member for member in front if any(self.dominates(new, member) for new in moving)]
+            dominated_ids = set(id(member) for member in dominated)
+
+            self.ranked_sublists[rank] = [member for member in front if id(member) not in dominated_ids] + moving
+            for new in moving:
+                new.attributes['dominance_ranking'] = rank
+            changed.append(rank)
+
+            moving = dominated
+            rank += 1
+
+        return changed
+
+    def remove(self, solution: S) -> List[int]:
+        """ Removes a solution from the ranking. Out of the last front the ranking is computed again.
+
+        :param solution: Solution to remove.
+        :return: Ranks of the fronts that changed.
+        """
+        for rank, front in enumerate(self.ranked_sublists):
+            for index, member in enumerate(front):
+                if member is solution:
+                    del front[index]
+                    if rank == len(self.ranked_sublists) - 1:
+                        if not front:
+                            self.ranked_sublists.pop()
+                            return []
+                        return [rank]
+
+                    self.compute_ranking([member for front in self.ranked_sublists for member in front])
+                    return list(range(rank, len(self.ranked_sublists)))
+
+        raise Exception('Solution not in the ranking')
+
+
 class StrengthRanking(Ranking[List[S]]):
     """ Class implementing a ranking scheme based on the strength ranking used in SPEA2. """
 
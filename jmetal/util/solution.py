@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import List
 
 from jmetal.core.solution import FloatSolution, Solution
-from jmetal.util.archive import NonDominatedSolutionsArchive, Archive
+from jmetal.util.archive import NonDominatedSolutionsArchive
 
 LOGGER = logging.getLogger('jmetal')
 
@@ -19,10 +19,8 @@ LOGGER = logging.getLogger('jmetal')
 
 
 def get_non_dominated_solutions(solutions: List[Solution]) -> List[Solution]:
-    archive: Archive = NonDominatedSolutionsArchive()
-
-    for solution in solutions:
-        archive.add(solution)
+    archive: NonDominatedSolutionsArchive = NonDominatedSolutionsArchive()
+    archive.add_all(solutions)
 
     return archive.solution_list
 
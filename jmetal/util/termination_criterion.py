@@ -84,12 +84,17 @@ class StoppingByQualityIndicator(TerminationCriterion):
         self.expected_value = expected_value
         self.degree = degree
         self.value = 0.0
+        self.front = None
 
     def update(self, *args, **kwargs):
         solutions = kwargs['SOLUTIONS']
 
         if solutions:
-            self.value = self.quality_indicator.compute(solutions)
+            # The indicator is only computed again when the objective vectors change
+            front = sorted(tuple(solution.objectives) for solution in solutions)
+            if front != self.front:
+                self.value = self.quality_indicator.compute(solutions)
+                self.front = front
 
     @property
     def is_met(self):
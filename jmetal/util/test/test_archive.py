@@ -1,7 +1,10 @@
+import random
 import unittest
 
 from jmetal.core.solution import Solution
 from jmetal.util.archive import NonDominatedSolutionsArchive, BoundedArchive, CrowdingDistanceArchive, Archive
+from jmetal.util.comparator import SolutionAttributeComparator
+from jmetal.util.density_estimator import CrowdingDistance
 
 
 class ArchiveTestCases(unittest.TestCase):
@@ -113,6 +116,81 @@ class NonDominatedSolutionListArchiveTestCases(unittest.TestCase):
         self.assertTrue(solution1 in self.archive.solution_list
                         or solution3 in self.archive.solution_list)
 
+    @staticmethod
+    def random_solutions(number_of_solutions: int, number_of_objectives: int, constrained: bool):
+        solutions = []
+        for _ in range(number_of_solutions):
+            solution = Solution(1, number_of_objectives, 1 if constrained else 0)
+            solution.objectives = [float(random.randint(0, 5)) for _ in range(number_of_objectives)]
+            if constrained:
+                solution.constraints = [float(min(0, random.randint(-2, 3)))]
+            solutions.append(solution)
+        return solutions
+
+    def test_should_add_give_the_same_archive_as_the_pairwise_comparisons(self):
+        random.seed(1)
+        for constrained in [False, True]:
+            for number_of_objectives in [2, 3]:
+                solutions = self.random_solutions(200, number_of_objectives, constrained)
+                archive = NonDominatedSolutionsArchive()
+                pairwise = NonDominatedSolutionsArchive()
+
+                for solution in solutions:
+                    self.assertEqual(pairwise.add_pairwise(solution), archive.add(solution))
+
+                self.assertEqual([id(solution) for solution in pairwise.solution_list],
+                                 [id(solution) for solution in archive.solution_list])
+
+    def test_should_add_work_properly_if_the_solution_list_is_modified_externally(self):
+        solution1 = Solution(1, 2)
+        solution1.objectives = [1.0, 1.0]
+        solution2 = Solution(1, 2)
+        solution2.objectives = [2.0, 2.0]
+
+        self.archive.add(solution1)
+        self.archive.solution_list.clear()
+
+        self.assertTrue(self.archive.add(solution2))
+        self.assertEqual([solution2], self.archive.solution_list)
+
+    def test_should_add_all_give_the_same_archive_as_adding_one_by_one(self):
+        random.seed(2)
+        for constrained in [False, True]:
+            archive = NonDominatedSolutionsArchive()
+            sequential = NonDominatedSolutionsArchive()
+
+            for _ in range(5):
+                solutions = self.random_solutions(50, 3, constrained)
+                result = archive.add_all(solutions)
+                for solution in solutions:
+                    sequential.add(solution)
+
+                self.assertEqual(set(id(solution) for solution in sequential.solution_list),
+                                 set(id(solution) for solution in archive.solution_list))
+                kept = set(id(solution) for solution in archive.solution_list)
+                self.assertEqual([id(solution) in kept for solution in solutions], result)
+
+    def test_should_the_index_follow_insertions_and_removals(self):
+        random.seed(5)
+        solutions = self.random_solutions(300, 2, False)
+        for solution in solutions[:100]:
+            self.archive.add(solution)
+        self.archive.add_all(solutions[100:200])
+        keys = self.archive.keys.copy()
+        self.archive.remove(0)
+        self.archive.keep([i % 2 == 0 for i in range(self.archive.size())])
+        for solution in solutions[200:]:
+            self.archive.add(solution)
+
+        objectives, violations = self.archive.get_index()
+
+        self.assertEqual([list(solution.objectives) for solution in self.archive.solution_list], objectives.tolist())
+        self.assertEqual(len(set(self.archive.keys.tolist())), self.archive.size())
+        # Rows that stayed keep their keys, new rows get new ones
+        stayed = [key for key in self.archive.keys.tolist() if key in set(keys.tolist())]
+        self.assertEqual(sorted(stayed), stayed)
+        self.assertTrue(set(self.archive.keys.tolist()) - set(keys.tolist()))
+
 
 class CrowdingDistanceArchiveTestCases(unittest.TestCase):
 
@@ -345,6 +423,132 @@ class CrowdingDistanceArchiveTestCases(unittest.TestCase):
         self.assertEqual(float("inf"), solution3.attributes["crowding_distance"])
         self.assertTrue(solution2.attributes["crowding_distance"] < float("inf"))
 
+    def test_should_add_all_keep_the_maximum_size(self):
+        archive = CrowdingDistanceArchive(3)
+        solutions = []
+        for i in range(6):
+            solution = Solution(2, 2)
+            solution.objectives = [float(i), 5.0 - i]
+            solutions.append(solution)
+
+        result = archive.add_all(solutions)
+
+        self.assertEqual(3, archive.size())
+        kept = set(id(solution) for solution in archive.solution_list)
+        self.assertEqual([id(solution) in kept for solution in solutions], result)
+        self.assertTrue(result[0] and result[5])
+
+    @staticmethod
+    def random_front(size: int, number_of_objectives: int) -> list:
+        """ Points of the plane sum(objectives) = 20, with repeated coordinates (ties in the sorts). """
+        solutions = []
+        for _ in range(size):
+            solution = Solution(1, number_of_objectives)
+            objectives = [random.randint(0, 4) + random.choice([0.0, random.random()])
+                          for _ in range(number_of_objectives - 1)]
+            solution.objectives = objectives + [20.0 - sum(objectives)]
+            solutions.append(solution)
+        return solutions
+
+    @staticmethod
+    def copies(solutions: list) -> list:
+        copied = []
+        for solution in solutions:
+            copy = Solution(1, len(solution.objectives))
+            copy.objectives = list(solution.objectives)
+            copied.append(copy)
+        return copied
+
+    def test_should_add_all_remove_the_same_solutions_as_estimating_the_density_after_every_removal(self):
+        random.seed(3)
+        for _ in range(200):
+            solutions = self.random_front(random.randint(1, 60), random.randint(2, 4))
+            reference_solutions = self.copies(solutions)
+            maximum_size = random.randint(1, len(solutions))
+            archive = CrowdingDistanceArchive(maximum_size)
+            reference = BoundedArchive(maximum_size,
+                                       comparator=SolutionAttributeComparator("crowding_distance", lowest_is_best=False),
+                                       density_estimator=CrowdingDistance())
+
+            result = archive.add_all(solutions)
+
+            self.assertEqual(reference.add_all(reference_solutions), result)
+            self.assertEqual([solution.attributes.get("crowding_distance") for solution in reference_solutions],
+                             [solution.attributes.get("crowding_distance") for solution in solutions])
+
+    def test_should_add_all_of_one_solution_work_as_add(self):
+        random.seed(4)
+        solutions = self.random_front(100, 3)
+        reference_solutions = self.copies(solutions)
+        archive = CrowdingDistanceArchive(10)
+        reference = CrowdingDistanceArchive(10)
+
+        for solution, reference_solution in zip(solutions, reference_solutions):
+            archive.add_all([solution])
+            reference.add(reference_solution)
+
+            self.assertEqual([reference_solutions.index(solution) for solution in reference.solution_list],
+                             [solutions.index(solution) for solution in archive.solution_list])
+        self.assertEqual([solution.attributes.get("crowding_distance") for solution in reference_solutions],
+                         [solution.attributes.get("crowding_distance") for solution in solutions])
+
+    @staticmethod
+    def random_points(size: int, number_of_objectives: int) -> list:
+        """ Small integer objectives: dominated solutions, equal ones and ties in the sorts. """
+        solutions = []
+        for _ in range(size):
+            solution = Solution(1, number_of_objectives)
+            solution.objectives = [float(random.randint(0, 6)) for _ in range(number_of_objectives)]
+            solutions.append(solution)
+        return solutions
+
+    def assertSameArchives(self, reference: BoundedArchive, reference_solutions: list, archive: CrowdingDistanceArchive,
+                           solutions: list):
+        self.assertEqual([reference_solutions.index(solution) for solution in reference.solution_list],
+                         [solutions.index(solution) for solution in archive.solution_list])
+        self.assertEqual([solution.attributes.get("crowding_distance") for solution in reference_solutions],
+                         [solution.attributes.get("crowding_distance") for solution in solutions])
+
+    def test_should_add_remove_the_same_solutions_as_estimating_the_density_of_the_whole_archive(self):
+        random.seed(6)
+        for _ in range(30):
+            number_of_objectives = random.randint(2, 4)
+            solutions = self.random_front(150, number_of_objectives) + self.random_points(150, number_of_objectives)
+            random.shuffle(solutions)
+            reference_solutions = self.copies(solutions)
+            maximum_size = random.randint(1, 20)
+            archive = CrowdingDistanceArchive(maximum_size)
+            reference = BoundedArchive(maximum_size,
+                                       comparator=SolutionAttributeComparator("crowding_distance", lowest_is_best=False),
+                                       density_estimator=CrowdingDistance())
+
+            for solution, reference_solution in zip(solutions, reference_solutions):
+                self.assertEqual(reference.add(reference_solution), archive.add(solution))
+
+            self.assertSameArchives(reference, reference_solutions, archive, solutions)
+
+    def test_should_add_and_add_all_mixed_work_as_the_reference(self):
+        random.seed(7)
+        for _ in range(20):
+            solutions = self.random_front(200, 3)
+            reference_solutions = self.copies(solutions)
+            archive = CrowdingDistanceArchive(15)
+            reference = BoundedArchive(15, comparator=SolutionAttributeComparator("crowding_distance",
+                                                                                  lowest_is_best=False),
+                                       density_estimator=CrowdingDistance())
+
+            start = 0
+            while start < len(solutions):
+                count = random.choice([1, 1, 1, 10])
+                if count == 1:
+                    self.assertEqual(reference.add(reference_solutions[start]), archive.add(solutions[start]))
+                else:
+                    self.assertEqual(reference.add_all(reference_solutions[start:start + count]),
+                                     archive.add_all(solutions[start:start + count]))
+                start += count
+
+            self.assertSameArchives(reference, reference_solutions, archive, solutions)
+
 
 if __name__ == '__main__':
     unittest.main()
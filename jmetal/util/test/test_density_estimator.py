@@ -1,5 +1,6 @@
+import random
 import unittest
-from math import sqrt
+from math import sqrt, isclose
 
 from jmetal.core.solution import Solution
 from jmetal.util.density_estimator import CrowdingDistance, KNearestNeighborDensityEstimator
@@ -87,6 +88,47 @@ class CrowdingDistanceTestCases(unittest.TestCase):
         self.assertEqual(float("inf"), value_from_solution2)
         self.assertGreater(value_from_solution3, value_from_solution4)
 
+    def test_should_the_crowding_distance_break_draws_with_the_order_of_the_previous_objective(self):
+        """ Solutions 1 and 2 draw in the second objective: the sort by the first one leaves 2 before 1,
+        so 2 is the extreme point and gets infinity.
+        """
+        solution1 = Solution(2, 2)
+        solution1.objectives = [2.0, 0.0]
+        solution2 = Solution(2, 2)
+        solution2.objectives = [1.0, 0.0]
+        solution3 = Solution(2, 2)
+        solution3.objectives = [0.0, 1.0]
+        solution4 = Solution(2, 2)
+        solution4.objectives = [3.0, 2.0]
+
+        solution_list = [solution1, solution2, solution3, solution4]
+
+        self.crowding.compute_density_estimator(solution_list)
+
+        self.assertEqual(float("inf"), solution2.attributes["crowding_distance"])
+        self.assertEqual(2 / 3 + 1 / 2, solution1.attributes["crowding_distance"])
+
+    def test_should_the_crowding_distance_of_a_large_front_match_the_definition(self):
+        random.seed(1)
+        solution_list = []
+        for _ in range(300):
+            solution = Solution(2, 3)
+            solution.objectives = [random.random() for _ in range(3)]
+            solution_list.append(solution)
+
+        self.crowding.compute_density_estimator(solution_list)
+
+        expected = [0.0] * len(solution_list)
+        for i in range(3):
+            ordered = sorted(range(len(solution_list)), key=lambda j: solution_list[j].objectives[i])
+            values = [solution_list[j].objectives[i] for j in ordered]
+            expected[ordered[0]] = expected[ordered[-1]] = float("inf")
+            for position in range(1, len(ordered) - 1):
+                expected[ordered[position]] += (values[position + 1] - values[position - 1]) / (values[-1] - values[0])
+
+        for solution, value in zip(solution_list, expected):
+            self.assertTrue(isclose(value, solution.attributes["crowding_distance"]))
+
 
 class KNearestNeighborDensityEstimatorTest(unittest.TestCase):
 
@@ -211,6 +253,26 @@ class KNearestNeighborDensityEstimatorTest(unittest.TestCase):
 
         self.assertEqual([0.1028341459863098, 4.9409270526888935], population[4].objectives)
 
+    def test_should_the_density_estimator_of_a_large_population_match_the_brute_force_distances(self):
+        random.seed(1)
+        population = []
+        for _ in range(200):
+            solution = Solution(2, 3)
+            solution.objectives = [random.random() for _ in range(3)]
+            population.append(solution)
+
+        knn = KNearestNeighborDensityEstimator(k=2)
+        knn.compute_density_estimator(population)
+
+        for solution in population:
+            distances = sorted(sqrt(sum((a - b) ** 2 for a, b in zip(solution.objectives, other.objectives)))
+                               for other in population)
+            self.assertTrue(isclose(distances[2], solution.attributes['knn_density']))
+
+        knn.sort(population)
+        densities = [solution.attributes['knn_density'] for solution in population]
+        self.assertEqual(sorted(densities, reverse=True), densities)
+
 
 if __name__ == "__main__":
     unittest.main()
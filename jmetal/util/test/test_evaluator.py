@@ -2,7 +2,7 @@ import unittest
 
 from jmetal.core.problem import FloatProblem
 from jmetal.core.solution import FloatSolution
-from jmetal.util.evaluator import SequentialEvaluator, MapEvaluator
+from jmetal.util.evaluator import SequentialEvaluator, MapEvaluator, BatchEvaluator, AsyncEvaluator
 
 
 class MockedProblem(FloatProblem):
@@ -29,6 +29,30 @@ class MockedProblem(FloatProblem):
         pass
 
 
+class MockedBatchProblem(MockedProblem):
+
+    def __init__(self, number_of_variables: int = 3):
+        super(MockedBatchProblem, self).__init__(number_of_variables)
+        self.batches = []
+
+    def evaluate_all(self, solution_list):
+        self.batches.append(len(solution_list))
+        for solution in solution_list:
+            solution.objectives[0] = 3.4
+            solution.objectives[1] = 4.5
+
+        return solution_list
+
+
+class MockedAsyncProblem(MockedProblem):
+
+    async def evaluate_async(self, solution: FloatSolution):
+        solution.objectives[0] = 5.6
+        solution.objectives[1] = 6.7
+
+        return solution
+
+
 class SequentialEvaluatorTestCases(unittest.TestCase):
 
     def setUp(self):
@@ -83,5 +107,51 @@ class ParallelEvaluatorTestCases(unittest.TestCase):
             self.assertEqual(2.3, problem_list[i].objectives[1])
 
 
+class BatchEvaluatorTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.evaluator = BatchEvaluator()
+
+    def test_should_evaluate_call_evaluate_all_once_with_the_whole_list(self):
+        problem = MockedBatchProblem()
+        problem_list = [problem.create_solution() for _ in range(10)]
+
+        self.evaluator.evaluate(problem_list, problem)
+
+        self.assertEqual([10], problem.batches)
+        for i in range(10):
+            self.assertEqual(3.4, problem_list[i].objectives[0])
+            self.assertEqual(4.5, problem_list[i].objectives[1])
+
+    def test_should_evaluate_solutions_one_by_one_if_the_problem_has_no_evaluate_all(self):
+        problem = MockedProblem()
+        problem_list = [problem.create_solution() for _ in range(10)]
+
+        self.evaluator.evaluate(problem_list, problem)
+
+        for i in range(10):
+            self.assertEqual(1.2, problem_list[i].objectives[0])
+            self.assertEqual(2.3, problem_list[i].objectives[1])
+
+
+class AsyncEvaluatorTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.evaluator = AsyncEvaluator()
+        self.problem = MockedAsyncProblem()
+
+    def test_should_constructor_create_a_non_null_object(self):
+        self.assertIsNotNone(self.evaluator)
+
+    def test_should_evaluate_a_list_of_problem_work_properly(self):
+        problem_list = [self.problem.create_solution() for _ in range(10)]
+
+        self.evaluator.evaluate(problem_list, self.problem)
+
+        for i in range(10):
+            self.assertEqual(5.6, problem_list[i].objectives[0])
+            self.assertEqual(6.7, problem_list[i].objectives[1])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+import random
+import unittest
+
+from jmetal.util.hypervolume import hypervolume, nondominated, HypervolumeContributions
+
+import numpy as np
+
+
+class HypervolumeTestCases(unittest.TestCase):
+
+    def test_should_hypervolume_of_an_empty_front_be_zero(self):
+        self.assertEqual(0.0, hypervolume([], [1.0, 1.0]))
+
+    def test_should_hypervolume_ignore_the_points_that_do_not_dominate_the_reference_point(self):
+        self.assertEqual(0.25, hypervolume([[0.5, 0.5], [2.0, 0.0]], [1.0, 1.0]))
+
+    def test_should_hypervolume_return_5_0(self):
+        self.assertEqual(5.0, hypervolume([[1, 0, 1], [0, 1, 0]], [2, 2, 2]))
+
+    def test_should_hypervolume_of_boxes_match_the_inclusion_exclusion_principle(self):
+        points = [[0.0, 0.5, 0.5, 0.5], [0.5, 0.0, 0.5, 0.5], [0.5, 0.5, 0.0, 0.5], [0.5, 0.5, 0.5, 0.0]]
+        # Four boxes of volume 0.5 ** 3, every intersection is the box [0.5, 1] ** 4
+        expected = 4 * 0.5 ** 3 - 6 * 0.5 ** 4 + 4 * 0.5 ** 4 - 0.5 ** 4
+
+        self.assertAlmostEqual(expected, hypervolume(points, [1.0, 1.0, 1.0, 1.0]))
+
+    def test_should_hypervolume_match_the_monte_carlo_estimation(self):
+        random_generator = np.random.default_rng(1)
+        points = random_generator.random((20, 5))
+        samples = random_generator.random((200000, 5))
+        dominated = (points[None, :, :] <= samples[:, None, :]).all(axis=2).any(axis=1)
+
+        self.assertAlmostEqual(dominated.mean(), hypervolume(points, [1.0] * 5), delta=0.01)
+
+    def test_should_nondominated_remove_dominated_and_duplicated_points(self):
+        points = np.array([[1.0, 2.0], [2.0, 1.0], [2.0, 2.0], [1.0, 2.0]])
+
+        self.assertEqual([[1.0, 2.0], [2.0, 1.0]], nondominated(points).tolist())
+
+
+class HypervolumeContributionsTestCases(unittest.TestCase):
+
+    def assert_contributions(self, points, reference_point, contributions):
+        total = hypervolume(points, reference_point)
+        for i, contribution in enumerate(contributions.get_contributions()):
+            self.assertAlmostEqual(total - hypervolume(points[:i] + points[i + 1:], reference_point), contribution)
+
+    def test_should_contributions_be_the_exclusive_volumes(self):
+        contributions = HypervolumeContributions([2, 2, 2], [[1, 0, 1], [0, 1, 0]])
+
+        self.assertEqual([1.0, 3.0], contributions.get_contributions())
+
+    def test_should_a_dominated_point_contribute_nothing(self):
+        contributions = HypervolumeContributions([1.0, 1.0], [[0.2, 0.2], [0.5, 0.5]])
+
+        self.assertEqual(0.0, contributions.get_contributions()[1])
+
+    def test_should_contributions_be_updated_when_points_are_added_and_removed(self):
+        random.seed(1)
+        reference_point = [1.0, 1.0, 1.0, 1.0]
+        points = [[random.random() for _ in range(4)] for _ in range(10)]
+        contributions = HypervolumeContributions(reference_point, points)
+
+        for _ in range(5):
+            point = [random.random() for _ in range(4)]
+            contributions.add(point)
+            points.append(point)
+            self.assert_contributions(points, reference_point, contributions)
+
+            index = random.randrange(len(points))
+            contributions.remove(index)
+            del points[index]
+            self.assert_contributions(points, reference_point, contributions)
+
+        self.assertAlmostEqual(hypervolume(points, reference_point), contributions.get_hypervolume())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
+import random
 import unittest
 
+from jmetal.core.problem import Problem
 from jmetal.core.solution import Solution
-from jmetal.util.ranking import FastNonDominatedRanking, StrengthRanking, Ranking
+from jmetal.util.ranking import FastNonDominatedRanking, StrengthRanking, Ranking, VectorizedNonDominatedRanking, \
+    IncrementalNonDominatedRanking
 
 
 class FastNonDominatedRankingTestCases(unittest.TestCase):
@@ -236,5 +239,92 @@ class StrengthRankingTestCases(unittest.TestCase):
         self.assertEqual(0, solution5.attributes['strength_ranking'])
 
 
+class VectorizedNonDominatedRankingTestCases(FastNonDominatedRankingTestCases):
+
+    def setUp(self):
+        self.ranking = VectorizedNonDominatedRanking()
+
+    def test_should_compute_ranking_be_identical_to_the_fast_non_dominated_ranking(self):
+        random.seed(1)
+        for _ in range(50):
+            solution_list = []
+            for _ in range(random.randint(1, 40)):
+                solution = Solution(2, 3, 1)
+                solution.objectives = [random.randint(0, 3) for _ in range(3)]
+                solution.constraints = [random.choice([0, 0, -1, -2])]
+                solution_list.append(solution)
+
+            expected = FastNonDominatedRanking().compute_ranking(solution_list)
+            expected_attributes = [solution.attributes['dominance_ranking'] for solution in solution_list]
+            ranking = VectorizedNonDominatedRanking().compute_ranking(solution_list)
+
+            self.assertEqual(expected, ranking)
+            self.assertEqual(expected_attributes, [solution.attributes['dominance_ranking'] for solution in solution_list])
+
+    def test_should_compute_ranking_respect_the_objective_directions(self):
+        solution = Solution(2, 2)
+        solution.objectives = [2, 3]
+        solution2 = Solution(2, 2)
+        solution2.objectives = [3, 6]
+        solution_list = [solution, solution2]
+
+        ranking = VectorizedNonDominatedRanking(directions=[Problem.MAXIMIZE, Problem.MAXIMIZE])\
+            .compute_ranking(solution_list)
+
+        self.assertEqual(2, len(ranking))
+        self.assertEqual(solution2, ranking[0][0])
+        self.assertEqual(solution, ranking[1][0])
+
+
+class IncrementalNonDominatedRankingTestCases(unittest.TestCase):
+
+    def random_solution(self) -> Solution:
+        solution = Solution(2, 3, 1)
+        solution.objectives = [random.randint(0, 4) for _ in range(3)]
+        solution.constraints = [random.choice([0, 0, 0, -1])]
+        return solution
+
+    def assertSameFronts(self, ranking: IncrementalNonDominatedRanking):
+        solution_list = [solution for front in ranking.ranked_sublists for solution in front]
+        expected = FastNonDominatedRanking().compute_ranking(solution_list)
+
+        self.assertEqual([sorted(id(solution) for solution in front) for front in expected],
+                         [sorted(id(solution) for solution in front) for front in ranking.ranked_sublists])
+        for rank, front in enumerate(ranking.ranked_sublists):
+            self.assertTrue(all(solution.attributes['dominance_ranking'] == rank for solution in front))
+
+    def test_should_add_return_the_changed_fronts(self):
+        ranking = IncrementalNonDominatedRanking()
+        solution, solution2, solution3 = Solution(2, 2), Solution(2, 2), Solution(2, 2)
+        solution.objectives = [2, 2]
+        solution2.objectives = [1, 3]
+        solution3.objectives = [1, 1]
+        ranking.compute_ranking([solution, solution2])
+
+        self.assertEqual([0, 1], ranking.add(solution3))
+        self.assertEqual([[solution3], [solution, solution2]], ranking.ranked_sublists)
+
+    def test_should_add_and_remove_keep_the_fast_non_dominated_ranking(self):
+        random.seed(1)
+        ranking = IncrementalNonDominatedRanking()
+        ranking.compute_ranking([self.random_solution() for _ in range(10)])
+
+        for _ in range(200):
+            ranking.add(self.random_solution())
+            self.assertSameFronts(ranking)
+
+            solution_list = [solution for front in ranking.ranked_sublists for solution in front]
+            ranking.remove(random.choice(solution_list[len(solution_list) // 2:] if random.random() < 0.5
+                                         else solution_list))
+            self.assertSameFronts(ranking)
+
+    def test_should_remove_raise_an_exception_if_the_solution_is_not_ranked(self):
+        ranking = IncrementalNonDominatedRanking()
+        ranking.compute_ranking([Solution(2, 2)])
+
+        with self.assertRaises(Exception):
+            ranking.remove(Solution(2, 2))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,28 +1,71 @@
 import sys
 import os
+import io
+import asyncio
+import queue
+import hashlib
+import threading
+from multiprocessing.pool import ThreadPool
 
 from jmetal.core.problem import IntegerProblem
+from jmetal.core.population import IntegerPopulation
 from jmetal.core.solution import IntegerSolution
 
 from LlvmUtils import LlvmUtils
+from LlvmUtils import AsyncLlvmUtils
 from LlvmUtils import LlvmFiles
+from LlvmUtils import LlvmArtifacts
 from Evaluator import Evaluator
+from Evaluator import METRICS_VERSION
+from CoreScheduler import CoreScheduler
+from ProcessRunner import ProcessRunner
+from ProcessRunner import LimitExceeded
+from Surrogate import Surrogate
+from FitnessCache import FitnessCache
+from BitcodeCache import BitcodeCache
 
 class llvmMultiobjetiveProblem(IntegerProblem):
 
     def __init__(self, max_epochs: int = 500, filename: str = None, solution_length: int = 100, population_size = int, 
-                offspring_population_size = int, verbose: bool = True, upper_bound : int = 86):
+                offspring_population_size = int, verbose: bool = True, upper_bound : int = 86, workers: int = 1, 
+                cache: str = None, prefix_cache: str = None, 
+                pipe: bool = False, debug: bool = False, runtime: bool = False, surrogate: bool = False,
+                timeout: float = None, memory_limit: int = None, cpu_limit: int = None):
 
-        self.llvm = LlvmUtils(llvmpath='/usr/bin/', clangexe='clang-10', optexe='opt-10', llcexe='llc-10')
+        # Every opt, llc, clang and timed run is supervised: a pass sequence that makes a tool fail, hang or exceed
+        # the memory (bytes) or CPU (seconds) limits gets penalty objectives instead of stopping the generation
+        runner = ProcessRunner(timeout=timeout, memory=memory_limit, cpu=cpu_limit)
+        toolchain = runner
+        # Runtime as a sixth objective: one warmup, then 3 to 30 timed runs until the median is within 2%.
+        # Concurrent measures (workers) are pinned to distinct physical cores, one core is kept for the tools and
+        # the algorithm, which never run on a measure core or its hyperthread siblings
+        if runtime:
+            scheduler = None
+            if hasattr(os, 'sched_setaffinity'):
+                scheduler = CoreScheduler(reserve=1 if len(CoreScheduler.get_dedicated_cores()) > 1 else 0)
+                toolchain = ProcessRunner(timeout=timeout, memory=memory_limit, cpu=cpu_limit,
+                                          affinity=scheduler.get_other_cpus())
+            self.evaluator = Evaluator(runs=3, warmup=1, max_runs=30, precision=0.02, scheduler=scheduler,
+                                       runner=runner)
+        else:
+            self.evaluator = Evaluator(runs=0, runner=runner)
+        self.llvm = LlvmUtils(llvmpath='/usr/bin/', clangexe='clang-10', optexe='opt-10', llcexe='llc-10', 
+                                cache=BitcodeCache(cachedir=prefix_cache) if prefix_cache else None, 
+                                runner=toolchain)
+        self.async_llvm = AsyncLlvmUtils(llvmpath='/usr/bin/', clangexe='clang-10', optexe='opt-10', llcexe='llc-10', 
+                                opt_jobs=workers, llc_jobs=workers, clang_jobs=workers, runner=toolchain)
         self.llvmfiles = LlvmFiles(basepath='./', source_bc='polybench_small/polybench_small_original.bc', 
                                 jobid=f'{population_size}_{offspring_population_size}_{solution_length}')
-        self.evaluator = Evaluator(runs=0)
         self.number_of_variables = solution_length
         self.lower_bound = [0 for _ in range(self.number_of_variables)]
         self.upper_bound = [upper_bound for _ in range(self.number_of_variables)]
         self.obj_labels = ['codelines', 'tags', 'jumps', 'function_tags', 'calls']
         self.obj_directions = [self.MAXIMIZE, self.MINIMIZE, self.MINIMIZE, self.MINIMIZE, self.MINIMIZE]
         self.number_of_objectives = 5
+        if runtime:
+            self.obj_labels.append('runtime')
+            self.obj_directions.append(self.MINIMIZE)
+            self.number_of_objectives = 6
         self.number_of_constraints = 0
         self.max_epochs = max_epochs
         self.evaluations = 0
@@ -30,74 +73,305 @@ class llvmMultiobjetiveProblem(IntegerProblem):
         self.phenotype = 0
         self.population_size = population_size
         self.offspring_population_size = offspring_population_size
-        self.dictionary = dict()
         self.verbose = verbose
-        self.preloaded_dictionary = f"{self.number_of_variables}_dictionary.data"
-        if os.path.exists(self.preloaded_dictionary):
-            with open(self.preloaded_dictionary,"r") as file:
-                print(f"reading '{self.preloaded_dictionary}'...")
-                for line in file.readlines():
-                    line = line[:-1] # \n
-                    keyvalue = line.split(sep=";")
-                    self.dictionary.update({keyvalue[0]:keyvalue[1]})
+        self.pipe = pipe
+        self.debug = debug
+        self.workers = workers
+        self.lock = threading.Lock()
+        self.scratch_pool = None
+        self.scratch_pid = None
+        self.parent_pid = os.getpid()
+        self.thread_pool = None
+        self.thread_pool_pid = None
+        self.population = None
+        self.population_pid = None
+        # Legacy '{n}_dictionary.data' files hold substring-count measures (version 1), they are not imported
+        # Runtime values are only comparable on the same machine, they get their own default cache.
+        # So does every compilation mode, a cache file refuses values of another mode
+        if cache is None:
+            cache = f"llvm_fitness_v{METRICS_VERSION}{'_runtime' if runtime else ''}_{self.llvm.get_mode()}.db"
+        self.cache = FitnessCache(cache, namespace=self.llvm.get_mode())
+        # Batch evaluations compile only the offspring a k-NN over the cache predicts as promising
+        self.surrogate = Surrogate(number_of_passes=upper_bound + 1) if surrogate else None
+        self.surrogate_loaded = False
 
     def get_name(self):
         return 'Llvm Multiobjective Problem'
 
+    # Solutions are rows of one population per process: batch reproduction crosses and mutates them as a matrix
+    def create_solution(self) -> IntegerSolution:
+        return self.get_population().add(super(llvmMultiobjetiveProblem, self).create_solution())
+
+    def get_population(self) -> IntegerPopulation:
+        with self.lock:
+            if self.population is None or self.population_pid != os.getpid():
+                self.population = IntegerPopulation(self.lower_bound, self.upper_bound, self.number_of_objectives,
+                                                    self.number_of_constraints, capacity=256)
+                self.population_pid = os.getpid()
+            return self.population
+
     def config_to_str(self):
-        return f"{self.population_size}_{self.offspring_population_size}_{self.number_of_variables}_{self.max_epochs}"
+        return f"{self.population_size}_{self.offspring_population_size}_{self.number_of_variables}_{self.max_epochs}" \
+               f"_{self.llvm.get_mode()}"
+
+    # Moves the files of this problem and of its workers to another namespace, e.g. one per island process
+    def set_namespace(self, namespace: str):
+        with self.lock:
+            self.llvmfiles = self.llvmfiles.for_worker(namespace)
+            self.parent_pid = os.getpid()
+            self.scratch_pid = None
+            self.scratch_pool = None
+
+    # One (LlvmFiles, Evaluator) pair per worker, so concurrent evaluations never share files
+    def get_scratch_pool(self) -> queue.Queue:
+        with self.lock:
+            if self.scratch_pid != os.getpid():
+                self.scratch_pid = os.getpid()
+                self.scratch_pool = queue.Queue()
+                if self.workers == 1 and self.scratch_pid == self.parent_pid:
+                    self.scratch_pool.put((self.llvmfiles, self.evaluator))
+                else:
+                    for worker in range(self.workers):
+                        llvmfiles = self.llvmfiles.for_worker(f"{self.scratch_pid}_{worker}")
+                        self.scratch_pool.put((llvmfiles, self.evaluator.clone()))
+            return self.scratch_pool
+
+    # Counts one more evaluated solution, returns its (phenotype, epoch)
+    def count_evaluation(self) -> tuple:
+        with self.lock:
+            self.phenotype +=1
+            limit = [self.offspring_population_size if self.epoch != 1 else self.population_size]
+            if self.phenotype%(limit[0]+1) == 0:
+                self.epoch += 1
+                self.phenotype = 1
+            return self.phenotype, self.epoch
+
+    # Compiles and measures a canonical sequence, stores its objectives in the cache
+    def compute_objectives(self, genes: list) -> list:
+        # Decoding
+        passes = ""
+        for gene in genes:
+            passes += f" {self.llvm.get_passes()[gene]}"
+
+        scratch_pool = self.get_scratch_pool()
+        llvmfiles, evaluator = scratch_pool.get()
+        ir_hash = None
+        try:
+            artifacts = LlvmArtifacts(self.llvm, llvmfiles, passes, pipe=self.pipe, debug=self.debug)
+
+            # Bit-identical bitcode was already measured: skip llc, clang and the evaluator
+            ir_hash = artifacts.get_ir_hash()
+            value = self.cache.get_ir(ir_hash)
+            if value == None:
+                # Get measures, building only the resources they need
+                evaluator.evaluate_artifacts(artifacts)
+                value = self.get_values(evaluator)
+                self.cache.put_ir(ir_hash, value)
+        except LimitExceeded as error:
+            value = self.penalize(genes, ir_hash, error)
+        finally:
+            evaluator.reset()
+            scratch_pool.put((llvmfiles, evaluator))
+        self.cache.put(genes, value)
+        return value
+
+    # Worst values for the algorithm, which minimizes every objective as measured (a failed timed run already
+    # gets a sys.maxsize runtime)
+    def get_penalty_values(self) -> list:
+        return [sys.maxsize for _ in range(self.number_of_objectives)]
+
+    # The penalty is cached like any other value, so the sequence (and its bitcode, when it was built) is never
+    # compiled again
+    def penalize(self, genes: list, ir_hash: str, error: LimitExceeded) -> list:
+        value = self.get_penalty_values()
+        if ir_hash is not None:
+            self.cache.put_ir(ir_hash, value)
+        if self.verbose:
+            print(f"penalized sequence {genes}: {error}")
+        return value
+
+    # (genes, value) pairs without the penalties, which the surrogate must not learn as measures
+    def measured(self, entries) -> list:
+        penalty = self.get_penalty_values()
+        return [(genes, value) for genes, value in entries if list(value) != penalty]
+
+    # Objective values in obj_labels order
+    def get_values(self, evaluator: Evaluator) -> list:
+        value = [evaluator.get_codelines(), evaluator.get_tags(), evaluator.get_total_jmps(),
+                 evaluator.get_function_tags(), evaluator.get_calls()]
+        if self.number_of_objectives == 6:
+            value.append(evaluator.get_runtime())
+        return value
+
+    def set_objectives(self, solution: IntegerSolution, value: list, phenotype: int, epoch: int):
+        for i in range(self.number_of_objectives):
+            solution.objectives[i] = value[i]
 
-    def evaluate(self, solution: IntegerSolution) -> IntegerSolution:
-        self.phenotype +=1
-        limit = [self.offspring_population_size if self.epoch != 1 else self.population_size]
-        if self.phenotype%(limit[0]+1) == 0:
-            self.epoch += 1
-            self.phenotype = 1
-        key = f"{solution.variables}"
-        value = self.dictionary.get(key)
-        if value == None:
-            # Decoding
-            passes = ""
-            for i in range(self.number_of_variables):
-                passes += f" {self.llvm.get_passes()[solution.variables[i]]}"
-
-            # Optimize and generate resources
-            self.llvm.toIR(self.llvmfiles.get_original_bc(), self.llvmfiles.get_optimized_bc(), passes=passes)
-            self.llvm.toExecutable(self.llvmfiles.get_optimized_bc(), self.llvmfiles.get_optimized_exe())
-            self.llvm.toAssembly(self.llvmfiles.get_optimized_bc(), self.llvmfiles.get_optimized_ll())
-
-            # Get measures
-            self.evaluator.evaluate(source_ll=self.llvmfiles.get_optimized_ll(), source_exe=self.llvmfiles.get_optimized_exe())
-            solution.objectives[0] = self.evaluator.get_codelines()
-            solution.objectives[1] = self.evaluator.get_tags()
-            solution.objectives[2] = self.evaluator.get_total_jmps()
-            solution.objectives[3] = self.evaluator.get_function_tags()
-            solution.objectives[4] = self.evaluator.get_calls()
-            self.dictionary.update({key: solution.objectives})
-            self.evaluator.reset()
-        else:
-            # Get stored value
-            solution.objectives[0] = value[0]
-            solution.objectives[1] = value[1]
-            solution.objectives[2] = value[2]
-            solution.objectives[3] = value[3]
-            solution.objectives[4] = value[4]
-        
         if self.verbose:
             print("evaluated solution {:3} from epoch {:3} : variables={}, fitness={}"\
-                .format(self.phenotype,self.epoch,solution.variables,solution.objectives))
+                .format(phenotype,epoch,solution.variables,solution.objectives))
+
+    def evaluate(self, solution: IntegerSolution) -> IntegerSolution:
+        phenotype, epoch = self.count_evaluation()
+        # Equivalent genomes share one canonical sequence, and one cache entry
+        genes = self.llvm.canonicalize(solution.variables)
+        value = self.cache.get(genes)
+        if value == None:
+            value = self.compute_objectives(genes)
+        self.set_objectives(solution, value, phenotype, epoch)
         return solution
 
+    # Batch lookup: evaluation counts, canonical keys, cached values and unique missing sequences
+    def lookup_all(self, solutions: list) -> tuple:
+        counts = [self.count_evaluation() for _ in solutions]
+        keys = [tuple(self.llvm.canonicalize(solution.variables)) for solution in solutions]
+        values = self.cache.get_all(list(set(keys)))
+        misses = [list(key) for key in dict.fromkeys(keys) if key not in values]
+        return counts, keys, values, misses
+
+    # predicted: keys whose values come from the surrogate, their solutions are flagged with a 'surrogate' attribute
+    def fan_out(self, solutions: list, counts: list, keys: list, values: dict, predicted: dict = None) -> list:
+        for solution, key, (phenotype, epoch) in zip(solutions, keys, counts):
+            self.set_objectives(solution, values[key], phenotype, epoch)
+            if predicted and key in predicted:
+                solution.attributes['surrogate'] = True
+            else:
+                solution.attributes.pop('surrogate', None)
+        return solutions
+
+    # Surrogate pre-screening: misses predicted dominated (and certain enough) get predicted values instead of
+    # a compilation. Returns (misses to compile, {key: predicted values}), predictions are never cached
+    def screen(self, misses: list, values: dict) -> tuple:
+        if self.surrogate is None or not misses:
+            return misses, dict()
+        if not self.surrogate_loaded:
+            self.surrogate.update(self.measured(self.cache.items()))
+            self.surrogate_loaded = True
+        measured = self.measured(values.items())
+        self.surrogate.update(measured)
+        if not self.surrogate.is_ready():
+            return misses, dict()
+        # Same dominance as the algorithms (DominanceComparator minimizes every objective, whatever obj_directions says)
+        directions = [self.MINIMIZE] * self.number_of_objectives
+        compile_mask, predicted = self.surrogate.screen(misses, directions, [value for _, value in measured])
+        kept = [genes for genes, keep in zip(misses, compile_mask) if keep]
+        skipped = {tuple(genes): list(value) for genes, value, keep in zip(misses, predicted.tolist(), compile_mask)
+                   if not keep}
+        return kept, skipped
+
+    # Batch path: canonical sequences are deduplicated within the batch and against the cache,
+    # only the unique misses are compiled (by the workers), and results are fanned out to every solution
+    def evaluate_all(self, solutions: list) -> list:
+        counts, keys, values, misses = self.lookup_all(solutions)
+        misses, predicted = self.screen(misses, values)
+        if len(misses) > 1 and self.workers > 1:
+            computed = self.get_thread_pool().map(self.compute_objectives, misses)
+        else:
+            computed = [self.compute_objectives(genes) for genes in misses]
+        values.update(zip([tuple(genes) for genes in misses], computed))
+        if self.surrogate is not None:
+            self.surrogate.update(self.measured(zip(misses, computed)))
+        values.update(predicted)
+        return self.fan_out(solutions, counts, keys, values, predicted)
+
+    # Same as compute_objectives with the asyncio driver: opt, llc (and clang) of different sequences overlap
+    # The sqlite cache and the assembly scan run in the default executor, the event loop only waits on tools
+    # The driver runs whole sequences (one opt run), only the values of that mode can go to the cache
+    async def compute_objectives_async(self, genes: list, scratch: asyncio.Queue) -> list:
+        loop = asyncio.get_running_loop()
+        passes = " ".join(self.llvm.get_passes()[gene] for gene in genes)
+        ir_hash = None
+        try:
+            bitcode = await self.async_llvm.toIRBytes(self.llvmfiles.get_original_bc(), passes)
+            ir_hash = hashlib.sha256(bitcode).hexdigest()
+            value = await loop.run_in_executor(None, self.cache.get_ir, ir_hash)
+            if value == None:
+                evaluator = self.evaluator.clone()
+                assembly = await self.async_llvm.toAssemblyBytes(bitcode)
+                await loop.run_in_executor(None, evaluator.scan, io.BytesIO(assembly))
+                if evaluator.runs > 0:
+                    llvmfiles = await scratch.get()
+                    try:
+                        await self.async_llvm.toExecutable(bitcode, llvmfiles.get_optimized_exe())
+                        await loop.run_in_executor(None, evaluator.measure_runtime, llvmfiles.get_optimized_exe())
+                    finally:
+                        scratch.put_nowait(llvmfiles)
+                value = self.get_values(evaluator)
+                await loop.run_in_executor(None, self.cache.put_ir, ir_hash, value)
+        except LimitExceeded as error:
+            value = await loop.run_in_executor(None, self.penalize, genes, ir_hash, error)
+        await loop.run_in_executor(None, self.cache.put, genes, value)
+        return value
+
+    async def evaluate_all_async(self, solutions: list) -> list:
+        if self.llvm.cache is not None:
+            raise Exception(f"Asynchronous evaluation compiles whole sequences, it can't fill the "
+                            f"{self.llvm.get_mode()} fitness cache: use it without a prefix cache")
+        loop = asyncio.get_running_loop()
+        counts, keys, values, misses = await loop.run_in_executor(None, self.lookup_all, solutions)
+        misses, predicted = await loop.run_in_executor(None, self.screen, misses, values)
+        scratch = asyncio.Queue()
+        for worker in range(self.workers):
+            scratch.put_nowait(self.llvmfiles.for_worker(f"{os.getpid()}_async_{worker}"))
+        computed = await asyncio.gather(*[self.compute_objectives_async(genes, scratch) for genes in misses])
+        values.update(zip([tuple(genes) for genes in misses], computed))
+        if self.surrogate is not None:
+            self.surrogate.update(self.measured(zip(misses, computed)))
+        values.update(predicted)
+        return self.fan_out(solutions, counts, keys, values, predicted)
+
+    async def evaluate_async(self, solution: IntegerSolution) -> IntegerSolution:
+        return (await self.evaluate_all_async([solution]))[0]
+
+    def get_thread_pool(self) -> ThreadPool:
+        with self.lock:
+            if self.thread_pool is None or self.thread_pool_pid != os.getpid():
+                self.thread_pool = ThreadPool(self.workers)
+                self.thread_pool_pid = os.getpid()
+            return self.thread_pool
+
+    # Stops the worker threads and removes the scratch files of every worker, also the ones written by worker
+    # processes (MultiprocessEvaluator, AsyncNSGAII), which end without cleaning up. Call it once they are done
+    def close(self):
+        with self.lock:
+            if self.thread_pool is not None and self.thread_pool_pid == os.getpid():
+                self.thread_pool.close()
+                self.thread_pool.join()
+            self.thread_pool = None
+            self.scratch_pool = None
+            self.scratch_pid = None
+        for path in self.llvmfiles.get_worker_files():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    # Locks and queues can't be pickled (MultiprocessEvaluator); workers rebuild them
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['lock'] = None
+        state['scratch_pool'] = None
+        state['scratch_pid'] = None
+        state['thread_pool'] = None
+        state['population'] = None
+        state['population_pid'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
     ### FOR TERMINATION CRITERION ###
     def update(self, *args, **kwargs):
         self.evaluations = kwargs['EVALUATIONS']
+        # Solutions evaluated in other processes (AsyncNSGAII) aren't counted here: the epoch follows the
+        # evaluations, as many as count_evaluation makes in a generational run
+        with self.lock:
+            epoch = 1 if self.evaluations <= self.population_size \
+                else 2 + (self.evaluations - self.population_size - 1) // self.offspring_population_size
+            self.epoch = max(self.epoch, epoch)
 
     ### FOR TERMINATION CRITERION ###
     @property
     def is_met(self):
-        met = self.epoch >= self.max_epochs
-        if self.phenotype*self.epoch % 100 == 0 or met:
-            with open(self.preloaded_dictionary, "w") as file:
-                for keys,values in self.dictionary.items():
-                    file.write('{};{}\n'.format(keys,values))
-        return met
+        return self.epoch >= self.max_epochs
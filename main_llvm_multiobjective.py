@@ -1,19 +1,50 @@
-from jmetal.algorithm.multiobjective import NSGAII
+from jmetal.algorithm.multiobjective import NSGAII, AsyncNSGAII
 from jmetal.util.termination_criterion import StoppingByEvaluations
-from jmetal.operator import SBXCrossover, RandomSolutionSelection, IntegerPolynomialMutation
+from jmetal.util.evaluator import BatchEvaluator
+from jmetal.util.ranking import VectorizedNonDominatedRanking
+from jmetal.operator import BatchSBXCrossover, RandomSolutionSelection, BatchIntegerPolynomialMutation
 from jmetal.util.solution import get_non_dominated_solutions
+from jmetal.util.observer import BasicObserver
+from jmetal.core.population import IntegerSolutionView
 from llvmMultiobjetiveProblem import llvmMultiobjetiveProblem
+from Checkpoint import Checkpoint
+from IslandModel import IslandModel
 from jmetal.lab.visualization import Plot
 import sys
+import os
 
 ### SETTINGS
-config_max_epochs = int(sys.argv[1])
-config_population_size = int(sys.argv[2])
-config_offspring_population_size = int(sys.argv[3])
+# --resume: continue from the checkpoint of the same configuration
+config_resume = '--resume' in sys.argv
+arguments = [argument for argument in sys.argv if argument != '--resume']
+config_max_epochs = int(arguments[1])
+config_population_size = int(arguments[2])
+config_offspring_population_size = int(arguments[3])
 config_probability_mutation = 0.1
 config_probability_crossover = 0.3
-config_solution_length = int(sys.argv[4])
-config_verbose = bool(sys.argv[5])
+config_solution_length = int(arguments[4])
+config_verbose = bool(arguments[5])
+config_workers = int(arguments[6]) if len(arguments) > 6 else os.cpu_count()
+# Prefix cache directory (e.g. 'bitcode_cache/'): opt runs in chunks of passes resumed from cached prefixes. Not
+# equivalent to one opt run of the whole sequence (other IR, other objectives, its own fitness cache), and slower
+# unless offspring keep long prefixes of their parents
+config_prefix_cache = None
+config_pipe = True
+config_runtime = False
+config_surrogate = False
+config_checkpoint_interval = 1
+# Every toolchain process and timed run: wall-clock seconds, address space bytes and CPU seconds (None: no limit).
+# A sequence that exceeds them gets penalty objectives, cached so it is never compiled again
+config_timeout = 120
+config_memory_limit = 4 * 2**30
+config_cpu_limit = 120
+# Islands > 1: independent NSGAII populations in as many processes, sharing the workers and the fitness cache
+config_islands = 1
+config_migration_topology = 'ring'
+config_migration_interval = 5
+config_migrants = 2
+# Asynchronous steady-state NSGAII: config_workers processes, each one evaluating one solution at a time
+config_asynchronous = False
 
 #config_max_epochs = 2
 #config_population_size = 20
@@ -22,31 +53,97 @@ config_verbose = bool(sys.argv[5])
 #config_probability_crossover = 0.3
 #config_solution_length = 40
 #config_verbose = True
+#config_workers = 4
+#config_prefix_cache = 'bitcode_cache/'
+#config_pipe = False
+#config_runtime = True
+#config_surrogate = True
+#config_checkpoint_interval = 10
+#config_timeout = None
+#config_islands = 4
+#config_migration_topology = 'complete'
+#config_asynchronous = True
 
-if __name__ == '__main__':
-
-    # Problem set
-    problem = llvmMultiobjetiveProblem(
+def create_problem(workers: int, verbose: bool = config_verbose) -> llvmMultiobjetiveProblem:
+    return llvmMultiobjetiveProblem(
         max_epochs=config_max_epochs,
         population_size=config_population_size,
         offspring_population_size=config_offspring_population_size,
         solution_length=config_solution_length,
-        verbose=config_verbose)
+        verbose=verbose,
+        workers=workers,
+        prefix_cache=config_prefix_cache,
+        pipe=config_pipe,
+        runtime=config_runtime,
+        surrogate=config_surrogate,
+        timeout=config_timeout,
+        memory_limit=config_memory_limit,
+        cpu_limit=config_cpu_limit)
 
-    # Algorithm set
-    algorithm = NSGAII(
+def create_algorithm(problem: llvmMultiobjetiveProblem) -> NSGAII:
+    return NSGAII(
         problem=problem,
         population_size=config_population_size,
         offspring_population_size=config_offspring_population_size,
-        mutation=IntegerPolynomialMutation(config_probability_mutation),
-        crossover=SBXCrossover(config_probability_crossover),
+        mutation=BatchIntegerPolynomialMutation(config_probability_mutation),
+        crossover=BatchSBXCrossover(config_probability_crossover),
+        selection=RandomSolutionSelection(),
+        termination_criterion=problem,
+        population_evaluator=BatchEvaluator(),
+        ranking=VectorizedNonDominatedRanking()
+    )
+
+# Every pool process compiles in its own scratch files, the parent only breeds
+def create_async_algorithm(problem: llvmMultiobjetiveProblem) -> AsyncNSGAII:
+    return AsyncNSGAII(
+        problem=problem,
+        population_size=config_population_size,
+        mutation=BatchIntegerPolynomialMutation(config_probability_mutation),
+        crossover=BatchSBXCrossover(config_probability_crossover),
+        number_of_workers=config_workers,
         selection=RandomSolutionSelection(),
         termination_criterion=problem
     )
 
-    algorithm.run()
+# Runs in every island process
+def create_island(index: int) -> NSGAII:
+    return create_algorithm(create_problem(max(1, config_workers // config_islands)))
+
+if __name__ == '__main__':
+
+    # Problem and algorithm set. Islands build their own problems, the one of island 0 names the results
+    if config_asynchronous:
+        # The pool processes don't know the epoch, the progress is reported by the parent
+        problem = create_problem(1, verbose=False)
+        algorithm = create_async_algorithm(problem)
+        if config_verbose:
+            algorithm.observable.register(BasicObserver(frequency=config_population_size))
+        algorithm.run()
+    elif config_islands > 1:
+        algorithm = IslandModel(create_island, islands=config_islands, topology=config_migration_topology,
+                                interval=config_migration_interval, migrants=config_migrants)
+        algorithm.run()
+        problem = algorithm.problem
+    else:
+        problem = create_problem(config_workers)
+        algorithm = create_algorithm(problem)
+
+        # Atomic checkpoint every config_checkpoint_interval generations, written in the background
+        checkpoint = Checkpoint(f"{problem.config_to_str()}_checkpoint.pkl", algorithm, config_checkpoint_interval)
+        algorithm.observable.register(checkpoint)
+
+        if config_resume:
+            checkpoint.restore()
+            algorithm.resume()
+        else:
+            algorithm.run()
+        checkpoint.close()
+    # Worker threads and scratch files (every island already closed its own problem)
+    problem.close()
 
-    nds = get_non_dominated_solutions(algorithm.get_result())
+    # Plain solutions (lists), also for the rows of the problem population
+    nds = [solution.detach() if isinstance(solution, IntegerSolutionView) else solution
+           for solution in get_non_dominated_solutions(algorithm.get_result())]
 
     with open(f"{problem.config_to_str()}_results.csv","w") as file:
         for sol in nds:
@@ -64,6 +161,9 @@ if __name__ == '__main__':
         file.write(f'\n\tProbability mutation: {config_probability_mutation}')
         file.write(f'\n\tProbability crossover: {config_probability_crossover}')
         file.write(f'\n\tSolution length: {config_solution_length}')
+        file.write(f'\n\tWorkers: {config_workers}')
+        file.write(f'\n\tIslands: {config_islands}')
+        file.write(f'\n\tAsynchronous: {config_asynchronous}')
         file.write('\nResults:')
         for sol in nds:
             file.write(f'\n\t\t{sol.variables}\t\t{sol.objectives}')
@@ -78,10 +178,13 @@ if __name__ == '__main__':
     print(f'\tProbability mutation: {config_probability_mutation}')
     print(f'\tProbability crossover: {config_probability_crossover}')
     print(f'\tSolution length: {config_solution_length}')
+    print(f'\tWorkers: {config_workers}')
+    print(f'\tIslands: {config_islands}')
+    print(f'\tAsynchronous: {config_asynchronous}')
     print(f'\nResults:')
     for sol in nds:
         print(f'\t{sol.variables}\t\t{sol.objectives}')
 
-    plot_front = Plot(title='Pareto front aproximation', axis_labels=['runtime', 'codelines', 'tags', 'jumps', 'function_tags', 'calls'])
+    plot_front = Plot(title='Pareto front aproximation', axis_labels=problem.obj_labels)
     plot_front.plot([nds], normalize=False, filename=f'{problem.config_to_str()}_pareto_front', format='eps')
     
\ No newline at end of file
@@ -39,6 +39,7 @@ extern int main_syrk();
 extern int main_trisolv();
 extern int main_trmm();
 
+#ifndef POLYBENCH_KERNEL_TIMES
 int main()
 {
     int i;
@@ -64,4 +65,67 @@ int main()
         main_trmm();
     }
     return 0;
-}
\ No newline at end of file
+}
+#else
+/* Build instrumentada (-DPOLYBENCH_KERNEL_TIMES -DPOLYBENCH_TIME): cada benchmark mide su kernel con
+   polybench_timer_start/stop y main imprime una línea por ejecución:
+       polybench-kernel <nombre> <iteración> <segundos>
+   Con un argumento (p.ej. ./polybench_small_instrumented.out gemm) solo se ejecuta ese benchmark. */
+#include <stdio.h>
+#include <string.h>
+
+extern double polybench_t_start, polybench_t_end;
+
+struct kernel
+{
+    const char *name;
+    int (*run)();
+};
+
+static const struct kernel kernels[] = {
+    /* Minería de datos */
+    {"correlation", main_correlation},
+
+    {"2mm", main_2mm},
+    {"3mm", main_3mm},
+    {"atax", main_atax},
+    {"bicg", main_bicg},
+    {"cholesky", main_cholesky},
+    {"doitgen", main_doitgen},
+    {"gemm", main_gemm},
+    {"gemver", main_gemver},
+    {"gesummv", main_gesummv},
+    {"mvt", main_mvt},
+    {"symm", main_symm},
+    {"syr2k", main_syr2k},
+    {"syrk", main_syrk},
+    {"trisolv", main_trisolv},
+    {"trmm", main_trmm},
+};
+
+int main(int argc, char** argv)
+{
+    int i, k, selected = 0;
+    int n = sizeof(kernels) / sizeof(kernels[0]);
+    for(k=0;k<n;k++)
+        if(argc < 2 || strcmp(argv[1], kernels[k].name) == 0)
+            selected++;
+    if(selected == 0)
+    {
+        fprintf(stderr, "unknown kernel: %s\n", argv[1]);
+        return 1;
+    }
+
+    for(i=0;i<10;i++)
+    {
+        for(k=0;k<n;k++)
+        {
+            if(argc >= 2 && strcmp(argv[1], kernels[k].name) != 0)
+                continue;
+            kernels[k].run();
+            printf("polybench-kernel %s %d %0.9f\n", kernels[k].name, i, polybench_t_end - polybench_t_start);
+        }
+    }
+    return 0;
+}
+#endif
@@ -15,3 +15,15 @@ mv polybench_${tam}_original.bc.bak polybench_${tam}_original.bc
 ${llvm_path}opt-10 -O3 polybench_${tam}_original.bc -o polybench_${tam}_optimized.bc
 ${llvm_path}clang-10 -lm -O0 polybench_${tam}_optimized.bc -o polybench_${tam}_optimized.out
 time ./polybench_${tam}_optimized.out
+
+# Instrumented variant: one "polybench-kernel <name> <iteration> <seconds>" line per kernel run
+mkdir -p instrumented
+cd instrumented
+${llvm_path}clang-10 -c -O0 -Xclang -disable-O0-optnone -emit-llvm -DPOLYBENCH_TIME -DPOLYBENCH_NO_FLUSH_CACHE -DPOLYBENCH_KERNEL_TIMES ../*.c
+${llvm_path}llvm-link-10 *.bc -o ../polybench_${tam}_instrumented.bc
+cd ..
+rm -r instrumented
+${llvm_path}opt-10 -O3 polybench_${tam}_instrumented.bc -o polybench_${tam}_instrumented_optimized.bc
+${llvm_path}clang-10 -lm -O0 polybench_${tam}_instrumented_optimized.bc -o polybench_${tam}_instrumented.out
+rm polybench_${tam}_instrumented_optimized.bc
+./polybench_${tam}_instrumented.out
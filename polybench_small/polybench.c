@@ -82,7 +82,12 @@ unsigned long long int polybench_c_start, polybench_c_end;
 static
 double rtclock()
 {
-#if defined(POLYBENCH_TIME) || defined(POLYBENCH_GFLOPS)
+#if defined(POLYBENCH_KERNEL_TIMES)
+    /* Monotonic, nanosecond resolution: small kernels run in microseconds */
+    struct timespec Ts;
+    clock_gettime (CLOCK_MONOTONIC, &Ts);
+    return (Ts.tv_sec + Ts.tv_nsec * 1.0e-9);
+#elif defined(POLYBENCH_TIME) || defined(POLYBENCH_GFLOPS)
     struct timeval Tp;
     int stat;
     stat = gettimeofday (&Tp, NULL);
@@ -220,6 +220,13 @@ extern void polybench_timer_stop();
 extern void polybench_timer_print();
 # endif
 
+/* Per-kernel timings (main_all.c instrumented build): the kernels keep their timers
+   and main_all.c prints them, one machine-readable line per kernel run. */
+# ifdef POLYBENCH_KERNEL_TIMES
+#  undef polybench_print_instruments
+#  define polybench_print_instruments
+# endif
+
 /* PAPI support. */
 # ifdef POLYBENCH_PAPI
 extern int polybench_papi_start_counter(int evid);
@@ -0,0 +1,23 @@
+	.text
+	.file	"sample.c"
+	.globl	main                            # -- Begin function main
+main:                                   # @main
+# %bb.0:
+	pushq	%rbp
+	callq	foo
+	call	bar@PLT
+	calll	baz
+.LBB0_1:                                # =>This Inner Loop Header: Depth=1
+	cmpl	$9, %eax
+	jle	.LBB0_1
+	jmp	.LBB0_2
+	jmpq	*%rax
+	jne	.LBB0_1
+.LBB0_2:
+
+	retq
+	.size	main, .Lfunc_end0-main
+foo:
+	movl	$0, %eax
+	retq
+	.section	".note.GNU-stack","",@progbits
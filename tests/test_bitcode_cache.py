@@ -0,0 +1,171 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from BitcodeCache import BitcodeCache
+from LlvmUtils import LlvmUtils
+from tests.toolchain import FAKE_LLVM, POLYBENCH, has_toolchain
+
+SOURCE = os.path.join(POLYBENCH, "polybench_small_original.bc")
+
+
+def read(filename: str) -> bytes:
+    with open(filename, "rb") as file:
+        return file.read()
+
+
+def write(filename: str, content: bytes):
+    with open(filename, "wb") as file:
+        file.write(content)
+
+
+class BitcodeCacheTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cachedir = os.path.join(self.directory, "cache") + os.sep
+        self.cache = BitcodeCache(self.cachedir, stride=2)
+        self.source = os.path.join(self.directory, "source.bc")
+        self.output = os.path.join(self.directory, "output.bc")
+        write(self.source, b"source")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def store(self, prefix: list, content: bytes, cache: BitcodeCache = None):
+        write(self.source, content)
+        (cache or self.cache).store("input", prefix, self.source)
+
+    def test_should_lookup_copy_the_longest_cached_prefix(self):
+        self.store(["-a", "-b"], b"ab")
+        self.store(["-a", "-b", "-c", "-d"], b"abcd")
+
+        self.assertEqual(4, self.cache.lookup("input", ["-a", "-b", "-c", "-d", "-e"], self.output))
+        self.assertEqual(b"abcd", read(self.output))
+        self.assertEqual(2, self.cache.lookup("input", ["-a", "-b", "-c", "-e", "-d"], self.output))
+        self.assertEqual(b"ab", read(self.output))
+
+    def test_should_lookup_only_try_prefixes_at_the_stride(self):
+        self.store(["-a", "-b", "-c"], b"abc")
+
+        self.assertEqual(0, self.cache.lookup("input", ["-a", "-b", "-c", "-d"], self.output))
+        self.assertFalse(os.path.exists(self.output))
+
+    def test_should_prefixes_of_other_inputs_not_be_found(self):
+        self.store(["-a", "-b"], b"ab")
+
+        self.assertEqual(0, self.cache.lookup("other", ["-a", "-b"], self.output))
+
+    def test_should_store_keep_the_first_version_of_a_prefix(self):
+        self.store(["-a", "-b"], b"first")
+        self.store(["-a", "-b"], b"second")
+
+        self.cache.lookup("input", ["-a", "-b"], self.output)
+        self.assertEqual(b"first", read(self.output))
+        self.assertEqual(len(b"first"), self.cache.size)
+
+    def test_should_eviction_remove_the_least_recently_used_entries(self):
+        cache = BitcodeCache(self.cachedir, max_bytes=300, stride=2)
+        for i, prefix in enumerate([["-a", "-b"], ["-c", "-d"], ["-e", "-f"]]):
+            self.store(prefix, bytes(100), cache)
+            # Distinct modification times, whatever the resolution of the file system
+            os.utime(cache.get_path("input", prefix), ns=(i * 10**9, i * 10**9))
+        # A lookup makes -a -b the most recently used entry
+        cache.lookup("input", ["-a", "-b"], self.output)
+
+        self.store(["-g", "-h"], bytes(100), cache)
+
+        # Over the budget: entries are removed, oldest first, until 90% of it
+        self.assertEqual(200, cache.size)
+        self.assertFalse(os.path.exists(cache.get_path("input", ["-c", "-d"])))
+        self.assertFalse(os.path.exists(cache.get_path("input", ["-e", "-f"])))
+        self.assertTrue(os.path.exists(cache.get_path("input", ["-a", "-b"])))
+        self.assertTrue(os.path.exists(cache.get_path("input", ["-g", "-h"])))
+
+    def test_should_a_new_cache_count_the_entries_on_disk(self):
+        self.store(["-a", "-b"], bytes(100))
+
+        self.assertEqual(100, BitcodeCache(self.cachedir).size)
+
+
+@unittest.skipUnless(has_toolchain(), "requires opt and llc")
+class IncrementalTestCases(unittest.TestCase):
+
+    PASSES = ["-sroa", "-instcombine", "-simplifycfg", "-gvn", "-licm", "-loop-unroll", "-sccp", "-dse"]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = BitcodeCache(os.path.join(self.directory, "cache") + os.sep, stride=3)
+        self.llvm = LlvmUtils(llvmpath=FAKE_LLVM, clangexe='clang-10', optexe='opt-10', llcexe='llc-10',
+                              cache=self.cache)
+        self.full = LlvmUtils(llvmpath=FAKE_LLVM, clangexe='clang-10', optexe='opt-10', llcexe='llc-10')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    # Passes of every opt run of the prefix cache
+    def trace(self) -> list:
+        calls = []
+        opt = self.llvm.opt
+        def traced(source, output, passes):
+            calls.append(passes)
+            return opt(source, output, passes)
+        self.llvm.opt = traced
+        return calls
+
+    # One opt run of every chunk, each reading the output of the previous one
+    def chained(self, passes: list) -> bytes:
+        current = SOURCE
+        for i, start in enumerate(range(0, len(passes), self.cache.stride)):
+            output = self.path(f"chunk{i}.bc")
+            self.assertEqual(0, self.full.opt(current, output, " ".join(passes[start:start + self.cache.stride])))
+            current = output
+        return read(current)
+
+    def test_should_a_sequence_within_the_stride_give_the_ir_of_a_full_run(self):
+        passes = " ".join(self.PASSES[:self.cache.stride])
+        self.llvm.toIR(SOURCE, self.path("incremental.bc"), passes)
+        self.full.toIR(SOURCE, self.path("full.bc"), passes)
+
+        self.assertEqual(read(self.path("full.bc")), read(self.path("incremental.bc")))
+
+    def test_should_a_longer_sequence_give_the_ir_of_its_chunks_run_one_after_another(self):
+        self.llvm.toIR(SOURCE, self.path("incremental.bc"), " ".join(self.PASSES))
+
+        self.assertEqual(self.chained(self.PASSES), read(self.path("incremental.bc")))
+
+    def test_should_a_sequence_resume_from_the_longest_cached_prefix(self):
+        self.llvm.toIR(SOURCE, self.path("cold.bc"), " ".join(self.PASSES))
+        calls = self.trace()
+
+        # Shares the first two chunks (6 passes) with the cached sequence
+        passes = self.PASSES[:7] + ["-adce"]
+        self.llvm.toIR(SOURCE, self.path("warm.bc"), " ".join(passes))
+
+        self.assertEqual([" ".join(passes[6:])], calls)
+        self.assertEqual(self.chained(passes), read(self.path("warm.bc")))
+        self.assertFalse(os.path.exists(self.path("warm.bc.prefix")))
+
+    def test_should_a_fully_cached_sequence_not_run_opt(self):
+        passes = " ".join(self.PASSES[:6])
+        self.llvm.toIR(SOURCE, self.path("cold.bc"), passes)
+        calls = self.trace()
+
+        self.llvm.toIR(SOURCE, self.path("warm.bc"), passes)
+
+        self.assertEqual([], calls)
+        self.assertEqual(read(self.path("cold.bc")), read(self.path("warm.bc")))
+
+    def test_should_the_mode_tell_prefix_runs_from_full_runs(self):
+        with mock.patch.object(LlvmUtils, "get_version", return_value=10):
+            self.assertEqual("prefix3_llvm10", self.llvm.get_mode())
+            self.assertEqual("full_llvm10", self.full.get_mode())
+
+
+if __name__ == '__main__':
+    unittest.main()
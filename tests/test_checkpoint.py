@@ -0,0 +1,88 @@
+import os
+import random
+import unittest
+
+import numpy as np
+
+from jmetal.algorithm.multiobjective import NSGAII
+from jmetal.operator import BatchSBXCrossover, RandomSolutionSelection, BatchIntegerPolynomialMutation
+from jmetal.util.evaluator import BatchEvaluator
+from jmetal.util.ranking import VectorizedNonDominatedRanking
+
+from Checkpoint import Checkpoint
+from LlvmUtils import LlvmUtils
+from llvmMultiobjetiveProblem import llvmMultiobjetiveProblem
+from tests.toolchain import FAKE_LLVM, has_toolchain, WorkingDirectory
+
+
+class Crash(Exception):
+    pass
+
+
+class CrashObserver():
+    '''
+    generation: update that raises Crash, as a killed run would stop there
+    '''
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.generations = 0
+
+    ### FOR OBSERVER ###
+    def update(self, *args, **kwargs):
+        self.generations += 1
+        if self.generations == self.generation:
+            raise Crash()
+
+
+def build_algorithm(cache: str, seed: int = 1) -> NSGAII:
+    random.seed(seed)
+    np.random.seed(seed)
+    problem = llvmMultiobjetiveProblem(max_epochs=5, population_size=6, offspring_population_size=6,
+                                       solution_length=10, verbose=False, pipe=True, cache=cache)
+    problem.llvm = LlvmUtils(llvmpath=FAKE_LLVM, clangexe='clang-10', optexe='opt-10', llcexe='llc-10')
+    return NSGAII(problem=problem, population_size=6, offspring_population_size=6,
+                  mutation=BatchIntegerPolynomialMutation(0.3, seed=seed), crossover=BatchSBXCrossover(0.9, seed=seed),
+                  selection=RandomSolutionSelection(), termination_criterion=problem,
+                  population_evaluator=BatchEvaluator(), ranking=VectorizedNonDominatedRanking())
+
+
+def get_result(algorithm: NSGAII) -> list:
+    return sorted((np.asarray(solution.variables).tolist(), np.asarray(solution.objectives).tolist())
+                  for solution in algorithm.get_result())
+
+
+@unittest.skipUnless(has_toolchain(), "requires opt and llc")
+class CheckpointTestCases(unittest.TestCase):
+
+    def test_should_a_resumed_run_end_like_an_uninterrupted_one(self):
+        with WorkingDirectory() as directory:
+            uninterrupted = build_algorithm(os.path.join(directory, "uninterrupted.db"))
+            uninterrupted.run()
+
+            # Each run has its own cache: the resumed one compiles again what it needs
+            cache = os.path.join(directory, "interrupted.db")
+            filename = os.path.join(directory, "checkpoint.pkl")
+            interrupted = build_algorithm(cache)
+            checkpoint = Checkpoint(filename, interrupted)
+            interrupted.observable.register(checkpoint)
+            interrupted.observable.register(CrashObserver(generation=3))
+            with self.assertRaises(Crash):
+                interrupted.run()
+            checkpoint.close()
+            self.assertLess(interrupted.problem.epoch, uninterrupted.problem.epoch)
+
+            # A new process: other random states until the checkpoint puts them back
+            resumed = build_algorithm(cache, seed=2)
+            checkpoint = Checkpoint(filename, resumed)
+            resumed.observable.register(checkpoint)
+            checkpoint.restore()
+            resumed.resume()
+            checkpoint.close()
+
+            self.assertEqual(uninterrupted.evaluations, resumed.evaluations)
+            self.assertEqual(uninterrupted.problem.epoch, resumed.problem.epoch)
+            self.assertEqual(get_result(uninterrupted), get_result(resumed))
+
+
+if __name__ == '__main__':
+    unittest.main()
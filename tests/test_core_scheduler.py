@@ -0,0 +1,43 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+from CoreScheduler import CoreScheduler
+from ProcessRunner import ProcessRunner
+
+# Two physical cores with two hyperthreads each: {0, 4} and {1, 5}, plus two single-thread cores 2 and 3
+SIBLINGS = {0: "0,4", 4: "0,4", 1: "1,5", 5: "1,5", 2: "2", 3: "3"}
+
+
+def siblings(cpu: int) -> frozenset:
+    return frozenset(int(sibling) for sibling in SIBLINGS[cpu].split(","))
+
+
+@unittest.skipUnless(hasattr(os, 'sched_setaffinity'), "requires sched_setaffinity")
+class CoreSchedulerTestCases(unittest.TestCase):
+
+    def test_should_get_siblings_parse_lists_and_ranges(self):
+        for content, expected in [("3", {3}), ("0,4", {0, 4}), ("0-1", {0, 1}), ("0-1,8-9", {0, 1, 8, 9})]:
+            with self.subTest(content=content), mock.patch("builtins.open", mock.mock_open(read_data=content + "\n")):
+                self.assertEqual(expected, CoreScheduler.get_siblings(0))
+
+    @mock.patch("os.sched_getaffinity", lambda pid: set(SIBLINGS))
+    @mock.patch.object(CoreScheduler, "get_siblings", staticmethod(siblings))
+    def test_should_other_cpus_leave_out_the_measure_cores_and_their_siblings(self):
+        self.assertEqual([0, 1, 2, 3], CoreScheduler.get_dedicated_cores())
+        self.assertEqual({0, 4}, CoreScheduler(reserve=1).get_other_cpus())
+        self.assertEqual({1, 5, 2}, CoreScheduler(cores=[0, 3]).get_other_cpus())
+        self.assertIsNone(CoreScheduler().get_other_cpus())
+
+    def test_should_runner_spawn_processes_on_its_cpus_only(self):
+        affinity = os.sched_getaffinity(0)
+        cpus = {min(affinity)}
+        command = [sys.executable, "-c", "import os; print(sorted(os.sched_getaffinity(0)))"]
+        _, output = ProcessRunner(affinity=cpus).run(command, capture=True)
+        self.assertEqual(str(sorted(cpus)), output.decode().strip())
+        self.assertEqual(affinity, os.sched_getaffinity(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
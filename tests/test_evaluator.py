@@ -0,0 +1,234 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from CoreScheduler import CoreScheduler
+from Evaluator import Evaluator
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "data", "sample.s")
+
+# Measures of data/sample.s
+EXPECTED = {
+    "total_codelines": 23,
+    "codelines": 12,
+    "tags": 2,
+    "function_tags": 2,
+    "directives": 5,
+    "calls": 3,
+    "unconditional_jmps": 2,
+    "conditional_jmps": 2,
+    "total_jmps": 4,
+}
+
+
+def measures(evaluator: Evaluator) -> dict:
+    return {name: getattr(evaluator, name) for name in EXPECTED}
+
+
+def scan(content: bytes) -> dict:
+    evaluator = Evaluator(runs=0)
+    evaluator.scan(io.BytesIO(content))
+    return measures(evaluator)
+
+
+class ScanTestCases(unittest.TestCase):
+
+    def setUp(self):
+        with open(SAMPLE, "rb") as file:
+            self.content = file.read()
+
+    def test_should_scan_count_every_measure_of_the_sample(self):
+        self.assertEqual(EXPECTED, scan(self.content))
+
+    def test_should_evaluate_read_the_same_measures_from_the_file(self):
+        evaluator = Evaluator(runs=0)
+        evaluator.evaluate(SAMPLE)
+        self.assertEqual(EXPECTED, measures(evaluator))
+
+    def test_should_lines_straddling_chunks_be_counted_once(self):
+        for size in range(1, len(self.content) + 2):
+            with self.subTest(chunk_size=size), mock.patch("Evaluator.CHUNK_SIZE", size):
+                self.assertEqual(EXPECTED, scan(self.content))
+
+    def test_should_the_last_line_count_without_a_newline(self):
+        with mock.patch("Evaluator.CHUNK_SIZE", 16):
+            self.assertEqual(EXPECTED, scan(self.content.rstrip(b"\n")))
+
+    def test_should_reset_clear_the_measures(self):
+        evaluator = Evaluator(runs=0)
+        evaluator.scan(io.BytesIO(self.content))
+        evaluator.reset()
+        self.assertEqual({name: 0 for name in EXPECTED}, measures(evaluator))
+
+
+class TokenizeTestCases(unittest.TestCase):
+
+    # (line, token)
+    CASES = [
+        # Indented lines: mnemonic or directive, with any suffix
+        (b"\tcallq\tfoo", b"callq"),
+        (b"\tcall\tbar@PLT", b"call"),
+        (b"    jmpq\t*%rax", b"jmpq"),
+        (b"\tjne\t.LBB0_1", b"jne"),
+        (b"\t.p2align\t4, 0x90", b".p2align"),
+        # Column 0 lines: ':' and their first character
+        (b".LBB0_1:                                # =>This Inner Loop Header", b":."),
+        (b"main:                                   # @main", b":m"),
+        (b"# %bb.0:", b":#"),
+        (b"", b":"),
+        (b"\t", b":\t"),
+        (b"   ", b": "),
+    ]
+
+    def test_should_tokenize_lines(self):
+        for line, token in self.CASES:
+            with self.subTest(line=line):
+                self.assertEqual([token], Evaluator.tokenize([line]))
+
+
+# Timed runs of the given wall times (user and system times a tenth and a hundredth of them)
+def timed_runs(walls: list) -> list:
+    return [(wall, wall / 10, wall / 100, None) for wall in walls]
+
+
+@unittest.skipUnless(os.path.exists("/bin/true") and os.path.exists("/bin/false"), "requires /bin/true and /bin/false")
+class MeasureTestCases(unittest.TestCase):
+
+    def test_should_warmup_runs_come_before_the_timed_runs(self):
+        evaluator = Evaluator(runs=3, warmup=2)
+        with mock.patch.object(evaluator, "run_once", wraps=evaluator.run_once) as run_once:
+            evaluator.measure_runtime("/bin/true")
+
+        self.assertEqual(5, run_once.call_count)
+        self.assertEqual(3, len(evaluator.get_samples()))
+        self.assertGreater(evaluator.get_runtime(), 0.0)
+        self.assertLess(evaluator.get_runtime(), sys.maxsize)
+
+    def test_should_a_failing_executable_get_sys_maxsize(self):
+        for warmup in (0, 1):
+            with self.subTest(warmup=warmup):
+                evaluator = Evaluator(runs=3, warmup=warmup)
+                evaluator.measure_runtime("/bin/false")
+
+                self.assertEqual(sys.maxsize, evaluator.get_runtime())
+                self.assertEqual(0.0, evaluator.get_runtime_dispersion())
+
+    def test_should_a_failed_run_discard_the_previous_samples(self):
+        evaluator = Evaluator(runs=3)
+        with mock.patch.object(evaluator, "run_once", side_effect=timed_runs([1.0, 2.0]) + [None]):
+            evaluator.measure_runtime("/bin/true")
+
+        self.assertEqual(sys.maxsize, evaluator.get_runtime())
+        self.assertEqual(0.0, evaluator.get_user_time())
+
+    def test_should_unpinned_samples_have_no_core(self):
+        evaluator = Evaluator(runs=2)
+        evaluator.measure_runtime("/bin/true")
+
+        self.assertEqual([None, None], evaluator.get_sample_cores())
+
+    @unittest.skipUnless(hasattr(os, "sched_setaffinity"), "requires sched_setaffinity")
+    def test_should_pinned_samples_record_their_core(self):
+        core = min(os.sched_getaffinity(0))
+        evaluator = Evaluator(runs=2, scheduler=CoreScheduler(cores=[core]))
+        evaluator.measure_runtime("/bin/true")
+
+        self.assertEqual([core, core], evaluator.get_sample_cores())
+
+
+class StatisticsTestCases(unittest.TestCase):
+
+    def measure(self, evaluator: Evaluator, walls: list) -> mock.Mock:
+        with mock.patch.object(evaluator, "run_once", side_effect=timed_runs(walls)) as run_once:
+            evaluator.measure_on("executable", None)
+        return run_once
+
+    def test_should_precise_runs_stop_at_runs(self):
+        evaluator = Evaluator(runs=3, max_runs=10)
+
+        self.assertEqual(3, self.measure(evaluator, [1.0] * 10).call_count)
+        self.assertEqual(1.0, evaluator.get_runtime())
+
+    def test_should_imprecise_runs_go_on_up_to_max_runs(self):
+        evaluator = Evaluator(runs=3, max_runs=10)
+
+        self.assertEqual(10, self.measure(evaluator, [1.0, 2.0] * 5).call_count)
+
+    def test_should_runs_stop_once_the_interval_is_within_the_precision(self):
+        evaluator = Evaluator(runs=2, max_runs=50, precision=0.05)
+        # 1.0 and 2.0 first, then equal runs: from 11 runs on the 2.0 is out of the interval of the median
+        walls = [1.0, 2.0] + [1.0] * 48
+
+        self.assertEqual(11, self.measure(evaluator, walls).call_count)
+
+    def test_should_set_runtime_take_medians_and_the_median_absolute_deviation(self):
+        evaluator = Evaluator()
+        evaluator.set_runtime([(1.0, 0.1, 0.0), (3.0, 0.3, 0.1), (2.0, 0.2, 0.0), (10.0, 0.5, 0.2)])
+
+        self.assertEqual(2.5, evaluator.get_runtime())
+        # |1 - 2.5|, |3 - 2.5|, |2 - 2.5|, |10 - 2.5|
+        self.assertEqual(1.0, evaluator.get_runtime_dispersion())
+        self.assertAlmostEqual(0.25, evaluator.get_user_time())
+        self.assertAlmostEqual(0.05, evaluator.get_system_time())
+
+    def test_should_median_interval_take_the_order_statistics_around_the_median(self):
+        # Ranks 40 and 61 of 100: 50 -/+ 1.96 * sqrt(100) / 2
+        self.assertEqual((39, 60), Evaluator.median_interval(list(reversed(range(100)))))
+        # Too few values for the interval: the extremes
+        self.assertEqual((1.0, 3.0), Evaluator.median_interval([3.0, 1.0, 2.0]))
+        self.assertEqual((5.0, 5.0), Evaluator.median_interval([5.0]))
+
+    def test_should_is_precise_compare_the_half_width_with_the_precision(self):
+        values = [1.0 + i / 1000 for i in range(100)]
+
+        # Half width 0.0105 of a 1.0495 median
+        self.assertTrue(Evaluator(precision=0.05).is_precise(values))
+        self.assertFalse(Evaluator(precision=0.01).is_precise(values))
+        self.assertFalse(Evaluator().is_precise([1.0]))
+        self.assertFalse(Evaluator().is_precise([0.0, 0.0, 0.0]))
+
+
+class KernelTestCases(unittest.TestCase):
+
+    OUTPUT = (b"polybench-kernel gemm 0 0.25\n"
+              b"0.00 1.50 2.25\n"
+              b"polybench-kernel gemm 1 0.5\n"
+              b"polybench-kernel 2mm 0 0.125\n"
+              b"polybench-kernel truncated 0\n"
+              b"kernel gemm 2 8.0\n")
+
+    def test_should_parse_kernel_times_add_up_the_iterations_of_every_kernel(self):
+        self.assertEqual({"gemm": 0.75, "2mm": 0.125}, Evaluator.parse_kernel_times(self.OUTPUT))
+
+    def test_should_output_without_kernel_lines_have_no_kernel_times(self):
+        self.assertEqual({}, Evaluator.parse_kernel_times(b"0.00 1.50\n\n"))
+
+    def test_should_the_kernel_be_the_first_argument(self):
+        evaluator = Evaluator(runs=1, kernel="gemm")
+        with mock.patch.object(evaluator, "run_once", side_effect=timed_runs([1.0])) as run_once:
+            evaluator.measure_on("executable", None)
+
+        self.assertEqual(["executable", "gemm"], run_once.call_args.args[0])
+
+    @unittest.skipUnless(os.path.exists("/bin/sh"), "requires /bin/sh")
+    def test_should_kernel_runtimes_be_the_medians_of_the_kernel_lines(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        executable = os.path.join(directory, "kernels")
+        # Prints two iterations of the kernel in argv[1] and an unrelated line
+        with open(executable, "w") as file:
+            file.write('#!/bin/sh\necho "polybench-kernel $1 0 0.25"\necho "polybench-kernel $1 1 0.5"\necho 1.0\n')
+        os.chmod(executable, 0o755)
+
+        evaluator = Evaluator(runs=3, kernel="gemm", kernel_times=True)
+        evaluator.measure_runtime(executable)
+
+        self.assertEqual({"gemm": 0.75}, evaluator.get_kernel_runtimes())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from FitnessCache import FitnessCache
+
+
+def put_range(cache: FitnessCache, start: int, stop: int):
+    for i in range(start, stop):
+        cache.put([i, i + 1], [i, 2 * i])
+
+
+class FitnessCacheTestCases(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'fitness.db')
+        self.cache = FitnessCache(self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_should_get_return_what_put_stored(self):
+        self.cache.put([3, 14, 15], [5100, 398, 331, 67, 198])
+
+        self.assertEqual([5100, 398, 331, 67, 198], self.cache.get([3, 14, 15]))
+        self.assertEqual([5100, 398, 331, 67, 198], self.cache.get((3, 14, 15)))
+        self.assertEqual(None, self.cache.get([3, 14]))
+        self.assertEqual(1, len(self.cache))
+
+    def test_should_the_first_writer_win(self):
+        self.cache.put([1, 2], [1, 1])
+        self.cache.put([1, 2], [2, 2])
+        self.cache.put_ir('hash', [1, 1])
+        self.cache.put_ir('hash', [2, 2])
+
+        self.assertEqual([1, 1], self.cache.get([1, 2]))
+        self.assertEqual([1, 1], self.cache.get_ir('hash'))
+
+    def test_should_the_empty_genome_be_a_valid_key(self):
+        self.cache.put([], [7])
+
+        self.assertEqual([7], self.cache.get([]))
+        self.assertEqual([((), [7])], list(self.cache.items()))
+
+    def test_should_get_all_find_keys_over_several_query_chunks(self):
+        self.cache.put_all([([i, i], [i]) for i in range(1200)])
+
+        found = self.cache.get_all([[i, i] for i in range(0, 1300, 2)])
+
+        self.assertEqual(600, len(found))
+        self.assertEqual([1198], found[(1198, 1198)])
+        self.assertNotIn((1200, 1200), found)
+
+    def test_should_the_database_be_in_wal_mode(self):
+        connection = sqlite3.connect(self.filename)
+
+        self.assertEqual('wal', connection.execute("PRAGMA journal_mode").fetchone()[0])
+        connection.close()
+
+    def test_should_every_thread_get_its_own_connection(self):
+        connections = []
+        thread = threading.Thread(target=lambda: connections.append(self.cache.connection()))
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(self.cache.connection(), connections[0])
+        self.assertIs(self.cache.connection(), self.cache.connection())
+
+    def test_should_concurrent_threads_share_the_entries(self):
+        threads = [threading.Thread(target=put_range, args=(self.cache, 50 * t, 50 * (t + 1))) for t in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(200, len(self.cache))
+
+    def test_should_forked_processes_open_their_own_connection_and_share_the_entries(self):
+        self.cache.put([0, 0], [0])
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=put_range, args=(self.cache, 100 * p, 100 * (p + 1))) for p in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        self.assertTrue(all(process.exitcode == 0 for process in processes))
+        self.assertEqual(301, len(self.cache))
+        self.assertEqual([250, 500], self.cache.get([250, 251]))
+
+    def test_should_a_pickled_cache_reopen_the_same_database(self):
+        context = multiprocessing.get_context('spawn')
+        process = context.Process(target=put_range, args=(self.cache, 0, 10))
+        process.start()
+        process.join()
+
+        self.assertEqual(0, process.exitcode)
+        self.assertEqual(10, len(FitnessCache(self.filename)))
+
+    def test_should_a_database_refuse_values_of_another_namespace(self):
+        FitnessCache(self.filename, namespace='prefix10').put([1], [1])
+
+        self.assertEqual([1], FitnessCache(self.filename, namespace='prefix10').get([1]))
+        with self.assertRaises(Exception):
+            FitnessCache(self.filename, namespace='full')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import functools
+import os
+import unittest
+
+from jmetal.algorithm.multiobjective import NSGAII
+from jmetal.operator import BatchSBXCrossover, RandomSolutionSelection, BatchIntegerPolynomialMutation
+from jmetal.util.evaluator import BatchEvaluator
+from jmetal.util.ranking import VectorizedNonDominatedRanking
+
+from FitnessCache import FitnessCache
+from IslandModel import IslandModel
+from LlvmUtils import LlvmUtils
+from llvmMultiobjetiveProblem import llvmMultiobjetiveProblem
+from tests.toolchain import FAKE_LLVM, has_toolchain, WorkingDirectory
+
+
+# Island factory: runs in the island process, every island shares the fitness cache
+def build_island(cache: str, index: int) -> NSGAII:
+    problem = llvmMultiobjetiveProblem(max_epochs=3, population_size=4, offspring_population_size=4,
+                                       solution_length=8, verbose=False, pipe=True, cache=cache)
+    problem.llvm = LlvmUtils(llvmpath=FAKE_LLVM, clangexe='clang-10', optexe='opt-10', llcexe='llc-10')
+    return NSGAII(problem=problem, population_size=4, offspring_population_size=4,
+                  mutation=BatchIntegerPolynomialMutation(0.3, seed=index), crossover=BatchSBXCrossover(0.9, seed=index),
+                  selection=RandomSolutionSelection(), termination_criterion=problem,
+                  population_evaluator=BatchEvaluator(), ranking=VectorizedNonDominatedRanking())
+
+
+@unittest.skipUnless(has_toolchain(), "requires opt and llc")
+class IslandModelTestCases(unittest.TestCase):
+
+    def test_should_islands_run_and_return_the_problem_of_island_0(self):
+        with WorkingDirectory() as directory:
+            cache = os.path.join(directory, "islands.db")
+            model = IslandModel(functools.partial(build_island, cache), islands=2, interval=1, migrants=1, seed=1)
+            model.run()
+
+            self.assertEqual(8, len(model.get_result()))
+            self.assertEqual(2, len(model.island_evaluations))
+            self.assertEqual(sum(model.island_evaluations), model.evaluations)
+            self.assertIsInstance(model.problem, llvmMultiobjetiveProblem)
+            self.assertEqual(build_island(cache, 0).problem.config_to_str(), model.problem.config_to_str())
+            self.assertEqual(['codelines', 'tags', 'jumps', 'function_tags', 'calls'], model.problem.obj_labels)
+            # Every island wrote its measures to the shared cache
+            self.assertGreater(len(FitnessCache(cache)), 0)
+            self.assertTrue(all(len(solution.objectives) == 5 for solution in model.get_result()))
+
+
+if __name__ == '__main__':
+    unittest.main()
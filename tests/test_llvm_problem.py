@@ -0,0 +1,212 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+from jmetal.core.solution import IntegerSolution
+from jmetal.util.evaluator import MultiprocessEvaluator
+
+from Evaluator import Evaluator
+from LlvmUtils import AsyncLlvmUtils, LlvmUtils
+from llvmMultiobjetiveProblem import llvmMultiobjetiveProblem
+from tests.toolchain import FAKE_LLVM, broken_toolchain, has_toolchain, WorkingDirectory
+
+SEQUENCES = [["-sroa", "-instcombine"], ["-sroa", "-gvn"], ["-mem2reg", "-simplifycfg", "-licm"]]
+
+
+# Problem on the stand-in toolchain (or the one in llvmpath), its fitness cache in the working directory
+def build_problem(llvmpath: str = FAKE_LLVM, cache: str = "fitness.db", **kwargs) -> llvmMultiobjetiveProblem:
+    problem = llvmMultiobjetiveProblem(max_epochs=1, population_size=4, offspring_population_size=4,
+                                       solution_length=len(SEQUENCES[0]), verbose=False, cache=cache, **kwargs)
+    problem.llvm = LlvmUtils(llvmpath=llvmpath, clangexe='clang-10', optexe='opt-10', llcexe='llc-10',
+                             cache=problem.llvm.cache, runner=problem.llvm.runner)
+    problem.async_llvm = AsyncLlvmUtils(llvmpath=llvmpath, clangexe='clang-10', optexe='opt-10', llcexe='llc-10',
+                                        opt_jobs=2, llc_jobs=2, runner=problem.async_llvm.runner)
+    return problem
+
+
+def get_objectives(solutions: list) -> list:
+    return [list(solution.objectives) for solution in solutions]
+
+
+def to_solution(problem: llvmMultiobjetiveProblem, names: list) -> IntegerSolution:
+    solution = IntegerSolution(problem.lower_bound, problem.upper_bound, problem.number_of_objectives)
+    solution.variables = [LlvmUtils.get_passes().index(name) for name in names]
+    return solution
+
+
+# Names of the LlvmUtils calls the problem makes from now on
+def trace(problem: llvmMultiobjetiveProblem) -> list:
+    calls = []
+    for name in ("toIR", "toIRBytes", "toAssembly", "toAssemblyStream", "toExecutable"):
+        def traced(*args, name=name, method=getattr(problem.llvm, name), **kwargs):
+            calls.append(name)
+            return method(*args, **kwargs)
+        setattr(problem.llvm, name, traced)
+    return calls
+
+
+@unittest.skipUnless(has_toolchain(), "requires opt and llc")
+class FailureTestCases(unittest.TestCase):
+
+    def assertCachedPenalty(self, problem: llvmMultiobjetiveProblem, solution: IntegerSolution):
+        self.assertEqual(problem.get_penalty_values(), list(solution.objectives))
+        self.assertEqual(problem.get_penalty_values(), problem.cache.get(problem.llvm.canonicalize(solution.variables)))
+        # Never compiled again
+        with mock.patch.object(problem, "compute_objectives") as compute_objectives:
+            problem.evaluate(to_solution(problem, SEQUENCES[1]))
+        compute_objectives.assert_not_called()
+
+    def test_should_a_failing_opt_penalize_its_sequence_only(self):
+        for pipe in (False, True):
+            for workers in (1, 2):
+                with self.subTest(pipe=pipe, workers=workers), WorkingDirectory() as directory:
+                    os.mkdir("broken")
+                    problem = build_problem(broken_toolchain(os.path.join(directory, "broken"), "opt-10", "-gvn"),
+                                            pipe=pipe, workers=workers)
+                    solutions = problem.evaluate_all([to_solution(problem, names) for names in SEQUENCES])
+
+                    self.assertNotEqual(problem.get_penalty_values(), list(solutions[0].objectives))
+                    self.assertNotEqual(problem.get_penalty_values(), list(solutions[2].objectives))
+                    self.assertCachedPenalty(problem, solutions[1])
+
+    def test_should_a_failing_clang_penalize_the_sequence(self):
+        with WorkingDirectory() as directory:
+            os.mkdir("broken")
+            problem = build_problem(broken_toolchain(os.path.join(directory, "broken"), "clang-10"))
+            problem.evaluator = Evaluator(runs=1, runner=problem.evaluator.runner)
+
+            self.assertCachedPenalty(problem, problem.evaluate(to_solution(problem, SEQUENCES[1])))
+
+
+@unittest.skipUnless(has_toolchain(), "requires opt and llc")
+class ArtifactTestCases(unittest.TestCase):
+
+    def test_should_identical_bitcode_reuse_the_measured_values(self):
+        for pipe in (False, True):
+            with self.subTest(pipe=pipe), WorkingDirectory():
+                problem = build_problem(pipe=pipe)
+                measured = problem.evaluate(to_solution(problem, SEQUENCES[0]))
+                calls = trace(problem)
+
+                # -adce removes nothing after -sroa -instcombine: another sequence, the same bitcode
+                reused = problem.evaluate(to_solution(problem, SEQUENCES[0] + ["-adce"]))
+
+                self.assertEqual(list(measured.objectives), list(reused.objectives))
+                # opt only, no llc
+                self.assertEqual(["toIRBytes"] if pipe else ["toIR"], calls)
+                self.assertEqual(list(measured.objectives),
+                                 problem.cache.get(problem.llvm.canonicalize(reused.variables)))
+
+    def test_should_assembly_objectives_never_build_the_executable(self):
+        for pipe in (False, True):
+            with self.subTest(pipe=pipe), WorkingDirectory() as directory:
+                os.mkdir("broken")
+                # Any clang run would fail and penalize the sequence
+                problem = build_problem(broken_toolchain(os.path.join(directory, "broken"), "clang-10"), pipe=pipe)
+                calls = trace(problem)
+
+                solution = problem.evaluate(to_solution(problem, SEQUENCES[0]))
+
+                self.assertNotIn("toExecutable", calls)
+                self.assertNotEqual(problem.get_penalty_values(), list(solution.objectives))
+
+    def test_should_runtime_objectives_build_the_executable_once(self):
+        with WorkingDirectory():
+            problem = build_problem(runtime=True)
+            calls = trace(problem)
+
+            solution = problem.evaluate(to_solution(problem, SEQUENCES[0]))
+
+            self.assertEqual(1, calls.count("toExecutable"))
+            self.assertLess(solution.objectives[5], sys.maxsize)
+
+    def test_should_pipe_mode_give_the_values_of_file_mode(self):
+        with WorkingDirectory():
+            files = build_problem()
+            expected = get_objectives(files.evaluate_all([to_solution(files, names) for names in SEQUENCES]))
+
+        with WorkingDirectory():
+            pipe = build_problem(pipe=True)
+            self.assertEqual(expected, get_objectives(pipe.evaluate_all([to_solution(pipe, names)
+                                                                         for names in SEQUENCES])))
+            # Nothing went through the disk
+            llvmfiles = pipe.llvmfiles
+            for path in (llvmfiles.get_optimized_bc(), llvmfiles.get_optimized_ll(), llvmfiles.get_optimized_exe()):
+                self.assertFalse(os.path.exists(path))
+
+    def test_should_pipe_mode_write_the_intermediate_files_when_debugging(self):
+        with WorkingDirectory():
+            problem = build_problem(pipe=True, debug=True)
+            problem.evaluate(to_solution(problem, SEQUENCES[0]))
+
+            self.assertTrue(os.path.exists(problem.llvmfiles.get_optimized_bc()))
+
+
+@unittest.skipUnless(has_toolchain(), "requires opt and llc")
+class AsyncTestCases(unittest.TestCase):
+
+    def test_should_async_evaluation_give_the_values_of_full_runs(self):
+        with WorkingDirectory():
+            problem = build_problem(cache="async.db")
+            solutions = asyncio.run(problem.evaluate_all_async([to_solution(problem, names) for names in SEQUENCES]))
+            expected = build_problem(cache="sync.db").evaluate_all([to_solution(problem, names) for names in SEQUENCES])
+
+            self.assertEqual(get_objectives(expected), get_objectives(solutions))
+
+    def test_should_async_evaluation_refuse_a_prefix_mode_cache(self):
+        with WorkingDirectory():
+            problem = build_problem(prefix_cache="bitcode_cache/")
+            with self.assertRaises(Exception):
+                asyncio.run(problem.evaluate_all_async([to_solution(problem, SEQUENCES[0])]))
+            self.assertEqual(0, len(problem.cache))
+
+
+@unittest.skipUnless(has_toolchain(), "requires opt and llc")
+class ParallelTestCases(unittest.TestCase):
+
+    # Every sequence twice: the batch compiles each of them once
+    def solutions(self, problem: llvmMultiobjetiveProblem) -> list:
+        return [to_solution(problem, names) for names in SEQUENCES + SEQUENCES]
+
+    def test_should_worker_threads_and_processes_give_the_values_of_sequential_evaluation(self):
+        with WorkingDirectory():
+            sequential = build_problem(cache="sequential.db")
+            expected = get_objectives(sequential.evaluate_all(self.solutions(sequential)))
+
+            threads = build_problem(cache="threads.db", workers=2)
+            self.assertEqual(expected, get_objectives(threads.evaluate_all(self.solutions(threads))))
+            threads.close()
+
+            processes = build_problem(cache="processes.db")
+            evaluator = MultiprocessEvaluator(2)
+            self.addCleanup(evaluator.pool.terminate)
+            self.assertEqual(expected, get_objectives(evaluator.evaluate(self.solutions(processes), processes)))
+
+    def test_should_close_remove_the_scratch_files_of_every_worker(self):
+        with WorkingDirectory():
+            problem = build_problem(workers=2)
+            problem.evaluate_all([to_solution(problem, names) for names in SEQUENCES])
+            evaluator = MultiprocessEvaluator(2)
+            self.addCleanup(evaluator.pool.terminate)
+            evaluator.evaluate([to_solution(problem, names) for names in SEQUENCES], build_problem(cache="other.db"))
+            island = problem.llvmfiles.for_worker("island0").get_optimized_bc()
+            open(island, "wb").close()
+
+            worker_files = problem.llvmfiles.get_worker_files()
+            # Files of the threads of this process and of the pool processes
+            self.assertGreater(len(set(path.split("_optimized")[0] for path in worker_files)), 2)
+
+            problem.close()
+
+            self.assertEqual([], problem.llvmfiles.get_worker_files())
+            self.assertEqual([], [path for path in worker_files if os.path.exists(path)])
+            self.assertTrue(os.path.exists(island))
+            # Still usable: the workers get new scratch files
+            problem.evaluate_all([to_solution(problem, ["-licm", "-gvn"])])
+            self.assertNotEqual([], problem.llvmfiles.get_worker_files())
+
+
+if __name__ == '__main__':
+    unittest.main()
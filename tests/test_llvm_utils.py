@@ -0,0 +1,67 @@
+import os
+import random
+import unittest
+
+from LlvmUtils import LlvmUtils
+
+
+class CanonicalizeTestCases(unittest.TestCase):
+
+    # (sequence, canonical sequence)
+    CASES = [
+        ([], []),
+        # Alias analyses are hoisted to the front, in pass order and once
+        (['-instcombine', '-tbaa', '-gvn'], ['-tbaa', '-instcombine', '-gvn']),
+        (['-scoped-noalias', '-gvn', '-tbaa', '-tbaa'], ['-tbaa', '-scoped-noalias', '-gvn']),
+        # Other analyses are removed
+        (['-domtree', '-instcombine', '-loops', '-aa'], ['-instcombine']),
+        (['-licm', '-domtree', '-gvn'], ['-licm', '-gvn']),
+        (['-gvn', '-domtree', '-licm'], ['-gvn', '-licm']),
+        # unless they split two loop passes: a single -domtree keeps the split
+        (['-licm', '-domtree', '-loop-unroll'], ['-licm', '-domtree', '-loop-unroll']),
+        (['-licm', '-scalar-evolution', '-loops', '-loop-unroll'], ['-licm', '-domtree', '-loop-unroll']),
+        (['-licm', '-domtree', '-licm'], ['-licm', '-domtree', '-licm']),
+        # Alias analyses never split the loop pass manager
+        (['-licm', '-tbaa', '-loop-unroll'], ['-tbaa', '-licm', '-loop-unroll']),
+        # Consecutive runs of idempotent passes collapse, also once the analyses between them are removed
+        (['-mem2reg', '-mem2reg', '-mem2reg', '-gvn', '-mem2reg'], ['-mem2reg', '-gvn', '-mem2reg']),
+        (['-loop-simplify', '-domtree', '-loop-simplify'], ['-loop-simplify']),
+        (['-gvn', '-gvn'], ['-gvn', '-gvn']),
+    ]
+
+    @staticmethod
+    def to_genes(names: list) -> list:
+        return [LlvmUtils.get_passes().index(name) for name in names]
+
+    @staticmethod
+    def to_names(genes: list) -> list:
+        return [LlvmUtils.get_passes()[gene] for gene in genes]
+
+    def test_should_canonicalize_apply_the_grouping_rules(self):
+        for sequence, expected in self.CASES:
+            with self.subTest(sequence=sequence):
+                self.assertEqual(expected, self.to_names(LlvmUtils.canonicalize(self.to_genes(sequence))))
+
+    def test_should_canonical_sequences_be_fixed_points(self):
+        random.seed(1)
+        for _ in range(500):
+            genes = [random.randint(0, len(LlvmUtils.get_passes()) - 1) for _ in range(random.randint(0, 40))]
+            canonical = LlvmUtils.canonicalize(genes)
+
+            self.assertEqual(canonical, LlvmUtils.canonicalize(canonical))
+
+
+class ModeTestCases(unittest.TestCase):
+
+    def test_should_the_mode_name_the_llvm_version(self):
+        llvm = LlvmUtils(llvmpath="/nonexistent/")
+        self.assertEqual("full_llvmunknown", llvm.get_mode())
+
+    @unittest.skipUnless(os.path.exists("/usr/bin/opt"), "requires opt")
+    def test_should_the_mode_read_the_version_of_opt(self):
+        llvm = LlvmUtils(llvmpath="/usr/bin/")
+        self.assertRegex(llvm.get_mode(), r"^full_llvm\d+$")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import resource
+import sys
+import unittest
+
+from ProcessRunner import ProcessRunner, LimitExceeded
+
+PRINT_LIMITS = "import resource; print(resource.getrlimit(resource.RLIMIT_AS), resource.getrlimit(resource.RLIMIT_CPU))"
+
+
+@unittest.skipUnless(hasattr(resource, 'prlimit'), "requires prlimit")
+class ProcessRunnerTestCases(unittest.TestCase):
+
+    def test_should_limits_be_applied_to_the_spawned_process(self):
+        memory = 2**33
+        _, output = ProcessRunner(memory=memory, cpu=30).run([sys.executable, "-c", PRINT_LIMITS], capture=True)
+        self.assertEqual(f"({memory}, {memory}) (30, 31)", output.decode().strip())
+
+    def test_should_the_parent_keep_its_own_limits(self):
+        limits = resource.getrlimit(resource.RLIMIT_CPU)
+        ProcessRunner(cpu=30).run([sys.executable, "-c", "pass"])
+        self.assertEqual(limits, resource.getrlimit(resource.RLIMIT_CPU))
+
+    def test_should_exceeding_the_cpu_limit_raise_limit_exceeded(self):
+        with self.assertRaises(LimitExceeded):
+            ProcessRunner(cpu=1, timeout=30).run([sys.executable, "-c", "while True: pass"])
+
+    def test_should_a_timeout_raise_limit_exceeded(self):
+        with self.assertRaises(LimitExceeded):
+            ProcessRunner(timeout=0.5).run([sys.executable, "-c", "import time; time.sleep(30)"])
+
+    def test_should_the_return_code_be_returned(self):
+        self.assertEqual((3, None), ProcessRunner(cpu=30).run([sys.executable, "-c", "raise SystemExit(3)"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
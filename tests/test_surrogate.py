@@ -0,0 +1,57 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from jmetal.core.solution import FloatSolution
+from jmetal.util.ranking import FastNonDominatedRanking, VectorizedNonDominatedRanking
+
+from Surrogate import Surrogate
+from llvmMultiobjetiveProblem import llvmMultiobjetiveProblem
+
+
+def to_solutions(values: np.ndarray) -> list:
+    solutions = []
+    for row in values.tolist():
+        solution = FloatSolution([], [], number_of_objectives=len(row))
+        solution.objectives = row
+        solutions.append(solution)
+    return solutions
+
+
+class DominanceTestCases(unittest.TestCase):
+
+    # Small integer objectives, so batches are full of ties and duplicates
+    def random_values(self, generator: np.random.Generator) -> np.ndarray:
+        return generator.integers(0, 4, size=(generator.integers(1, 30), generator.integers(2, 6))).astype(np.float64)
+
+    def test_should_the_screen_dominance_agree_with_the_ranking_of_the_algorithms(self):
+        generator = np.random.default_rng(1)
+        for ranking in [FastNonDominatedRanking(), VectorizedNonDominatedRanking()]:
+            for _ in range(200):
+                values = self.random_values(generator)
+                solutions = to_solutions(values)
+                ranking.compute_ranking(solutions)
+                front = set(map(id, ranking.get_subfront(0)))
+                expected = [id(solution) in front for solution in solutions]
+                mask = Surrogate.non_dominated(values, [llvmMultiobjetiveProblem.MINIMIZE] * values.shape[1])
+                self.assertEqual(expected, mask.tolist())
+
+    def test_should_the_problem_screen_minimizing_every_objective(self):
+        with tempfile.TemporaryDirectory() as directory:
+            problem = llvmMultiobjetiveProblem(max_epochs=1, population_size=2, offspring_population_size=2,
+                                               solution_length=4, verbose=False, surrogate=True,
+                                               cache=os.path.join(directory, "fitness.db"))
+            misses = [[random.randint(0, 86) for _ in range(4)] for _ in range(3)]
+            screen = mock.Mock(return_value=(np.ones(3, dtype=bool), np.zeros((3, 5))))
+            with mock.patch.object(problem.surrogate, "is_ready", return_value=True), \
+                    mock.patch.object(problem.surrogate, "screen", screen):
+                self.assertEqual((misses, dict()), problem.screen(misses, dict()))
+            self.assertEqual([problem.MINIMIZE] * problem.number_of_objectives, screen.call_args[0][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
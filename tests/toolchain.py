@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+
+# opt-10, llc-10 and clang-10 stand-ins over the LLVM of $LLVM_BIN (default /usr/bin), see fakellvm/
+FAKE_LLVM = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fakellvm") + os.sep
+LLVM_BIN = os.environ.get("LLVM_BIN", "/usr/bin")
+POLYBENCH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "polybench_small")
+
+
+# Stand-ins in directory, with a tool that exits with status 1 (always, or when one of its arguments is argument)
+def broken_toolchain(directory: str, tool: str, argument: str = None) -> str:
+    for name in ("opt-10", "llc-10", "clang-10"):
+        os.symlink(os.path.join(FAKE_LLVM, name), os.path.join(directory, name))
+    path = os.path.join(directory, tool)
+    os.remove(path)
+    with open(path, "w") as file:
+        file.write("#!/bin/sh\n")
+        if argument is None:
+            file.write("exit 1\n")
+        else:
+            file.write(f'for arg do [ "$arg" = "{argument}" ] && exit 1; done\nexec "{FAKE_LLVM}{tool}" "$@"\n')
+    os.chmod(path, 0o755)
+    return directory + os.sep
+
+
+def has_toolchain() -> bool:
+    return all(os.access(os.path.join(LLVM_BIN, tool), os.X_OK) for tool in ("opt", "llc")) and \
+        os.path.exists(os.path.join(POLYBENCH, "polybench_small_original.bc"))
+
+
+class WorkingDirectory():
+    '''
+    Temporary working directory of a run with polybench_small in it, the problem files are relative to it
+    '''
+    def __enter__(self) -> str:
+        self.cwd = os.getcwd()
+        self.path = tempfile.mkdtemp()
+        os.symlink(POLYBENCH, os.path.join(self.path, "polybench_small"))
+        os.chdir(self.path)
+        return self.path
+
+    def __exit__(self, *args):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.path, ignore_errors=True)